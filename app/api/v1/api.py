@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 
 # Importa el enrutador específico del módulo de eventos
-from app.api.v1.routes import evento
+from app.api.v1.routes import estadisticas, evento, instalacion, revision, usuario
 
 # Crea un enrutador principal para la v1
 api_router_v1 = APIRouter()
@@ -11,6 +11,12 @@ api_router_v1 = APIRouter()
 # y estarán agrupadas bajo la etiqueta "Eventos" en la documentación.
 api_router_v1.include_router(evento.router, prefix="/eventos", tags=["eventos"])
 
+# El enrutador de instalaciones ya define su prefijo (/instalaciones)
+api_router_v1.include_router(instalacion.router)
+api_router_v1.include_router(estadisticas.router)
+api_router_v1.include_router(usuario.router)
+api_router_v1.include_router(revision.router)
+
 # Si en el futuro tienes un enrutador para "Doctores", lo agregarías aquí:
 # from app.api.v1.routes import doctor
 # api_router_v1.include_router(doctor.router, prefix="/doctores", tags=["Doctores"])
\ No newline at end of file
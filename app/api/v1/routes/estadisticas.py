@@ -0,0 +1,33 @@
+from typing import Optional
+from fastapi import APIRouter, Query
+from app.schemas.estadisticas import EstadisticasEventos, ResultadoRefresco
+from app.service.estadisticas import obtener_estadisticas, refrescar_estadisticas
+
+
+router = APIRouter(
+    prefix="/estadisticas",
+    tags=["estadisticas"]
+    )
+
+# Conteos de eventos por estado, tipo, facultad, instalación y mes
+@router.get("/", response_model=EstadisticasEventos, summary="Estadísticas de eventos")
+async def get_estadisticas(
+    desde: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Primer mes (AAAA-MM)"),
+    hasta: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$", description="Último mes (AAAA-MM)"),
+):
+    """
+    Lee las estadísticas precalculadas por mes (colección `estadisticas_mensuales`)
+    y las suma para el rango pedido. No agrega la colección de eventos.
+    """
+    return await obtener_estadisticas(desde, hasta)
+
+
+# Forzar el refresco de las estadísticas precalculadas
+@router.post("/refrescar", response_model=ResultadoRefresco, summary="Refrescar estadísticas")
+async def post_refrescar_estadisticas(
+    completo: bool = Query(False, description="Recalcular todos los meses, no solo los modificados"),
+):
+    """
+    Recalcula los meses con eventos modificados desde la última corrida.
+    """
+    return await refrescar_estadisticas(completo)
@@ -1,15 +1,29 @@
-from ast import List
-from typing import List
-from fastapi import APIRouter, HTTPException, status
-from app.schemas.agregaciones import organizador
-from app.schemas.evento import EvaluacionCrear, EvaluacionCrear, EventoActualizar, EventoCrear, EventoRespuesta
-from app.crud import evento as crud
-from app.models.evento import Evento
-from app.schemas.evento import EventoRespuesta
-from app.service.evento import agregar_evaluacion_a_evento, agregar_evaluacion_a_evento, eliminar_evento, listar_eventos as listar_eventos_service
-from app.service.evento import crear_evento as crear_evento_service
-from app.crud.evento import get_evento_por_id, listar_responsables_evento_crud
-from app.service.evento import actualizar_evento as actualizar_evento_service
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional, Set, Union
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from app.schemas.agregaciones import ResponsablesLote, organizador
+from app.schemas.evento import EstadoEventoEnum, EvaluacionCrear, EventoActualizar, EventoCrear, EventoRespuesta, TipoEventoEnum
+from app.schemas.evento import CalendarioEventos, EventoPagina, EventoPaginaParcial, EventoParcial, PaginaBusqueda, ResultadoCarga, SugerenciaEvento
+from app.schemas.historial import PaginaHistorial
+from app.schemas.serializacion import RespuestaJSON
+from app.models.evento_historial import AccionHistorialEnum
+from app.service.evento import agregar_evaluacion_a_evento, eliminar_evento, listar_eventos as listar_eventos_service, proyeccion_eventos, stream_eventos_ndjson
+from app.service.evento import crear_evento as crear_evento_service, crear_eventos_bulk as crear_eventos_bulk_service
+from app.crud.evento import listar_responsables_evento_crud, listar_responsables_eventos_crud
+from app.service.evento import actualizar_evento as actualizar_evento_service, obtener_evento_condicional
+from app.service.evento import exportar_eventos, filtro_eventos, suscribir_cambios
+from app.service.busqueda import autocompletar_eventos, buscar_eventos
+from app.service.calendario import calendario_eventos
+from app.service.historial import listar_historial
+
+
+# Máximo de eventos aceptados en una carga masiva
+MAX_CARGA_BULK = 2000
+# Máximo de eventos por consulta de responsables en lote
+MAX_IDS_RESPONSABLES = 500
+# Tipo de contenido de cada formato de exportación
+MEDIA_EXPORTACION = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
 
 
 router = APIRouter(
@@ -17,27 +31,190 @@ router = APIRouter(
     tags=["eventos"]
     )
 
+
+def _etags_cliente(if_none_match: Optional[str]) -> Set[str]:
+    """
+    ETags de `If-None-Match`. En GET la comparación es débil: se ignora el prefijo W/.
+    """
+    if not if_none_match:
+        return set()
+    return {etag.strip().removeprefix("W/") for etag in if_none_match.split(",") if etag.strip()}
+
+
+def filtros_eventos(
+    estado: Optional[EstadoEventoEnum] = Query(None, description="Solo eventos en este estado"),
+    tipo_evento: Optional[TipoEventoEnum] = Query(None, description="Solo eventos de este tipo"),
+    desde: Optional[datetime] = Query(None, description="Eventos que inician en esta fecha o después"),
+    hasta: Optional[datetime] = Query(None, description="Eventos que inician antes de esta fecha"),
+) -> Dict[str, Any]:
+    """
+    Filtros comunes del listado y de la exportación (dependencia de FastAPI).
+    """
+    return filtro_eventos(estado, tipo_evento, desde, hasta)
+
 # Crear Evento
 @router.post("/", response_model=EventoRespuesta, status_code=status.HTTP_201_CREATED)
 async def crear_evento(evento: EventoCrear):
-    return await crear_evento_service(evento)
+    return RespuestaJSON(await crear_evento_service(evento), status_code=status.HTTP_201_CREATED)
+
+# Crear muchos eventos a la vez (carga semestral)
+@router.post("/bulk", response_model=ResultadoCarga, status_code=status.HTTP_200_OK, summary="Crear eventos en lote")
+async def crear_eventos_bulk(
+    eventos: List[Dict[str, Any]] = Body(..., max_length=MAX_CARGA_BULK, description="Eventos con la forma de EventoCrear"),
+):
+    """
+    Crea muchos eventos en una sola solicitud con las mismas reglas de `POST /eventos`.
+    Retorna el resultado de cada elemento; los inválidos no impiden crear los demás.
+    """
+    return await crear_eventos_bulk_service(eventos)
 
 # Listar Eventos
-@router.get("/", response_model=list[EventoRespuesta], summary="Listar eventos",)
-async def get_eventos():
-    """Listar todos los eventos."""
-    eventos = await listar_eventos_service()  # service maneja la conversión ObjectId -> str
-    return eventos
+# Con `vista` o `fields` la página trae solo los campos pedidos: se documentan ambas formas
+@router.get(
+    "/",
+    response_model=Union[EventoPagina, EventoPaginaParcial],
+    summary="Listar eventos",
+    responses={200: {"content": {"application/x-ndjson": {}}, "description": "Página JSON o JSON Lines con `formato=ndjson`"}},
+)
+async def get_eventos(
+    limit: int = Query(50, ge=1, le=500, description="Cantidad máxima de eventos por página"),
+    after: Optional[str] = Query(None, description="Cursor `siguiente` de la página anterior"),
+    formato: Literal["json", "ndjson"] = Query("json", description="`ndjson` transmite todos los eventos (desde `after`), uno por línea"),
+    vista: Optional[Literal["resumen"]] = Query(None, description="`resumen`: solo nombre, fechas, estado y tipo"),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por coma (p. ej. `nombre,estado`)"),
+    filtro: Dict[str, Any] = Depends(filtros_eventos),
+):
+    """
+    Listar eventos paginados por cursor (keyset sobre fecha_inicio/_id).
+    Con `formato=ndjson` se transmiten todos los eventos posteriores a `after` sin cargarlos
+    en memoria (se ignora `limit`).
+    Con `vista` o `fields` Mongo solo devuelve los campos pedidos (respuesta EventoPaginaParcial,
+    o líneas con esos campos en `ndjson`).
+    """
+    proyeccion = proyeccion_eventos(vista, fields)
+    if formato == "ndjson":
+        return StreamingResponse(stream_eventos_ndjson(filtro, after, proyeccion), media_type="application/x-ndjson")
+
+    eventos = await listar_eventos_service(limit, after, proyeccion, filtro)  # service entrega dicts ya recortados
+    # RespuestaJSON serializa directo con orjson (sin segunda validación contra response_model)
+    return RespuestaJSON(eventos)
+
+# Exportar eventos (declarada antes de /{id_evento})
+@router.get("/export", summary="Exportar eventos", response_class=StreamingResponse)
+async def get_exportar_eventos(
+    formato: Literal["csv", "jsonl"] = Query("csv", alias="format", description="`csv` (una fila por evento) o `jsonl`"),
+    comprimir: bool = Query(False, alias="gzip", description="Comprimir el archivo con gzip"),
+    filtro: Dict[str, Any] = Depends(filtros_eventos),
+):
+    """
+    Exporta todos los eventos que cumplen los filtros, con responsables, instalaciones,
+    organizaciones y evaluaciones. Se transmite por lotes desde un cursor de Mongo.
+    """
+    nombre = f"eventos.{formato}" + (".gz" if comprimir else "")
+    return StreamingResponse(
+        exportar_eventos(formato, filtro, comprimir),
+        media_type="application/gzip" if comprimir else MEDIA_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nombre}"'},
+    )
+
+# Cambios de eventos en vivo (declarada antes de /{id_evento})
+@router.get("/stream", summary="Cambios de eventos en vivo (SSE)", response_class=StreamingResponse)
+async def get_stream_eventos(
+    estado: Optional[EstadoEventoEnum] = Query(None, description="Solo eventos que quedan en este estado"),
+    responsable: Optional[str] = Query(None, description="Solo eventos donde este usuario es responsable"),
+    last_event_id: Optional[str] = Header(None, description="Último `id` recibido; se reenvían los cambios posteriores"),
+):
+    """
+    Server-Sent Events con cada evento creado (`creado`), modificado (`actualizado`) o
+    eliminado (`eliminado`), en lugar de consultar el listado periódicamente.
+    Las eliminaciones llegan a todos los clientes (ya no se conoce su estado ni sus responsables).
+    `reinicio` indica que se perdieron cambios y conviene recargar el listado;
+    `desconectado` que el servidor cerró la conexión (cliente lento o apagado).
+    """
+    return StreamingResponse(
+        suscribir_cambios(estado, responsable, last_event_id),
+        media_type="text/event-stream",
+        # Sin caché ni buffering de proxies: cada mensaje debe llegar apenas se envía
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Calendario: eventos de un rango agrupados por día o semana (declarada antes de /{id_evento})
+@router.get("/calendario", response_model=CalendarioEventos, summary="Calendario de eventos")
+async def get_calendario(
+    desde: datetime = Query(..., description="Inicio del rango (incluido)"),
+    hasta: datetime = Query(..., description="Fin del rango (excluido)"),
+    granularidad: Literal["dia", "semana"] = Query("dia", description="Agrupar por día o por semana (lunes a domingo)"),
+    estado: Optional[EstadoEventoEnum] = Query(None, description="Solo eventos en este estado"),
+    tipo_evento: Optional[TipoEventoEnum] = Query(None, description="Solo eventos de este tipo"),
+):
+    """
+    Eventos que se cruzan con [`desde`, `hasta`), agrupados en el servidor con `$dateTrunc`
+    por su día (o semana) de inicio; los que empezaron antes del rango van al primer periodo.
+    Cada evento trae solo los campos del resumen (nombre, fechas, estado y tipo).
+    """
+    return RespuestaJSON(await calendario_eventos(desde, hasta, granularidad, estado, tipo_evento))
+
+# Buscar eventos por texto (declarada antes de /{id_evento})
+@router.get("/buscar", response_model=PaginaBusqueda, summary="Buscar eventos")
+async def get_buscar_eventos(
+    q: str = Query(..., min_length=1, max_length=200, description="Texto a buscar en nombre y descripción"),
+    limit: int = Query(20, ge=1, le=100, description="Cantidad máxima de resultados"),
+    offset: int = Query(0, ge=0, description="Resultados a saltar (`siguiente` de la página anterior)"),
+):
+    """
+    Búsqueda de texto completo sobre nombre y descripción, ordenada por relevancia (`score`).
+    """
+    return await buscar_eventos(q, limit, offset)
+
+# Autocompletar nombres de eventos
+@router.get("/autocompletar", response_model=List[SugerenciaEvento], summary="Autocompletar eventos")
+async def get_autocompletar_eventos(
+    prefijo: str = Query(..., min_length=1, max_length=100, description="Inicio del nombre del evento"),
+    limit: int = Query(10, ge=1, le=50, description="Cantidad máxima de sugerencias"),
+):
+    """
+    Eventos cuyo nombre empieza por `prefijo`, sin distinguir mayúsculas ni tildes.
+    """
+    return await autocompletar_eventos(prefijo, limit)
+
+# Historial de cambios de todos los eventos (declarada antes de /{id_evento})
+@router.get("/historial", response_model=PaginaHistorial, summary="Historial de cambios")
+async def get_historial(
+    desde: Optional[datetime] = Query(None, description="Cambios en esta fecha o después"),
+    hasta: Optional[datetime] = Query(None, description="Cambios antes de esta fecha"),
+    accion: Optional[AccionHistorialEnum] = Query(None, description="Solo cambios de este tipo"),
+    limit: int = Query(50, ge=1, le=500, description="Cantidad máxima de cambios por página"),
+    after: Optional[str] = Query(None, description="Cursor `siguiente` de la página anterior"),
+):
+    """
+    Creaciones, actualizaciones, evaluaciones y eliminaciones de eventos, de la más reciente
+    a la más antigua. Lee la colección `eventos_historial`, no los eventos.
+    Los cambios llegan al historial con hasta `HISTORIAL_INTERVALO_SEGUNDOS` de retraso.
+    """
+    return RespuestaJSON(await listar_historial(limit, after, desde, hasta, accion))
 
 # Obtener Evento por ID
-@router.get("/{id_evento}", response_model=EventoRespuesta, status_code=status.HTTP_200_OK)
-async def obtener_evento(id_evento: str):
+@router.get("/{id_evento}", response_model=Union[EventoRespuesta, EventoParcial], status_code=status.HTTP_200_OK)
+async def obtener_evento(
+    id_evento: str,
+    vista: Optional[Literal["resumen"]] = Query(None, description="`resumen`: solo nombre, fechas, estado y tipo"),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por coma"),
+    if_none_match: Optional[str] = Header(None),
+):
     """
     Obtener un evento por su ObjectId.
+    Con `vista` o `fields` solo se leen y devuelven los campos pedidos (`id`, `fecha_inicio`
+    y los de la proyección) en lugar del EventoRespuesta completo.
+    Responde con `ETag`; si `If-None-Match` trae la versión actual, retorna 304 sin cuerpo.
     """
     try:
-        evento = await get_evento_por_id(id_evento)
-        return evento
+        proyeccion = proyeccion_eventos(vista, fields)
+        etag, cuerpo = await obtener_evento_condicional(id_evento, proyeccion, _etags_cliente(if_none_match))
+        # no-cache: el cliente puede guardar la respuesta pero debe revalidarla con el ETag
+        cabeceras = {"ETag": etag, "Cache-Control": "no-cache"}
+        if cuerpo is None:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabeceras)
+        return RespuestaJSON(cuerpo, headers=cabeceras)
     except ValueError as e:
         # Errores controlados desde el service
         raise HTTPException(
@@ -59,7 +236,7 @@ async def patch_evento(id_evento: str, evento: EventoActualizar):
     """
     try:
         evento_actualizado = await actualizar_evento_service(id_evento, evento)
-        return evento_actualizado
+        return RespuestaJSON(evento_actualizado)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
@@ -87,7 +264,7 @@ async def agregar_evaluacion(id_evento: str, payload: EvaluacionCrear):
     """
     try:
         evento_actualizado = await agregar_evaluacion_a_evento(id_evento, payload)
-        return evento_actualizado
+        return RespuestaJSON(evento_actualizado, status_code=status.HTTP_201_CREATED)
     except HTTPException:
         raise
 
@@ -103,4 +280,33 @@ async def get_responsables_evento(id_evento: str):
     Retorna los responsables del evento indicado por su ID.
     """
     responsables = await listar_responsables_evento_crud(id_evento)
-    return responsables
\ No newline at end of file
+    return responsables
+
+
+# Historial de cambios de un evento (también de uno ya eliminado)
+@router.get("/{id_evento}/historial", response_model=PaginaHistorial, summary="Historial de un evento")
+async def get_historial_evento(
+    id_evento: str,
+    limit: int = Query(50, ge=1, le=500, description="Cantidad máxima de cambios por página"),
+    after: Optional[str] = Query(None, description="Cursor `siguiente` de la página anterior"),
+):
+    """
+    Cambios del evento, del más reciente al más antiguo.
+    """
+    return RespuestaJSON(await listar_historial(limit, after, id_evento=id_evento))
+
+
+# Listar responsables de varios eventos a la vez (pantalla de listado)
+@router.post(
+    "/responsables",
+    response_model=ResponsablesLote,
+    summary="Listar responsables de varios eventos",
+)
+async def post_responsables_eventos(
+    ids_eventos: List[str] = Body(..., min_length=1, max_length=MAX_IDS_RESPONSABLES, description="IDs de los eventos"),
+):
+    """
+    Retorna los responsables de cada evento pedido con una sola consulta.
+    Los IDs que no corresponden a ningún evento se listan en `no_encontrados`.
+    """
+    return await listar_responsables_eventos_crud(ids_eventos)
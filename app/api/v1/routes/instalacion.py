@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Query
+from app.schemas.instalacion import InstalacionDisponible
+from app.service.instalacion import listar_instalaciones_disponibles
+
+
+router = APIRouter(
+    prefix="/instalaciones",
+    tags=["instalaciones"]
+    )
+
+# Buscar instalaciones libres en un rango de fechas
+@router.get("/disponibles", response_model=List[InstalacionDisponible], summary="Instalaciones disponibles")
+async def get_instalaciones_disponibles(
+    desde: datetime = Query(..., description="Inicio del rango buscado"),
+    hasta: datetime = Query(..., description="Fin del rango buscado"),
+    capacidad: Optional[int] = Query(None, ge=1, description="Capacidad mínima requerida"),
+):
+    """
+    Retorna las instalaciones sin eventos que se crucen con [desde, hasta)
+    y con al menos `capacidad` puestos.
+    """
+    return await listar_instalaciones_disponibles(desde, hasta, capacidad)
@@ -0,0 +1,58 @@
+from typing import Optional
+from fastapi import APIRouter, Query, Response, status
+from app.schemas.revision import AsignacionRevision, PaginaColaRevision
+from app.schemas.serializacion import RespuestaJSON
+from app.service.revision import asignar_siguiente, liberar_asignacion, listar_cola_revision
+
+
+router = APIRouter(
+    prefix="/revision",
+    tags=["revision"]
+    )
+
+# Tomar el siguiente evento pendiente de la cola
+@router.get(
+    "/siguiente",
+    response_model=AsignacionRevision,
+    summary="Tomar el siguiente evento a revisar",
+    responses={204: {"description": "No hay eventos pendientes sin asignar"}},
+)
+async def get_siguiente_revision(
+    id_secretario: str = Query(..., description="Secretaria que revisará el evento"),
+):
+    """
+    Asigna a la secretaria el evento pendiente más antiguo que nadie está revisando.
+    Si ya tiene uno asignado y vigente, recibe ese mismo con el plazo renovado.
+    La asignación vence sola; al evaluar el evento (aprobado/rechazado) se libera.
+    Dos secretarias que piden a la vez nunca reciben el mismo evento.
+    """
+    asignacion = await asignar_siguiente(id_secretario)
+    if asignacion is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return RespuestaJSON(asignacion)
+
+
+# Devolver un evento a la cola sin evaluarlo
+@router.delete("/{id_evento}/asignacion", status_code=status.HTTP_200_OK, summary="Liberar un evento asignado")
+async def delete_asignacion(
+    id_evento: str,
+    id_secretario: str = Query(..., description="Secretaria que tiene asignado el evento"),
+):
+    """
+    Quita la asignación para que otra secretaria pueda tomar el evento.
+    """
+    return await liberar_asignacion(id_evento, id_secretario)
+
+
+# Listar la cola de eventos pendientes
+@router.get("/pendientes", response_model=PaginaColaRevision, summary="Cola de revisión")
+async def get_cola_revision(
+    limit: int = Query(50, ge=1, le=500, description="Cantidad máxima de eventos por página"),
+    after: Optional[str] = Query(None, description="Cursor `siguiente` de la página anterior"),
+    incluir_asignados: bool = Query(False, description="Incluir los eventos que ya tiene asignados alguna secretaria"),
+):
+    """
+    Eventos pendientes en orden de inicio, paginados por cursor sobre el índice
+    `estado_fecha_inicio`, con la secretaria asignada y el vencimiento de la asignación.
+    """
+    return RespuestaJSON(await listar_cola_revision(limit, after, incluir_asignados))
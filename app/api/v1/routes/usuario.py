@@ -0,0 +1,28 @@
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, Query
+from app.api.v1.routes.evento import filtros_eventos
+from app.schemas.evento import PaginaEventosUsuario
+from app.schemas.serializacion import RespuestaJSON
+from app.service.evento import listar_eventos_de_usuario
+
+
+router = APIRouter(
+    prefix="/usuarios",
+    tags=["usuarios"]
+    )
+
+# Eventos donde el usuario figura como responsable ("mis eventos")
+@router.get("/{id_usuario}/eventos", response_model=PaginaEventosUsuario, summary="Eventos de un usuario")
+async def get_eventos_de_usuario(
+    id_usuario: str,
+    limit: int = Query(50, ge=1, le=500, description="Cantidad máxima de eventos por página"),
+    after: Optional[str] = Query(None, description="Cursor `siguiente` de la página anterior"),
+    principal: bool = Query(False, description="Solo eventos donde el usuario es el responsable principal"),
+    filtro: Dict[str, Any] = Depends(filtros_eventos),
+):
+    """
+    Eventos del usuario paginados por cursor (keyset sobre fecha_inicio/_id), con los
+    mismos filtros del listado (`estado`, `tipo_evento`, `desde`, `hasta`).
+    Cada evento indica si el usuario es el responsable principal y su tipo de aval.
+    """
+    return RespuestaJSON(await listar_eventos_de_usuario(id_usuario, limit, after, filtro, principal))
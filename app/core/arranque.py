@@ -0,0 +1,51 @@
+"""
+Medición del arranque de cada worker.
+
+`app.main` importa este módulo antes que cualquier otro, así `INICIO` marca el comienzo de la
+carga de la aplicación. Las fases (importaciones, cliente, firma de índices, init_beanie...)
+se acumulan en `cronometro` y al terminar el lifespan se imprime el desglose junto con el
+tiempo hasta poder atender la primera solicitud, comparado con `ARRANQUE_PRESUPUESTO_MS`.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+INICIO = time.perf_counter()
+
+
+class Cronometro:
+    def __init__(self):
+        self.fases: Dict[str, float] = {}
+
+    @contextmanager
+    def fase(self, nombre: str) -> Iterator[None]:
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.fases[nombre] = self.fases.get(nombre, 0.0) + time.perf_counter() - inicio
+
+    def marcar(self, nombre: str) -> None:
+        """
+        Registra como fase el tiempo transcurrido desde INICIO (p. ej. las importaciones).
+        """
+        self.fases[nombre] = time.perf_counter() - INICIO
+
+    def total(self) -> float:
+        return time.perf_counter() - INICIO
+
+    def reportar(self, presupuesto_ms: int) -> float:
+        """
+        Imprime el desglose y retorna el total en milisegundos.
+        """
+        total_ms = self.total() * 1000
+        desglose = ", ".join(f"{nombre} {segundos * 1000:.0f} ms" for nombre, segundos in self.fases.items())
+        print(f"⏱️  Arranque: {desglose}")
+        if presupuesto_ms and total_ms > presupuesto_ms:
+            print(f"⚠️  Listo para atender en {total_ms:.0f} ms: supera el presupuesto de {presupuesto_ms} ms")
+        else:
+            print(f"🚀 Listo para atender en {total_ms:.0f} ms (presupuesto {presupuesto_ms} ms)")
+        return total_ms
+
+
+cronometro = Cronometro()
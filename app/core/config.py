@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import List
+from typing import List, Literal, Optional
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -18,6 +18,192 @@ class Settings(BaseSettings):
         description="Versión de la aplicación"
     )
     
+    # Pool de conexiones de Motor (por proceso: cada worker de uvicorn tiene su propio pool)
+    WEB_CONCURRENCY: int = Field(
+        default=1,
+        description="Workers de uvicorn (la misma variable que lee uvicorn para --workers)"
+    )
+    MONGO_CONEXIONES_TOTALES: int = Field(
+        default=100,
+        description="Conexiones a MongoDB para toda la instancia; se reparten entre los workers"
+    )
+    MONGO_MAX_POOL_SIZE: Optional[int] = Field(
+        default=None,
+        description="maxPoolSize por worker; si no se indica, MONGO_CONEXIONES_TOTALES / WEB_CONCURRENCY"
+    )
+    MONGO_MIN_POOL_SIZE: int = Field(
+        default=2,
+        description="Conexiones que el pool mantiene abiertas aunque no haya carga"
+    )
+    MONGO_MAX_IDLE_TIME_MS: int = Field(
+        default=60_000,
+        description="Tiempo que una conexión puede estar ociosa antes de cerrarse"
+    )
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = Field(
+        default=2_000,
+        description="Espera máxima por una conexión libre del pool antes de fallar"
+    )
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = Field(
+        default=5_000,
+        description="Espera máxima para encontrar un servidor disponible (por defecto de pymongo: 30 s)"
+    )
+    MONGO_CONNECT_TIMEOUT_MS: int = Field(
+        default=5_000,
+        description="Tiempo máximo para abrir una conexión"
+    )
+    MONGO_SOCKET_TIMEOUT_MS: int = Field(
+        default=20_000,
+        description="Tiempo máximo de espera de una respuesta de MongoDB"
+    )
+    MONGO_COMPRESORES: str = Field(
+        default="zstd",
+        description="Compresión del protocolo, en orden de preferencia: zstd, snappy, zlib (vacío = sin compresión)"
+    )
+    MONGO_READ_PREFERENCE: Literal["primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"] = Field(
+        default="primary",
+        description="Preferencia de lectura del cliente"
+    )
+    MONGO_POOL_UMBRAL_SATURACION: float = Field(
+        default=0.9,
+        description="Fracción del pool en uso a partir de la cual /health/ready responde 503"
+    )
+
+    @property
+    def mongo_max_pool_size(self) -> int:
+        if self.MONGO_MAX_POOL_SIZE:
+            return self.MONGO_MAX_POOL_SIZE
+        return max(1, self.MONGO_CONEXIONES_TOTALES // max(1, self.WEB_CONCURRENCY))
+
+    # Índices de MongoDB
+    MONGO_INDICES_MODO: Literal["beanie", "background", "omitir"] = Field(
+        default="background",
+        description="'beanie': init_beanie crea los índices al arrancar; "
+                    "'background': se sincronizan en segundo plano sin bloquear el arranque; "
+                    "'omitir': no se tocan (usar `python -m app.db.indices`)"
+    )
+    MONGO_INDICES_ELIMINAR: bool = Field(
+        default=False,
+        description="Eliminar en la sincronización los índices que no están declarados en los modelos"
+    )
+    ARRANQUE_RAPIDO: bool = Field(
+        default=True,
+        description="Omitir la revisión de índices si su firma coincide con la última sincronización exitosa"
+    )
+    ARRANQUE_PRESUPUESTO_MS: int = Field(
+        default=3000,
+        description="Tiempo máximo esperado hasta atender la primera solicitud; si se supera se avisa en el log"
+    )
+
+    # Cache en memoria de datos de referencia (usuarios, instalaciones, organizaciones externas)
+    CACHE_REFERENCIAS_HABILITADO: bool = Field(
+        default=True,
+        description="Cachear en memoria las lecturas de datos de referencia"
+    )
+    CACHE_REFERENCIAS_TTL_SEGUNDOS: float = Field(
+        default=60.0,
+        description="Tiempo máximo que una entrada permanece en el cache"
+    )
+    CACHE_REFERENCIAS_MAX_ENTRADAS: int = Field(
+        default=5000,
+        description="Entradas máximas por colección (se descartan las menos usadas)"
+    )
+    CACHE_REFERENCIAS_CHANGE_STREAM: bool = Field(
+        default=True,
+        description="Invalidar el cache con un change stream cuando MongoDB es un replica set"
+    )
+
+    # Exportación de eventos (CSV / JSON Lines)
+    EXPORTACION_TAMANO_LOTE: int = Field(
+        default=1000,
+        description="Eventos por lote del cursor al exportar; acota la memoria usada por exportación"
+    )
+
+    # Historial de cambios de los eventos (colección eventos_historial)
+    HISTORIAL_HABILITADO: bool = Field(
+        default=True,
+        description="Registrar cada creación, actualización, evaluación y eliminación de eventos"
+    )
+    HISTORIAL_RETENCION_DIAS: float = Field(
+        default=365.0,
+        description="Días que se conserva cada entrada (índice TTL; cambiarlo recrea el índice)"
+    )
+    HISTORIAL_TAMANO_LOTE: int = Field(
+        default=500,
+        description="Entradas máximas por insert_many del escritor en segundo plano"
+    )
+    HISTORIAL_INTERVALO_SEGUNDOS: float = Field(
+        default=1.0,
+        description="Espera máxima antes de escribir un lote incompleto"
+    )
+    HISTORIAL_MAX_PENDIENTES: int = Field(
+        default=50000,
+        description="Entradas en memoria sin escribir; si Mongo no da abasto se descartan las más antiguas"
+    )
+    HISTORIAL_CONFIRMAR_ESCRITURAS: bool = Field(
+        default=False,
+        description="Pedir confirmación (w=1) a las escrituras del historial; por defecto w=0"
+    )
+
+    # Cambios en vivo por Server-Sent Events (GET /eventos/stream)
+    SSE_HABILITADO: bool = Field(
+        default=True,
+        description="Abrir el change stream de eventos para los clientes SSE (requiere replica set)"
+    )
+    SSE_COLA_MAX: int = Field(
+        default=100,
+        description="Mensajes pendientes por cliente; si se llena, el cliente se desconecta"
+    )
+    SSE_BUFFER_REANUDACION: int = Field(
+        default=1000,
+        description="Últimos cambios guardados para reenviar a quien se reconecta con Last-Event-ID"
+    )
+    SSE_LATIDO_SEGUNDOS: float = Field(
+        default=15.0,
+        description="Cada cuánto se envía un comentario a un cliente sin cambios"
+    )
+    SSE_MAX_SUSCRIPTORES: int = Field(
+        default=1000,
+        description="Clientes SSE simultáneos por proceso"
+    )
+
+    # Cola de revisión de secretarías (GET /revision/siguiente)
+    REVISION_ASIGNACION_SEGUNDOS: float = Field(
+        default=900.0,
+        description="Tiempo que un evento queda asignado a una secretaria antes de volver a la cola"
+    )
+
+    # Cache de respuestas de GET /eventos/{id} (cuerpo serializado + ETag)
+    CACHE_EVENTOS_HABILITADO: bool = Field(
+        default=False,
+        description="Cachear en memoria las respuestas de lectura de un evento"
+    )
+    CACHE_EVENTOS_TTL_SEGUNDOS: float = Field(
+        default=5.0,
+        description="TTL corto: acota lo que otro worker puede servir desactualizado sin change stream"
+    )
+    CACHE_EVENTOS_MAX_ENTRADAS: int = Field(
+        default=2000,
+        description="Eventos máximos en el cache de respuestas (se descartan los menos usados)"
+    )
+
+    # Estadísticas precalculadas (colección estadisticas_mensuales)
+    ESTADISTICAS_INTERVALO_SEGUNDOS: float = Field(
+        default=300.0,
+        description="Cada cuánto se refrescan en segundo plano los meses con eventos modificados (0 = nunca)"
+    )
+
+    # Propagación de nombres desnormalizados (usuarios, instalaciones, organizaciones -> eventos)
+    PROPAGACION_TAMANO_LOTE: int = Field(
+        default=500,
+        description="Operaciones UpdateMany por bulk_write al propagar nombres a los eventos"
+    )
+
+    # Métricas Prometheus (GET /metrics)
+    METRICAS_HABILITADAS: bool = Field(
+        default=True,
+        description="Medir rutas HTTP y comandos de MongoDB y exponerlos en /metrics"
+    )
+
     # Configuración de CORS
     ALLOWED_ORIGINS: List[str] = Field(
         default=["*"], 
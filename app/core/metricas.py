@@ -0,0 +1,157 @@
+"""
+Métricas Prometheus de la API, expuestas en GET /metrics.
+
+- HTTP: latencia por ruta (plantilla, p. ej. /api/v1/eventos/eventos/{id_evento}),
+  solicitudes por código de estado y solicitudes en curso. Las mide `MiddlewareMetricas`.
+- MongoDB: latencia, cantidad y documentos por comando y colección. Las mide
+  `ListenerComandosMongo`, registrado en el AsyncIOMotorClient.
+
+Todo vive en memoria del proceso (registro propio); no se necesita ningún servicio externo.
+"""
+import time
+from typing import Any, Dict, Tuple
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+from pymongo import monitoring
+
+registro = CollectorRegistry()
+
+# ----- HTTP -----
+
+HTTP_SOLICITUDES = Counter(
+    "http_solicitudes_total", "Solicitudes HTTP atendidas", ["metodo", "ruta", "estado"], registry=registro
+)
+HTTP_DURACION = Histogram(
+    "http_duracion_segundos", "Latencia de las solicitudes HTTP", ["metodo", "ruta"], registry=registro,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HTTP_EN_CURSO = Gauge(
+    "http_solicitudes_en_curso", "Solicitudes HTTP en curso", ["metodo"], registry=registro
+)
+
+# ----- MongoDB -----
+
+MONGO_COMANDOS = Counter(
+    "mongo_comandos_total", "Comandos enviados a MongoDB", ["comando", "coleccion", "resultado"], registry=registro
+)
+MONGO_DURACION = Histogram(
+    "mongo_comando_duracion_segundos", "Latencia de los comandos de MongoDB", ["comando", "coleccion"], registry=registro,
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+MONGO_DOCUMENTOS = Counter(
+    "mongo_documentos_total", "Documentos devueltos o afectados por los comandos de MongoDB",
+    ["comando", "coleccion"], registry=registro,
+)
+
+MONGO_POOL_EN_USO = Gauge(
+    "mongo_pool_conexiones_en_uso", "Conexiones del pool prestadas a una operación", ["servidor"], registry=registro
+)
+MONGO_POOL_ESPERAS_AGOTADAS = Counter(
+    "mongo_pool_esperas_agotadas_total", "Operaciones que no obtuvieron conexión del pool a tiempo",
+    ["servidor"], registry=registro,
+)
+
+# ----- Historial de eventos -----
+
+HISTORIAL_DESCARTADOS = Counter(
+    "historial_entradas_descartadas_total", "Entradas del historial descartadas por exceder HISTORIAL_MAX_PENDIENTES",
+    registry=registro,
+)
+
+# ----- Cambios en vivo (SSE) -----
+
+SSE_SUSCRIPTORES = Gauge(
+    "sse_suscriptores", "Clientes conectados a GET /eventos/stream en este proceso", registry=registro
+)
+SSE_DESCARTADOS = Counter(
+    "sse_suscriptores_descartados_total", "Clientes desconectados por no leer los cambios a tiempo", registry=registro
+)
+
+# Comandos con colección cuyo resultado trae documentos (cursor) o un conteo `n`
+COMANDOS_CURSOR = {"find": "firstBatch", "aggregate": "firstBatch", "getMore": "nextBatch"}
+COMANDOS_CONTEO = {"insert", "update", "delete"}
+
+
+def _ruta(scope: Dict[str, Any]) -> str:
+    """
+    Plantilla de la ruta que atendió la solicitud; evita una serie por cada ID.
+    """
+    ruta = scope.get("route")
+    return getattr(ruta, "path", None) or "sin_ruta"
+
+
+class MiddlewareMetricas:
+    """
+    Middleware ASGI puro (sin BaseHTTPMiddleware): no envuelve el cuerpo de la respuesta,
+    solo toma el código de estado del primer mensaje y mide el tiempo total.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metodo = scope["method"]
+        estado = 500
+        inicio = time.perf_counter()
+
+        async def send_con_estado(mensaje):
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                estado = mensaje["status"]
+            await send(mensaje)
+
+        HTTP_EN_CURSO.labels(metodo).inc()
+        try:
+            await self.app(scope, receive, send_con_estado)
+        finally:
+            HTTP_EN_CURSO.labels(metodo).dec()
+            # El router de Starlette deja la ruta resuelta en el mismo scope
+            ruta = _ruta(scope)
+            HTTP_DURACION.labels(metodo, ruta).observe(time.perf_counter() - inicio)
+            HTTP_SOLICITUDES.labels(metodo, ruta, str(estado)).inc()
+
+
+class ListenerComandosMongo(monitoring.CommandListener):
+    """
+    Mide los comandos que tienen colección (find, insert, aggregate, getMore...).
+    Los comandos internos del driver (hello, ping, endSessions...) se ignoran.
+    pymongo lo llama desde sus hilos, por eso solo hace operaciones atómicas.
+    """
+
+    def __init__(self):
+        self._colecciones: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        coleccion = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            coleccion = event.command.get("collection")
+        if isinstance(coleccion, str):
+            self._colecciones[(event.connection_id, event.request_id)] = coleccion
+
+    def _terminar(self, event, resultado: str):
+        coleccion = self._colecciones.pop((event.connection_id, event.request_id), None)
+        if coleccion is None:
+            return None
+        MONGO_COMANDOS.labels(event.command_name, coleccion, resultado).inc()
+        MONGO_DURACION.labels(event.command_name, coleccion).observe(event.duration_micros / 1_000_000)
+        return coleccion
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        coleccion = self._terminar(event, "ok")
+        if coleccion is None:
+            return
+        respuesta = event.reply
+        lote = COMANDOS_CURSOR.get(event.command_name)
+        if lote is not None:
+            documentos = len(respuesta.get("cursor", {}).get(lote, []))
+        elif event.command_name in COMANDOS_CONTEO:
+            documentos = respuesta.get("n", 0)
+        else:
+            return
+        MONGO_DOCUMENTOS.labels(event.command_name, coleccion).inc(documentos)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._terminar(event, "error")
@@ -1,16 +1,9 @@
 from fastapi import APIRouter, HTTPException, status
 from beanie import PydanticObjectId
 from typing import List, Optional, Dict, Any
-from app.schemas.agregaciones import organizador
-from app.schemas.evento import EvaluacionCrear, EventoActualizar, EventoActualizar, EventoCrear, EventoRespuesta
+from app.schemas.agregaciones import ResponsablesLote, organizador
+from app.schemas.evento import EvaluacionCrear, EventoActualizar, EventoCrear, EventoPagina, EventoRespuesta
 from app.models.evento import Evento
-from app.models.usuario import Usuario
-from app.models.instalacion import Instalacion
-from app.models.organizacion_externa import OrganizacionExterna 
-from bson import ObjectId
-from datetime import datetime
-from app.db.mongodb import db
-from app.core.config import settings
 from app.service.evento import actualizar_evento, eliminar_evento, listar_eventos
 from app.service.evento import crear_evento as crear_evento_service
 from app.service.evento import obtener_evento_por_id, agregar_evaluacion_a_evento
@@ -29,18 +22,18 @@ async def crear_evento(payload: EventoCrear):
 
 
 # Listar eventos 
-@router.get("/", response_model=List[EventoRespuesta])
-async def get_eventos():
-    """Listar todos los eventos."""
-    return await listar_eventos()
+@router.get("/", response_model=EventoPagina)
+async def get_eventos(limit: int = 50, after: Optional[str] = None):
+    """Listar eventos paginados por cursor."""
+    return await listar_eventos(limit, after)
 
 
-async def get_evento_por_id(id_evento: str):
+async def get_evento_por_id(id_evento: str, proyeccion=None):
     """
     CRUD para obtener un evento por su ID.
     Solo delega al service.
     """
-    return await obtener_evento_por_id(id_evento)
+    return await obtener_evento_por_id(id_evento, proyeccion)
 
 
 @router.patch("/{id_evento}", response_model=EventoRespuesta)
@@ -74,9 +67,39 @@ async def agregar_evaluacion(id_evento: str, payload: EvaluacionCrear):
         raise
 
 
+# Solo los campos de usuario que se exponen: el historial de contraseñas nunca sale de Mongo
+def _pipeline_responsables(match: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {"$match": match},
+        {"$project": {"responsables.id_responsable": 1}},
+        {
+            "$lookup": {
+                "from": "usuarios",
+                "localField": "responsables.id_responsable",
+                "foreignField": "_id",
+                "pipeline": [{"$project": {"nombre": 1, "rol": 1, "vinculacion.nombre": 1}}],
+                "as": "organizador"
+            }
+        },
+        {"$project": {"_id": 1, "organizador": 1}},
+    ]
+
+
+def _organizadores(doc: Dict[str, Any]) -> List[organizador]:
+    """
+    Un organizador por cada vinculación de cada responsable (equivale a los dos $unwind).
+    """
+    return [
+        organizador(_id_org=str(u["_id"]), nombre=u.get("nombre"), rol=u.get("rol"), vinculacion=v.get("nombre"))
+        for u in doc.get("organizador", [])
+        for v in u.get("vinculacion") or []
+    ]
+
+
 async def listar_responsables_evento_crud(id_evento: str):
     """
-    Retorna los responsables del evento usando un aggregate con $lookup y $unwind.
+    Retorna los responsables del evento usando un solo aggregate con $lookup:
+    si el evento no existe el pipeline no devuelve documentos.
     """
 
     # 1. Validar que el ID sea un ObjectId válido
@@ -88,46 +111,51 @@ async def listar_responsables_evento_crud(id_evento: str):
             detail="ID de evento no válido."
         )
 
-    # 2. Verificar que el evento exista
-    evento = await Evento.get(object_id)
-    if not evento:
+    # 2. Ejecutar el pipeline (existencia y responsables en una sola ida a Mongo)
+    resultado = await Evento.aggregate(_pipeline_responsables({"_id": object_id})).to_list()
+
+    # 3. Verificar que el evento exista
+    if not resultado:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No existe un evento con el ID {id_evento}."
         )
 
-    # 3. Ejecutar el pipeline
-    pipeline = [
-        {"$match": {"_id": object_id}},
-        {
-            "$lookup": {
-                "from": "usuarios",
-                "localField": "responsables.id_responsable",
-                "foreignField": "_id",
-                "as": "organizador"
-            }
-        },
-        {"$unwind": {"path": "$organizador"}},
-        {"$unwind": {"path": "$organizador.vinculacion"}},
-        {
-            "$project": {
-                "_id": 0,
-                "_id_org": "$organizador._id",
-                "nombre": "$organizador.nombre",
-                "rol": "$organizador.rol",
-                "vinculacion": "$organizador.vinculacion.nombre"
-            }
-        }
-    ]
-
-    resultado = await Evento.aggregate(pipeline).to_list()
-
     # 4. Si no hay responsables (teóricamente nunca pasaría)
-    if not resultado:
+    responsables = _organizadores(resultado[0])
+    if not responsables:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="El evento no tiene responsables registrados."
         )
 
-    # 5. Convertir cada resultado al schema organizdor
-    return [organizador(**r) for r in resultado]
+    # 5. Retornar los responsables con el schema organizador
+    return responsables
+
+
+async def listar_responsables_eventos_crud(ids_eventos: List[str]) -> ResponsablesLote:
+    """
+    Responsables de muchos eventos con un solo aggregate ($match por $in + $lookup).
+    Los eventos que no existen se reportan en `no_encontrados`.
+    """
+
+    # 1. Validar todos los IDs y reportar juntos los inválidos
+    invalidos = [i for i in ids_eventos if not PydanticObjectId.is_valid(i)]
+    if invalidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "IDs de evento no válidos.", "ids": invalidos}
+        )
+    ids_unicos = list(dict.fromkeys(ids_eventos))
+
+    # 2. Un solo pipeline para todos los eventos
+    resultado = await Evento.aggregate(
+        _pipeline_responsables({"_id": {"$in": [PydanticObjectId(i) for i in ids_unicos]}})
+    ).to_list()
+    por_evento = {str(doc["_id"]): _organizadores(doc) for doc in resultado}
+
+    # 3. Respetar el orden pedido
+    return ResponsablesLote(
+        responsables={i: por_evento[i] for i in ids_unicos if i in por_evento},
+        no_encontrados=[i for i in ids_unicos if i not in por_evento],
+    )
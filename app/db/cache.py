@@ -0,0 +1,221 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+from app.core.config import settings
+
+# Colecciones de datos de referencia (pequeñas y con pocos cambios) que se cachean en memoria
+COLECCIONES_CACHEADAS = ("usuarios", "instalaciones", "organizaciones_externas")
+COLECCION_EVENTOS = "eventos"
+
+
+class CacheTTL:
+    """
+    Cache LRU en memoria con expiración por TTL y contadores de aciertos/fallos.
+
+    Los valores guardados se comparten entre peticiones: quien los lee no debe modificarlos.
+    """
+
+    def __init__(self, nombre: str, max_entradas: int, ttl_segundos: float):
+        self.nombre = nombre
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+        self._datos: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._en_vuelo: Dict[Hashable, asyncio.Future] = {}
+        # Cambia con cada invalidación: una carga iniciada antes no puede guardar datos viejos
+        self._generacion = 0
+
+    @property
+    def generacion(self) -> int:
+        return self._generacion
+
+    def obtener(self, clave: Hashable) -> Optional[Any]:
+        entrada = self._datos.get(clave)
+        if entrada is None:
+            return None
+        expira, valor = entrada
+        if expira < time.monotonic():
+            del self._datos[clave]
+            return None
+        self._datos.move_to_end(clave)
+        return valor
+
+    def guardar(self, clave: Hashable, valor: Any, generacion: Optional[int] = None) -> None:
+        """
+        Con `generacion` (leída antes de cargar el valor) no se guarda nada si hubo
+        una invalidación mientras tanto.
+        """
+        if generacion is not None and generacion != self._generacion:
+            return
+        self._datos[clave] = (time.monotonic() + self.ttl_segundos, valor)
+        self._datos.move_to_end(clave)
+        while len(self._datos) > self.max_entradas:
+            self._datos.popitem(last=False)
+
+    def invalidar(self, clave: Optional[Hashable] = None) -> None:
+        """
+        Elimina una clave, o todo el cache si no se indica ninguna.
+        """
+        self._generacion += 1
+        self.invalidaciones += 1
+        if clave is None:
+            self._datos.clear()
+        else:
+            self._datos.pop(clave, None)
+
+    async def obtener_muchos(
+        self,
+        claves: Iterable[Hashable],
+        cargar: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+    ) -> Dict[Hashable, Any]:
+        """
+        Retorna {clave: valor} para las claves encontradas.
+        Las que no están en cache se piden juntas con una sola llamada a `cargar`;
+        si otra petición ya las está cargando se espera ese mismo resultado.
+        Las claves inexistentes no se cachean.
+        """
+        resultado: Dict[Hashable, Any] = {}
+        esperar: Dict[Hashable, asyncio.Future] = {}
+        faltantes: List[Hashable] = []
+
+        # 1. Separar aciertos, cargas en curso y fallos
+        for clave in claves:
+            valor = self.obtener(clave)
+            if valor is not None:
+                self.aciertos += 1
+                resultado[clave] = valor
+            elif clave in self._en_vuelo:
+                self.aciertos += 1
+                esperar[clave] = self._en_vuelo[clave]
+            else:
+                self.fallos += 1
+                faltantes.append(clave)
+
+        # 2. Cargar los fallos en una sola consulta
+        if faltantes:
+            loop = asyncio.get_running_loop()
+            futuros = {clave: loop.create_future() for clave in faltantes}
+            self._en_vuelo.update(futuros)
+            generacion = self._generacion
+            try:
+                cargados = await cargar(faltantes)
+            except BaseException as e:
+                for futuro in futuros.values():
+                    futuro.set_exception(e)
+                    # Evita "exception was never retrieved" si nadie más la esperaba
+                    futuro.exception()
+                raise
+            finally:
+                for clave in faltantes:
+                    self._en_vuelo.pop(clave, None)
+
+            for clave, futuro in futuros.items():
+                valor = cargados.get(clave)
+                futuro.set_result(valor)
+                if valor is not None:
+                    resultado[clave] = valor
+                    if generacion == self._generacion:
+                        self.guardar(clave, valor)
+
+        # 3. Esperar las cargas que ya estaban en curso
+        for clave, futuro in esperar.items():
+            valor = await futuro
+            if valor is not None:
+                resultado[clave] = valor
+
+        return resultado
+
+    def estadisticas(self) -> Dict[str, int]:
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "invalidaciones": self.invalidaciones,
+            "entradas": len(self._datos),
+        }
+
+
+caches: Dict[str, CacheTTL] = {
+    nombre: CacheTTL(
+        nombre,
+        max_entradas=settings.CACHE_REFERENCIAS_MAX_ENTRADAS,
+        ttl_segundos=settings.CACHE_REFERENCIAS_TTL_SEGUNDOS,
+    )
+    for nombre in COLECCIONES_CACHEADAS
+}
+
+# Respuestas ya serializadas de GET /eventos/{id}: {id: {variante: (etag, cuerpo)}}
+respuestas_eventos = CacheTTL(
+    "respuestas_eventos",
+    max_entradas=settings.CACHE_EVENTOS_MAX_ENTRADAS,
+    ttl_segundos=settings.CACHE_EVENTOS_TTL_SEGUNDOS,
+)
+
+
+def cache_de(nombre_coleccion: str) -> Optional[CacheTTL]:
+    """
+    Cache de la colección indicada, o None si la colección no se cachea
+    (o el cache está deshabilitado en la configuración).
+    """
+    if not settings.CACHE_REFERENCIAS_HABILITADO:
+        return None
+    return caches.get(nombre_coleccion)
+
+
+def cache_respuestas_eventos() -> Optional[CacheTTL]:
+    if not settings.CACHE_EVENTOS_HABILITADO:
+        return None
+    return respuestas_eventos
+
+
+def invalidar(nombre_coleccion: str, id_documento: Optional[Hashable] = None) -> None:
+    """
+    Hook de escritura local: los modelos y el service de eventos lo llaman después de guardar o eliminar.
+    """
+    cache = respuestas_eventos if nombre_coleccion == COLECCION_EVENTOS else caches.get(nombre_coleccion)
+    if cache is not None:
+        cache.invalidar(id_documento)
+
+
+def estadisticas() -> Dict[str, Dict[str, int]]:
+    return {
+        **{nombre: cache.estadisticas() for nombre, cache in caches.items()},
+        respuestas_eventos.nombre: respuestas_eventos.estadisticas(),
+    }
+
+
+async def vigilar_cambios(database) -> None:
+    """
+    Invalida el cache con un change stream sobre las colecciones de referencia
+    (y sobre eventos, si el cache de respuestas está activo), para enterarse
+    también de escrituras hechas por otros procesos.
+    Solo funciona si Mongo es un replica set; si no, termina sin hacer nada.
+    """
+    hello = await database.client.admin.command("hello")
+    if "setName" not in hello:
+        print("ℹ️  MongoDB no es un replica set: el cache de referencias solo se invalida localmente.")
+        return
+
+    colecciones = list(COLECCIONES_CACHEADAS)
+    if settings.CACHE_EVENTOS_HABILITADO:
+        colecciones.append(COLECCION_EVENTOS)
+    pipeline = [{"$match": {
+        "ns.coll": {"$in": colecciones},
+        "operationType": {"$in": ["update", "replace", "delete"]},
+    }}]
+
+    while True:
+        try:
+            async with database.watch(pipeline) as stream:
+                async for cambio in stream:
+                    invalidar(cambio["ns"]["coll"], cambio["documentKey"]["_id"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️  Change stream del cache interrumpido ({e}); se vacía el cache y se reintenta.")
+            # Mientras el stream estuvo caído se pudieron perder cambios
+            for cache in (*caches.values(), respuestas_eventos):
+                cache.invalidar()
+            await asyncio.sleep(5)
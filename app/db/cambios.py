@@ -0,0 +1,258 @@
+"""
+Difusión en vivo de los cambios de eventos (GET /eventos/stream, Server-Sent Events).
+
+Cada proceso abre un solo change stream sobre `eventos` (`difundir_cambios`), sin importar
+cuántos clientes estén conectados. Cada cambio se serializa una vez como mensaje SSE y se
+reparte a las colas de los suscriptores cuyo filtro (estado / responsable) lo acepta.
+
+- Colas acotadas (`SSE_COLA_MAX`): un cliente que no lee a tiempo se desconecta en lugar de
+  acumular memoria; al reconectarse con `Last-Event-ID` recupera lo que le faltó.
+- El `id` de cada mensaje es el resume token del change stream. Los últimos
+  `SSE_BUFFER_REANUDACION` mensajes se guardan en memoria para reenviarlos a quien se reconecta;
+  si el id ya no está, el cliente recibe `reinicio` y debe volver a pedir el listado.
+- El change stream propio se reanuda con su último token tras un error, sin perder cambios.
+
+Los change streams requieren que MongoDB sea un replica set (basta uno de un solo nodo).
+"""
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, FrozenSet, List, NamedTuple, Optional, Set
+from pymongo.errors import OperationFailure
+from app.core.config import settings
+from app.core.metricas import SSE_DESCARTADOS, SSE_SUSCRIPTORES
+from app.schemas.serializacion import a_json
+
+COLECCION_EVENTOS = "eventos"
+
+# Cambios que no interesan a los clientes: tomar o liberar un evento de la cola de revisión
+CAMPOS_ASIGNACION = ["revisor", "revision_vence"]
+# Campos del evento que viajan en cada mensaje (además de los responsables, para filtrar)
+CAMPOS_MENSAJE = ["nombre", "estado", "tipo_evento", "fecha_inicio", "fecha_fin", "actualizado_en"]
+TIPOS = {"insert": "creado", "update": "actualizado", "replace": "actualizado", "delete": "eliminado"}
+# Códigos de Mongo cuando el token ya no está en el oplog o el stream no se puede reanudar
+ERRORES_SIN_REANUDACION = {280, 286}
+
+MENSAJE_INICIAL = b"retry: 3000\n\n"
+MENSAJE_LATIDO = b": latido\n\n"
+MENSAJE_REINICIO = b"event: reinicio\ndata: {}\n\n"
+
+
+def pipeline_cambios() -> List[Dict[str, Any]]:
+    """
+    Filtra en el servidor los cambios que solo tocan la asignación de revisión
+    (no se envían ni se busca su documento) y recorta el documento a lo que usa el mensaje.
+    """
+    # $ifNull: inserciones y eliminaciones no traen updateDescription
+    campos_cambiados = {"$setUnion": [
+        {"$map": {
+            "input": {"$objectToArray": {"$ifNull": ["$updateDescription.updatedFields", {}]}},
+            "in": "$$this.k",
+        }},
+        {"$ifNull": ["$updateDescription.removedFields", []]},
+    ]}
+    return [
+        {"$match": {"operationType": {"$in": list(TIPOS)}}},
+        {"$match": {"$expr": {"$or": [
+            {"$ne": ["$operationType", "update"]},
+            {"$gt": [{"$size": {"$setDifference": [campos_cambiados, CAMPOS_ASIGNACION]}}, 0]},
+        ]}}},
+        {"$project": {
+            "operationType": 1,
+            "documentKey": 1,
+            **{f"fullDocument.{campo}": 1 for campo in CAMPOS_MENSAJE},
+            "fullDocument.responsables.id_responsable": 1,
+        }},
+    ]
+
+
+class Mensaje(NamedTuple):
+    id: str                       # resume token del change stream (id SSE)
+    eliminado: bool
+    estado: Optional[str]
+    responsables: FrozenSet[str]
+    datos: bytes                  # mensaje SSE completo, serializado una sola vez
+
+
+def mensaje_de_cambio(cambio: Dict[str, Any]) -> Mensaje:
+    token = cambio["_id"]["_data"]
+    tipo = TIPOS[cambio["operationType"]]
+    documento = cambio.get("fullDocument") or {}
+    cuerpo = {
+        "tipo": tipo,
+        "id_evento": cambio["documentKey"]["_id"],
+        **{campo: documento.get(campo) for campo in CAMPOS_MENSAJE if campo in documento},
+    }
+    return Mensaje(
+        id=token,
+        eliminado=tipo == "eliminado",
+        estado=documento.get("estado"),
+        responsables=frozenset(str(r.get("id_responsable")) for r in documento.get("responsables", [])),
+        datos=b"id: " + token.encode() + b"\nevent: " + tipo.encode() + b"\ndata: " + a_json(cuerpo) + b"\n\n",
+    )
+
+
+class Suscriptor:
+    """
+    Un cliente conectado: su filtro y su cola acotada de mensajes ya serializados.
+    """
+
+    def __init__(self, estado: Optional[str] = None, id_responsable: Optional[str] = None):
+        self.estado = estado
+        self.id_responsable = id_responsable
+        self.cola: asyncio.Queue = asyncio.Queue(maxsize=settings.SSE_COLA_MAX)
+        # Motivo de la desconexión decidida por el servidor ('lento' o 'cierre')
+        self.motivo: Optional[str] = None
+
+    def acepta(self, mensaje: Mensaje) -> bool:
+        # Un evento eliminado ya no trae documento: se avisa a todos
+        if mensaje.eliminado:
+            return True
+        if self.estado and mensaje.estado != self.estado:
+            return False
+        return not self.id_responsable or self.id_responsable in mensaje.responsables
+
+
+class Difusor:
+    """
+    Reparte los cambios del change stream compartido entre los suscriptores del proceso.
+    Todo ocurre en el event loop: publicar y suscribir nunca se intercalan.
+    """
+
+    def __init__(self):
+        self.suscriptores: Set[Suscriptor] = set()
+        self.recientes: Deque[Mensaje] = deque(maxlen=settings.SSE_BUFFER_REANUDACION)
+        # Solo hay change stream si Mongo es un replica set
+        self.disponible = False
+
+    @property
+    def lleno(self) -> bool:
+        return len(self.suscriptores) >= settings.SSE_MAX_SUSCRIPTORES
+
+    def _posteriores(self, ultimo_id: str) -> Optional[List[Mensaje]]:
+        """
+        Mensajes guardados después de `ultimo_id`; None si ese id ya salió del buffer.
+        """
+        for posicion, mensaje in enumerate(self.recientes):
+            if mensaje.id == ultimo_id:
+                return list(self.recientes)[posicion + 1:]
+        return None
+
+    def suscribir(self, estado: Optional[str] = None, id_responsable: Optional[str] = None,
+                  ultimo_id: Optional[str] = None) -> Suscriptor:
+        suscriptor = Suscriptor(estado, id_responsable)
+        if ultimo_id:
+            # Reconexión: reenviar lo que se perdió, o pedir un reinicio si no cabe o ya no está
+            perdidos = self._posteriores(ultimo_id)
+            perdidos = [m for m in perdidos if suscriptor.acepta(m)] if perdidos is not None else None
+            if perdidos is None or len(perdidos) > settings.SSE_COLA_MAX:
+                suscriptor.cola.put_nowait(MENSAJE_REINICIO)
+            else:
+                for mensaje in perdidos:
+                    suscriptor.cola.put_nowait(mensaje.datos)
+        self.suscriptores.add(suscriptor)
+        SSE_SUSCRIPTORES.set(len(self.suscriptores))
+        return suscriptor
+
+    def cancelar(self, suscriptor: Suscriptor) -> None:
+        self.suscriptores.discard(suscriptor)
+        SSE_SUSCRIPTORES.set(len(self.suscriptores))
+
+    def _desconectar(self, suscriptor: Suscriptor, motivo: str) -> None:
+        """
+        Saca al suscriptor y libera su cola; el None despierta a quien la está leyendo.
+        """
+        suscriptor.motivo = motivo
+        self.cancelar(suscriptor)
+        while not suscriptor.cola.empty():
+            suscriptor.cola.get_nowait()
+        suscriptor.cola.put_nowait(None)
+
+    def publicar(self, mensaje: Mensaje) -> None:
+        self.recientes.append(mensaje)
+        for suscriptor in list(self.suscriptores):
+            if not suscriptor.acepta(mensaje):
+                continue
+            try:
+                suscriptor.cola.put_nowait(mensaje.datos)
+            except asyncio.QueueFull:
+                SSE_DESCARTADOS.inc()
+                self._desconectar(suscriptor, "lento")
+
+    def reiniciar(self) -> None:
+        """
+        Se perdió la continuidad del change stream: los clientes deben recargar.
+        """
+        self.recientes.clear()
+        for suscriptor in list(self.suscriptores):
+            try:
+                suscriptor.cola.put_nowait(MENSAJE_REINICIO)
+            except asyncio.QueueFull:
+                self._desconectar(suscriptor, "lento")
+
+    def cerrar(self) -> None:
+        self.disponible = False
+        for suscriptor in list(self.suscriptores):
+            self._desconectar(suscriptor, "cierre")
+
+
+difusor = Difusor()
+
+
+async def mensajes(estado: Optional[str] = None, id_responsable: Optional[str] = None,
+                   ultimo_id: Optional[str] = None) -> AsyncIterator[bytes]:
+    """
+    Cuerpo de la respuesta SSE de un cliente. La suscripción se crea al empezar a transmitir
+    y se cancela cuando el cliente se desconecta (Starlette cancela el generador).
+    """
+    suscriptor = difusor.suscribir(estado, id_responsable, ultimo_id)
+    try:
+        yield MENSAJE_INICIAL
+        while True:
+            try:
+                datos = await asyncio.wait_for(suscriptor.cola.get(), timeout=settings.SSE_LATIDO_SEGUNDOS)
+            except asyncio.TimeoutError:
+                # Comentario SSE: mantiene viva la conexión a través de proxies
+                yield MENSAJE_LATIDO
+                continue
+            if datos is None:
+                yield b"event: desconectado\ndata: " + a_json({"motivo": suscriptor.motivo}) + b"\n\n"
+                return
+            yield datos
+    finally:
+        difusor.cancelar(suscriptor)
+
+
+async def difundir_cambios(database) -> None:
+    """
+    Tarea de fondo: un change stream sobre `eventos` que alimenta al difusor.
+    Solo funciona si Mongo es un replica set; si no, termina y el endpoint responde 503.
+    """
+    hello = await database.client.admin.command("hello")
+    if "setName" not in hello:
+        print("ℹ️  MongoDB no es un replica set: GET /eventos/stream no está disponible.")
+        return
+
+    difusor.disponible = True
+    token: Optional[Dict[str, Any]] = None
+    try:
+        while True:
+            try:
+                async with database[COLECCION_EVENTOS].watch(
+                    pipeline_cambios(), full_document="updateLookup", resume_after=token
+                ) as stream:
+                    async for cambio in stream:
+                        token = cambio["_id"]
+                        difusor.publicar(mensaje_de_cambio(cambio))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, OperationFailure) and e.code in ERRORES_SIN_REANUDACION:
+                    # El token ya no está en el oplog: se empieza de nuevo desde ahora
+                    print(f"⚠️  Change stream de eventos sin reanudación ({e}); los clientes deben recargar.")
+                    token = None
+                    difusor.reiniciar()
+                else:
+                    print(f"⚠️  Change stream de eventos interrumpido ({e}); se reanuda en 5 s.")
+                    await asyncio.sleep(5)
+    finally:
+        difusor.cerrar()
@@ -0,0 +1,100 @@
+"""
+Escritor en segundo plano del historial de eventos (colección `eventos_historial`).
+
+El service llama a `registrar` después de cada cambio: solo agrega la entrada a una cola en
+memoria, sin ir a Mongo. La tarea `escribir_historial` la vacía con `insert_many(ordered=False)`
+en lotes de `HISTORIAL_TAMANO_LOTE` (o cada `HISTORIAL_INTERVALO_SEGUNDOS` si hay pocos cambios),
+con write concern `w=0`: ninguna solicitud espera al historial. El costo es que una caída del
+proceso o un error de red pierde las entradas aún no escritas; el historial es informativo y
+la fuente de verdad siguen siendo los eventos.
+"""
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, Optional
+from bson import ObjectId
+from pymongo import WriteConcern
+from app.core.config import settings
+from app.core.metricas import HISTORIAL_DESCARTADOS
+
+COLECCION_HISTORIAL = "eventos_historial"
+
+_pendientes: Deque[Dict[str, Any]] = deque()
+_hay_lote: Optional[asyncio.Event] = None
+
+
+def _evento_lote() -> asyncio.Event:
+    global _hay_lote
+    if _hay_lote is None:
+        _hay_lote = asyncio.Event()
+    return _hay_lote
+
+
+def _valor(valor: Any) -> Any:
+    return getattr(valor, "value", valor)
+
+
+def registrar(
+    id_evento: ObjectId,
+    accion: str,
+    estado_anterior: Optional[Any] = None,
+    estado_nuevo: Optional[Any] = None,
+    id_usuario: Optional[Any] = None,
+    campos: Iterable[str] = (),
+) -> None:
+    """
+    Anota un cambio de un evento. No hace E/S: la tarea de fondo lo escribe.
+    El _id se genera aquí para que su orden sea el de los cambios.
+    """
+    if not settings.HISTORIAL_HABILITADO:
+        return
+    if len(_pendientes) >= settings.HISTORIAL_MAX_PENDIENTES:
+        _pendientes.popleft()
+        HISTORIAL_DESCARTADOS.inc()
+    _pendientes.append({
+        "_id": ObjectId(),
+        "id_evento": ObjectId(str(id_evento)),
+        "accion": _valor(accion),
+        "fecha": datetime.utcnow(),
+        "estado_anterior": _valor(estado_anterior),
+        "estado_nuevo": _valor(estado_nuevo),
+        "id_usuario": ObjectId(str(id_usuario)) if id_usuario else None,
+        "campos": list(campos),
+    })
+    if len(_pendientes) >= settings.HISTORIAL_TAMANO_LOTE:
+        _evento_lote().set()
+
+
+def _coleccion(database):
+    confirmacion = WriteConcern(w=1) if settings.HISTORIAL_CONFIRMAR_ESCRITURAS else WriteConcern(w=0)
+    return database[COLECCION_HISTORIAL].with_options(write_concern=confirmacion)
+
+
+async def vaciar(database) -> int:
+    """
+    Escribe todas las entradas pendientes por lotes. Retorna cuántas se enviaron.
+    """
+    coleccion = _coleccion(database)
+    enviadas = 0
+    while _pendientes:
+        lote = [_pendientes.popleft() for _ in range(min(len(_pendientes), settings.HISTORIAL_TAMANO_LOTE))]
+        try:
+            await coleccion.insert_many(lote, ordered=False)
+            enviadas += len(lote)
+        except Exception as e:
+            print(f"❌ Error escribiendo el historial ({len(lote)} entradas): {e}")
+    return enviadas
+
+
+async def escribir_historial(database) -> None:
+    """
+    Tarea de fondo: espera a que se junte un lote o a que pase el intervalo y escribe.
+    """
+    hay_lote = _evento_lote()
+    while True:
+        try:
+            await asyncio.wait_for(hay_lote.wait(), timeout=settings.HISTORIAL_INTERVALO_SEGUNDOS)
+        except asyncio.TimeoutError:
+            pass
+        hay_lote.clear()
+        await vaciar(database)
@@ -0,0 +1,201 @@
+"""
+Sincronización de índices declarados en `Settings.indexes` de cada documento Beanie.
+
+Compara los índices declarados con los que existen en Mongo, crea los que faltan
+(construcción en segundo plano) y, opcionalmente, elimina los que ya no están declarados.
+
+Uso por consola (desde la raíz del repositorio):
+
+    python -m app.db.indices              # crea los índices faltantes
+    python -m app.db.indices --simular    # solo muestra las diferencias
+    python -m app.db.indices --eliminar   # además elimina los índices no declarados
+
+Tras una sincronización sin errores se guarda la firma de los índices declarados en
+`indices_control`; con `ARRANQUE_RAPIDO` los arranques siguientes la comparan y, si coincide,
+no vuelven a consultar los índices de cada colección. La consola siempre revisa todo.
+"""
+import asyncio
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+from pymongo import IndexModel
+from app.db.modelsregistry import document_models
+
+COLECCION_CONTROL = "indices_control"
+ID_FIRMA = "firma"
+
+# Opciones que, si cambian, obligan a recrear el índice
+OPCIONES_COMPARADAS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression", "weights", "default_language")
+
+
+def _firma(especificacion: Dict[str, Any]) -> Tuple:
+    """
+    Representación comparable de un índice, venga de IndexModel.document
+    o de `index_information()`.
+    """
+    claves = list(especificacion["key"].items()) if hasattr(especificacion["key"], "items") else list(especificacion["key"])
+    # Los índices de texto se guardan en Mongo como _fts/_ftsx: se comparan por sus pesos
+    if any(valor == "text" or campo == "_fts" for campo, valor in claves):
+        claves = [("$text", "text")]
+    # Los diccionarios (weights, partialFilterExpression) se comparan sin importar el orden
+    opciones = tuple(
+        (opcion, repr(sorted(especificacion[opcion].items()) if isinstance(especificacion[opcion], dict) else especificacion[opcion]))
+        for opcion in OPCIONES_COMPARADAS if opcion in especificacion
+    )
+    return tuple(claves), opciones
+
+
+def _en_segundo_plano(indice: IndexModel) -> IndexModel:
+    """
+    Copia del índice con `background=True` (en Mongo < 4.2 evita bloquear la colección;
+    en versiones nuevas la construcción ya es no bloqueante y la opción se ignora).
+    """
+    opciones = {k: v for k, v in indice.document.items() if k != "key"}
+    opciones["background"] = True
+    return IndexModel(list(indice.document["key"].items()), **opciones)
+
+
+def indices_declarados(modelo) -> Dict[str, IndexModel]:
+    """
+    Índices de `modelo.Settings.indexes` indexados por nombre.
+    """
+    declarados = getattr(modelo.Settings, "indexes", None) or []
+    return {indice.document["name"]: indice for indice in declarados if isinstance(indice, IndexModel)}
+
+
+def firma_declarada() -> str:
+    """
+    Hash de todos los índices declarados en los modelos; cambia si se agrega,
+    quita o modifica alguno. No necesita que Beanie esté inicializado.
+    """
+    contenido = sorted(
+        (getattr(modelo.Settings, "name", None) or modelo.__name__, nombre, _firma(indice.document))
+        for modelo in document_models
+        for nombre, indice in indices_declarados(modelo).items()
+    )
+    return hashlib.sha256(repr(contenido).encode()).hexdigest()
+
+
+async def indices_verificados(database) -> bool:
+    """
+    True si la última sincronización exitosa corresponde a los índices declarados actuales.
+    """
+    control = await database[COLECCION_CONTROL].find_one({"_id": ID_FIRMA})
+    return control is not None and control.get("firma") == firma_declarada()
+
+
+async def guardar_firma(database) -> None:
+    await database[COLECCION_CONTROL].update_one(
+        {"_id": ID_FIRMA},
+        {"$set": {"firma": firma_declarada(), "verificado_en": datetime.utcnow()}},
+        upsert=True,
+    )
+
+
+async def diferencias(modelo) -> Tuple[List[IndexModel], List[str]]:
+    """
+    Retorna (índices a crear, nombres de índices a eliminar) para la colección de `modelo`.
+    Un índice con el mismo nombre pero distinta definición aparece en ambas listas.
+    """
+    coleccion = modelo.get_motor_collection()
+    existentes = await coleccion.index_information()
+    declarados = indices_declarados(modelo)
+
+    crear: List[IndexModel] = []
+    eliminar: List[str] = []
+
+    for nombre, indice in declarados.items():
+        actual = existentes.get(nombre)
+        if actual is None:
+            crear.append(indice)
+        elif _firma(actual) != _firma(indice.document):
+            eliminar.append(nombre)
+            crear.append(indice)
+
+    for nombre in existentes:
+        if nombre != "_id_" and nombre not in declarados:
+            eliminar.append(nombre)
+
+    return crear, eliminar
+
+
+async def sincronizar_indices(eliminar: bool = False, simular: bool = False) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Sincroniza los índices de todos los documentos registrados en Beanie.
+    Requiere que `init_beanie` ya se haya ejecutado (puede ser con skip_indexes=True).
+
+    - Los índices faltantes se crean con `background=True` para no bloquear la colección.
+    - Los índices no declarados solo se eliminan si `eliminar=True`; los que cambiaron
+      de definición siempre se recrean.
+    - Con `simular=True` no se modifica nada, solo se reportan las diferencias.
+    - Si no hubo errores se guarda la firma de los índices declarados (ver `indices_verificados`).
+    """
+    reporte: Dict[str, Dict[str, List[str]]] = {}
+
+    for modelo in document_models:
+        nombre_coleccion = modelo.get_collection_name()
+        crear, sobrantes = await diferencias(modelo)
+        nombres_crear = [indice.document["name"] for indice in crear]
+        # Los índices que se recrean siempre deben eliminarse antes
+        a_eliminar = [n for n in sobrantes if eliminar or n in nombres_crear]
+
+        reporte[nombre_coleccion] = {"crear": nombres_crear, "eliminar": a_eliminar, "errores": []}
+        if simular:
+            continue
+
+        coleccion = modelo.get_motor_collection()
+        for nombre in a_eliminar:
+            try:
+                await coleccion.drop_index(nombre)
+            except Exception as e:
+                reporte[nombre_coleccion]["errores"].append(f"{nombre}: {e}")
+
+        for indice in crear:
+            try:
+                await coleccion.create_indexes([_en_segundo_plano(indice)])
+            except Exception as e:
+                reporte[nombre_coleccion]["errores"].append(f"{indice.document['name']}: {e}")
+
+    if not simular and document_models and not any(cambios["errores"] for cambios in reporte.values()):
+        await guardar_firma(document_models[0].get_motor_collection().database)
+    return reporte
+
+
+def imprimir_reporte(reporte: Dict[str, Dict[str, List[str]]]) -> None:
+    for coleccion, cambios in reporte.items():
+        if not any(cambios.values()):
+            print(f"✅ {coleccion}: índices al día")
+            continue
+        for nombre in cambios["eliminar"]:
+            print(f"🗑️  {coleccion}: eliminar {nombre}")
+        for nombre in cambios["crear"]:
+            print(f"🧱 {coleccion}: crear {nombre}")
+        for error in cambios["errores"]:
+            print(f"❌ {coleccion}: {error}")
+
+
+async def _main(eliminar: bool, simular: bool) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from beanie import init_beanie
+    from app.core.config import settings
+
+    client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
+    try:
+        await init_beanie(
+            database=client[settings.MONGO_DB_NAME],
+            document_models=document_models,
+            skip_indexes=True,
+        )
+        imprimir_reporte(await sincronizar_indices(eliminar=eliminar, simular=simular))
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sincroniza los índices declarados en los modelos Beanie.")
+    parser.add_argument("--eliminar", action="store_true", help="Eliminar índices que no están declarados")
+    parser.add_argument("--simular", action="store_true", help="Solo mostrar las diferencias")
+    argumentos = parser.parse_args()
+    asyncio.run(_main(argumentos.eliminar, argumentos.simular))
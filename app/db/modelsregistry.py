@@ -1,4 +1,5 @@
 from app.models.evento import Evento
+from app.models.evento_historial import EventoHistorial
 from app.models.usuario import Usuario
 from app.models.organizacion_externa import OrganizacionExterna
 from app.models.instalacion import Instalacion
@@ -7,4 +8,4 @@ from app.models.unidad_academica import UnidadAcademica
 from app.models.programa import Programa
 # ...cualquier otro modelo con .get() o .save() Beanie
 
-document_models = [Evento, Usuario, OrganizacionExterna, Instalacion, Facultad, UnidadAcademica, Programa]
\ No newline at end of file
+document_models = [Evento, EventoHistorial, Usuario, OrganizacionExterna, Instalacion, Facultad, UnidadAcademica, Programa]
\ No newline at end of file
@@ -1,24 +1,103 @@
+import asyncio
+from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
+from app.core.arranque import cronometro
 from app.core.config import settings
 from app.db.modelsregistry import document_models
+from app.core.metricas import ListenerComandosMongo
+from app.db.pool import monitor_pool, opciones_cliente
+from app.db.indices import guardar_firma, imprimir_reporte, indices_verificados, sincronizar_indices
+from app.db.cache import vigilar_cambios
+from app.db.propagacion import propagar_pendientes
+from app.db.historial import escribir_historial, vaciar as vaciar_historial
+from app.db.cambios import difundir_cambios
+from app.service.estadisticas import refrescar_periodicamente
+from app.service.busqueda import rellenar_nombres_normalizados
 
 class DataBase:
     client: AsyncIOMotorClient = None
+    tarea_indices: Optional[asyncio.Task] = None
+    tarea_cache: Optional[asyncio.Task] = None
+    tarea_estadisticas: Optional[asyncio.Task] = None
+    tarea_propagacion: Optional[asyncio.Task] = None
+    tarea_nombres: Optional[asyncio.Task] = None
+    tarea_historial: Optional[asyncio.Task] = None
+    tarea_cambios: Optional[asyncio.Task] = None
 
 db = DataBase()
 
+async def _sincronizar_indices_en_segundo_plano():
+    try:
+        imprimir_reporte(await sincronizar_indices(eliminar=settings.MONGO_INDICES_ELIMINAR))
+    except Exception as e:
+        print(f"❌ Error sincronizando índices: {e}")
+
+async def _rellenar_nombres_en_segundo_plano():
+    try:
+        rellenados = await rellenar_nombres_normalizados()
+        if rellenados:
+            print(f"🔤 nombre_normalizado completado en {rellenados} eventos")
+    except Exception as e:
+        print(f"❌ Error completando nombre_normalizado: {e}")
+
 async def connect_to_mongo():
-    db.client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
-    await init_beanie(
-        database=db.client[settings.MONGO_DB_NAME],
-        document_models=document_models
-    )
-    print("📘 Modelos registrados en Beanie:", document_models)
+    # El listener de comandos mide latencia y documentos (ver /metrics);
+    # el del pool alimenta /health/ready con la saturación de conexiones
+    listeners = [monitor_pool]
+    if settings.METRICAS_HABILITADAS:
+        listeners.append(ListenerComandosMongo())
+    with cronometro.fase("cliente"):
+        db.client = AsyncIOMotorClient(
+            settings.MONGO_CONNECTION_STRING,
+            event_listeners=listeners,
+            **opciones_cliente(),
+        )
+    database = db.client[settings.MONGO_DB_NAME]
+
+    # Arranque rápido: si la firma guardada coincide con los índices declarados,
+    # ni Beanie ni la sincronización en segundo plano vuelven a revisarlos
+    indices_al_dia = False
+    if settings.ARRANQUE_RAPIDO and settings.MONGO_INDICES_MODO != "omitir":
+        with cronometro.fase("firma_indices"):
+            indices_al_dia = await indices_verificados(database)
+
+    with cronometro.fase("init_beanie"):
+        await init_beanie(
+            database=database,
+            document_models=document_models,
+            # Solo en modo 'beanie' el arranque espera a que se creen los índices
+            skip_indexes=indices_al_dia or settings.MONGO_INDICES_MODO != "beanie",
+        )
+
+    if not indices_al_dia:
+        if settings.MONGO_INDICES_MODO == "beanie":
+            await guardar_firma(database)
+        elif settings.MONGO_INDICES_MODO == "background":
+            db.tarea_indices = asyncio.create_task(_sincronizar_indices_en_segundo_plano())
+
+    caches_activos = settings.CACHE_REFERENCIAS_HABILITADO or settings.CACHE_EVENTOS_HABILITADO
+    if caches_activos and settings.CACHE_REFERENCIAS_CHANGE_STREAM:
+        db.tarea_cache = asyncio.create_task(vigilar_cambios(database))
+
+    db.tarea_propagacion = asyncio.create_task(propagar_pendientes(database))
+    db.tarea_nombres = asyncio.create_task(_rellenar_nombres_en_segundo_plano())
+    db.tarea_historial = asyncio.create_task(escribir_historial(database))
+    if settings.SSE_HABILITADO:
+        db.tarea_cambios = asyncio.create_task(difundir_cambios(database))
+
+    if settings.ESTADISTICAS_INTERVALO_SEGUNDOS > 0:
+        db.tarea_estadisticas = asyncio.create_task(
+            refrescar_periodicamente(settings.ESTADISTICAS_INTERVALO_SEGUNDOS)
+        )
 
-    # --- 🔍 Verificación temporal ---
-    print(f"✅ Conectado a MongoDB: {settings.MONGO_DB_NAME}")
-    print("📂 Colecciones disponibles:", await db.client[settings.MONGO_DB_NAME].list_collection_names())
+    print(f"✅ Conectado a MongoDB: {settings.MONGO_DB_NAME} (maxPoolSize={settings.mongo_max_pool_size})")
 
 async def close_mongo_connection():
+    for tarea in (db.tarea_indices, db.tarea_cache, db.tarea_estadisticas, db.tarea_propagacion, db.tarea_nombres,
+                  db.tarea_historial, db.tarea_cambios):
+        if tarea and not tarea.done():
+            tarea.cancel()
+    # Lo que el escritor del historial no alcanzó a enviar se escribe antes de cerrar
+    await vaciar_historial(db.client[settings.MONGO_DB_NAME])
     db.client.close()
@@ -0,0 +1,122 @@
+"""
+Monitoreo del pool de conexiones de Motor (eventos CMAP de pymongo) y chequeo de disponibilidad.
+"""
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Dict
+from pymongo import monitoring
+from app.core.config import settings
+from app.core.metricas import MONGO_POOL_EN_USO, MONGO_POOL_ESPERAS_AGOTADAS
+
+# Tiempo máximo del ping de /health/ready
+TIMEOUT_PING_SEGUNDOS = 2.0
+
+
+def _servidor(address) -> str:
+    host, puerto = address
+    return f"{host}:{puerto}"
+
+
+class MonitorPool(monitoring.ConnectionPoolListener):
+    """
+    Cuenta por servidor las conexiones abiertas, las prestadas y las esperas agotadas.
+    pymongo lo llama desde sus hilos; cada evento solo suma o resta un entero.
+    """
+
+    def __init__(self):
+        self.abiertas: Dict[str, int] = defaultdict(int)
+        self.en_uso: Dict[str, int] = defaultdict(int)
+        self.esperas_agotadas: Dict[str, int] = defaultdict(int)
+
+    def _en_uso(self, servidor: str, delta: int) -> None:
+        self.en_uso[servidor] = max(0, self.en_uso[servidor] + delta)
+        MONGO_POOL_EN_USO.labels(servidor).set(self.en_uso[servidor])
+
+    def connection_created(self, event) -> None:
+        self.abiertas[_servidor(event.address)] += 1
+
+    def connection_closed(self, event) -> None:
+        servidor = _servidor(event.address)
+        self.abiertas[servidor] = max(0, self.abiertas[servidor] - 1)
+
+    def connection_checked_out(self, event) -> None:
+        self._en_uso(_servidor(event.address), 1)
+
+    def connection_checked_in(self, event) -> None:
+        self._en_uso(_servidor(event.address), -1)
+
+    def connection_check_out_failed(self, event) -> None:
+        if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+            servidor = _servidor(event.address)
+            self.esperas_agotadas[servidor] += 1
+            MONGO_POOL_ESPERAS_AGOTADAS.labels(servidor).inc()
+
+    def pool_cleared(self, event) -> None:
+        # Tras un error de red pymongo descarta las conexiones del servidor
+        self.abiertas[_servidor(event.address)] = 0
+
+    def connection_ready(self, event) -> None: pass
+    def connection_check_out_started(self, event) -> None: pass
+    def pool_created(self, event) -> None: pass
+    def pool_ready(self, event) -> None: pass
+    def pool_closed(self, event) -> None: pass
+
+
+monitor_pool = MonitorPool()
+
+
+def opciones_cliente() -> Dict[str, Any]:
+    """
+    Opciones de AsyncIOMotorClient tomadas de la configuración.
+    """
+    opciones: Dict[str, Any] = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": min(settings.MONGO_MIN_POOL_SIZE, settings.mongo_max_pool_size),
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS,
+        "readPreference": settings.MONGO_READ_PREFERENCE,
+    }
+    compresores = [c.strip() for c in settings.MONGO_COMPRESORES.split(",") if c.strip()]
+    if compresores:
+        opciones["compressors"] = compresores
+    return opciones
+
+
+async def estado_disponibilidad(client) -> Dict[str, Any]:
+    """
+    Hace ping a MongoDB y calcula la saturación del pool (conexiones en uso / maxPoolSize).
+    `listo` es falso si el ping falla o si algún servidor supera el umbral de saturación.
+    """
+    maximo = settings.mongo_max_pool_size
+    estado: Dict[str, Any] = {"listo": False, "mongo": {}, "pool": {}}
+    if client is None:
+        estado["mongo"] = {"ok": False, "error": "Sin cliente de MongoDB"}
+        return estado
+
+    # 1. Ping con tiempo límite propio: un Mongo lento no debe colgar el probe
+    inicio = time.perf_counter()
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), TIMEOUT_PING_SEGUNDOS)
+        estado["mongo"] = {"ok": True, "latencia_ms": round((time.perf_counter() - inicio) * 1000, 2)}
+    except Exception as e:
+        estado["mongo"] = {"ok": False, "error": str(e) or type(e).__name__}
+
+    # 2. Saturación del pool por servidor
+    servidores = set(monitor_pool.abiertas) | set(monitor_pool.en_uso)
+    for servidor in sorted(servidores):
+        en_uso = monitor_pool.en_uso[servidor]
+        estado["pool"][servidor] = {
+            "en_uso": en_uso,
+            "abiertas": monitor_pool.abiertas[servidor],
+            "max_pool_size": maximo,
+            "saturacion": round(en_uso / maximo, 3),
+            "esperas_agotadas": monitor_pool.esperas_agotadas[servidor],
+        }
+    saturado = any(p["saturacion"] >= settings.MONGO_POOL_UMBRAL_SATURACION for p in estado["pool"].values())
+
+    estado["listo"] = estado["mongo"]["ok"] and not saturado
+    return estado
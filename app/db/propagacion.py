@@ -0,0 +1,190 @@
+"""
+Propagación de nombres desnormalizados hacia los eventos.
+
+Los eventos guardan copias de `usuarios.nombre` (responsables), `instalaciones.nombre/capacidad`
+y `organizaciones_externas.nombre`. Cuando una de esas referencias cambia, los eventos que la usan
+se corrigen con `bulk_write` de `UpdateMany` + `arrayFilters`, en lotes acotados, buscando los
+eventos afectados por los índices multikey de `responsables.id_responsable`,
+`instalaciones.id_instalacion` y `organizaciones_externas.id_organizacion`.
+
+- En escritura: los modelos llaman a `programar_propagacion` y la tarea `propagar_pendientes`
+  aplica los cambios en segundo plano.
+- Barrido completo (por ejemplo, tras escrituras hechas fuera de la API):
+
+    python -m app.db.propagacion                       # todas las colecciones
+    python -m app.db.propagacion --coleccion usuarios  # solo una
+    python -m app.db.propagacion --lote 1000           # tamaño de lote
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, List, NamedTuple, Optional, Set
+from pymongo import UpdateMany
+from app.core.config import settings
+from app.db.cache import invalidar
+
+COLECCION_EVENTOS = "eventos"
+
+
+class Propagacion(NamedTuple):
+    arreglo: str              # arreglo embebido en el evento
+    campo_id: str             # campo con el _id de la referencia dentro del arreglo
+    campos: Dict[str, str]    # campo en el evento -> campo en la colección de origen
+
+
+PROPAGACIONES: Dict[str, Propagacion] = {
+    "usuarios": Propagacion("responsables", "id_responsable", {"nombre": "nombre"}),
+    "instalaciones": Propagacion("instalaciones", "id_instalacion", {"nombre": "nombre", "capacidad": "capacidad"}),
+    "organizaciones_externas": Propagacion("organizaciones_externas", "id_organizacion", {"nombre": "nombre"}),
+}
+
+# IDs modificados en este proceso que aún no se propagan, por colección
+_pendientes: Dict[str, Set[Hashable]] = {nombre: set() for nombre in PROPAGACIONES}
+_hay_pendientes: Optional[asyncio.Event] = None
+
+
+def _evento_pendientes() -> asyncio.Event:
+    global _hay_pendientes
+    if _hay_pendientes is None:
+        _hay_pendientes = asyncio.Event()
+    return _hay_pendientes
+
+
+def programar_propagacion(nombre_coleccion: str, id_documento: Optional[Hashable]) -> None:
+    """
+    Hook de escritura local: los modelos lo llaman después de guardar.
+    Solo anota el ID; la tarea de fondo agrupa y aplica los cambios.
+    """
+    if id_documento is None or nombre_coleccion not in _pendientes:
+        return
+    _pendientes[nombre_coleccion].add(id_documento)
+    _evento_pendientes().set()
+
+
+def operaciones(nombre_coleccion: str, documentos: Iterable[Dict[str, Any]]) -> List[UpdateMany]:
+    """
+    Un UpdateMany por documento de origen. El filtro solo toma eventos con alguna copia
+    desactualizada, así que un documento sin cambios no reescribe ningún evento.
+    """
+    propagacion = PROPAGACIONES[nombre_coleccion]
+    ahora = datetime.utcnow()
+    ops: List[UpdateMany] = []
+    for doc in documentos:
+        valores = {destino: doc.get(origen) for destino, origen in propagacion.campos.items()}
+        desactualizado = [{campo: {"$ne": valor}} for campo, valor in valores.items()]
+        ops.append(UpdateMany(
+            {propagacion.arreglo: {"$elemMatch": {propagacion.campo_id: doc["_id"], "$or": desactualizado}}},
+            {"$set": {
+                **{f"{propagacion.arreglo}.$[ref].{campo}": valor for campo, valor in valores.items()},
+                # Las estadísticas precalculadas también muestran estos nombres
+                "actualizado_en": ahora,
+            }},
+            array_filters=[{f"ref.{propagacion.campo_id}": doc["_id"]}],
+        ))
+    return ops
+
+
+async def propagar(database, nombre_coleccion: str, documentos: List[Dict[str, Any]]) -> int:
+    """
+    Aplica la propagación de `documentos` en lotes de `PROPAGACION_TAMANO_LOTE` operaciones.
+    Retorna cuántos eventos se modificaron.
+    """
+    eventos = database[COLECCION_EVENTOS]
+    ops = operaciones(nombre_coleccion, documentos)
+    modificados = 0
+    for inicio in range(0, len(ops), settings.PROPAGACION_TAMANO_LOTE):
+        resultado = await eventos.bulk_write(ops[inicio:inicio + settings.PROPAGACION_TAMANO_LOTE], ordered=False)
+        modificados += resultado.modified_count
+    if modificados:
+        # No se sabe qué eventos cambiaron: se descartan todas las respuestas cacheadas
+        invalidar(COLECCION_EVENTOS)
+    return modificados
+
+
+def _proyeccion(nombre_coleccion: str) -> Dict[str, int]:
+    return {origen: 1 for origen in PROPAGACIONES[nombre_coleccion].campos.values()}
+
+
+async def propagar_pendientes(database) -> None:
+    """
+    Tarea de fondo: espera IDs programados, los agrupa por colección y los propaga
+    (un find $in por lote y un bulk_write).
+    """
+    hay_pendientes = _evento_pendientes()
+    while True:
+        await hay_pendientes.wait()
+        hay_pendientes.clear()
+        for nombre_coleccion, pendientes in _pendientes.items():
+            while pendientes:
+                lote = [pendientes.pop() for _ in range(min(len(pendientes), settings.PROPAGACION_TAMANO_LOTE))]
+                try:
+                    documentos = await database[nombre_coleccion].find(
+                        {"_id": {"$in": lote}}, projection=_proyeccion(nombre_coleccion)
+                    ).to_list(length=None)
+                    await propagar(database, nombre_coleccion, documentos)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # El barrido completo (`python -m app.db.propagacion`) corrige lo que quede pendiente
+                    print(f"⚠️  Error propagando {nombre_coleccion} a eventos: {e}")
+
+
+async def barrido(database, colecciones: Iterable[str], tamano_lote: int) -> Dict[str, Dict[str, float]]:
+    """
+    Recorre todas las referencias de `colecciones` por lotes (en orden de _id)
+    y propaga sus valores actuales. Retorna el rendimiento por colección.
+    """
+    reporte: Dict[str, Dict[str, float]] = {}
+    for nombre_coleccion in colecciones:
+        inicio = time.perf_counter()
+        revisados = modificados = 0
+        ultimo_id = None
+        while True:
+            filtro = {} if ultimo_id is None else {"_id": {"$gt": ultimo_id}}
+            documentos = await database[nombre_coleccion].find(
+                filtro, projection=_proyeccion(nombre_coleccion), sort=[("_id", 1)], limit=tamano_lote
+            ).to_list(length=None)
+            if not documentos:
+                break
+            modificados += await propagar(database, nombre_coleccion, documentos)
+            revisados += len(documentos)
+            ultimo_id = documentos[-1]["_id"]
+
+        segundos = time.perf_counter() - inicio
+        reporte[nombre_coleccion] = {
+            "revisados": revisados,
+            "eventos_modificados": modificados,
+            "segundos": round(segundos, 3),
+            "revisados_por_segundo": round(revisados / segundos, 1) if segundos else 0.0,
+        }
+    return reporte
+
+
+def imprimir_reporte(reporte: Dict[str, Dict[str, float]]) -> None:
+    for coleccion, datos in reporte.items():
+        print(
+            f"🔁 {coleccion}: {datos['revisados']} revisados, {datos['eventos_modificados']} eventos corregidos "
+            f"en {datos['segundos']} s ({datos['revisados_por_segundo']}/s)"
+        )
+
+
+async def _main(colecciones: List[str], tamano_lote: int) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
+    try:
+        imprimir_reporte(await barrido(client[settings.MONGO_DB_NAME], colecciones, tamano_lote))
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Propaga nombres de usuarios, instalaciones y organizaciones a los eventos.")
+    parser.add_argument("--coleccion", choices=list(PROPAGACIONES), action="append",
+                        help="Colección a propagar (se puede repetir; por defecto todas)")
+    parser.add_argument("--lote", type=int, default=settings.PROPAGACION_TAMANO_LOTE,
+                        help="Referencias por lote")
+    argumentos = parser.parse_args()
+    asyncio.run(_main(argumentos.coleccion or list(PROPAGACIONES), argumentos.lote))
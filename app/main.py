@@ -1,20 +1,26 @@
+# Debe importarse primero: marca el inicio de la carga de la aplicación
+from app.core.arranque import cronometro
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
+from starlette.responses import Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from contextlib import asynccontextmanager
-from app.db.mongodb import connect_to_mongo, close_mongo_connection
-from app.api.v1.routes import evento
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, db
+from app.db.pool import estado_disponibilidad
 # Importa el enrutador principal que agrupa todos los endpoints de la v1
 from app.api.v1.api import api_router_v1
 # Importa la configuración centralizada
 from app.core.config import settings
+from app.core.metricas import MiddlewareMetricas, registro
 
 #ciclo de vida de la aplicación
 @asynccontextmanager
 async def lifespan(app: FastAPI):
      # Conexión a MongoDB (Beanie + Motor)
     await connect_to_mongo()
+    cronometro.reportar(settings.ARRANQUE_PRESUPUESTO_MS)
     yield
      # Cierre limpio de la conexión al apagar el servidor
     await close_mongo_connection()
@@ -35,11 +41,33 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# --- Métricas Prometheus (latencia por ruta, estados, solicitudes en curso) ---
+if settings.METRICAS_HABILITADAS:
+    app.add_middleware(MiddlewareMetricas)
+
 # --- Inclusión de Enrutadores de la API ---
 
 # Incluye todas las rutas de la v1 bajo el prefijo global /api/v1
 # La URL final para crear un paciente será: http://.../api/v1/pacientes/
 app.include_router(api_router_v1, prefix="/api/v1")
+cronometro.marcar("importaciones")
+
 @app.get("/")
 async def root():
-    return RedirectResponse(url="/docs")
\ No newline at end of file
+    return RedirectResponse(url="/docs")
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Formato de texto de Prometheus, generado desde el registro en memoria
+    return Response(generate_latest(registro), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/health/live", include_in_schema=False)
+async def health_live():
+    # El proceso responde; no consulta MongoDB
+    return {"status": "ok"}
+
+@app.get("/health/ready", include_in_schema=False)
+async def health_ready():
+    # Ping a MongoDB + saturación del pool; 503 para que el balanceador deje de enviar tráfico
+    estado = await estado_disponibilidad(db.client)
+    return JSONResponse(estado, status_code=200 if estado["listo"] else 503)
@@ -1,6 +1,7 @@
 # Modelo Evento
 from enum import Enum
 from beanie import Document, PydanticObjectId
+from pymongo import ASCENDING, TEXT, IndexModel
 from typing import Optional, List
 from datetime import date, datetime
 from app.models.responsable import Responsable
@@ -33,7 +34,49 @@ class Evento(Document):
     instalaciones: List[Instalacion_evento] = []
     organizaciones_externas: List[OrganizacionParticipante] = []
     evaluaciones: List[Evaluacion] = []
+    # Nombre en minúsculas y sin tildes para el autocompletado por prefijo
+    nombre_normalizado: Optional[str] = None
+    # Última escritura: las estadísticas se refrescan a partir de los eventos modificados
+    actualizado_en: Optional[datetime] = None
+    # Cola de revisión: secretaria que tiene asignado el evento y hasta cuándo
+    revisor: Optional[str] = None
+    revision_vence: Optional[datetime] = None
 
 
     class Settings:
-        name = "eventos"
\ No newline at end of file
+        name = "eventos"
+        indexes = [
+            # Listado paginado por keyset (fecha_inicio, _id)
+            IndexModel([("fecha_inicio", ASCENDING), ("_id", ASCENDING)], name="fecha_inicio_id"),
+            # Filtros por estado / tipo con el mismo orden del keyset (cola de revisión, listados, exportación)
+            IndexModel([("estado", ASCENDING), ("fecha_inicio", ASCENDING), ("_id", ASCENDING)], name="estado_fecha_inicio"),
+            IndexModel([("tipo_evento", ASCENDING), ("fecha_inicio", ASCENDING), ("_id", ASCENDING)], name="tipo_evento_fecha_inicio"),
+            # Consultas por rango de fechas (calendario, solapamientos)
+            IndexModel([("fecha_inicio", ASCENDING), ("fecha_fin", ASCENDING)], name="fecha_inicio_fecha_fin"),
+            # Multikey: eventos de un responsable / de una instalación / de una organización.
+            # Con _id al final, "mis eventos" pagina por keyset sin ordenar en memoria
+            IndexModel(
+                [("responsables.id_responsable", ASCENDING), ("fecha_inicio", ASCENDING), ("_id", ASCENDING)],
+                name="responsables_fecha_inicio",
+            ),
+            # Solapamiento de reservas: igualdad por instalación y rango sobre fecha_fin
+            # primero (los eventos que aún no terminan son pocos), fecha_inicio en la clave
+            IndexModel(
+                [("instalaciones.id_instalacion", ASCENDING), ("fecha_fin", ASCENDING), ("fecha_inicio", ASCENDING)],
+                name="instalaciones_rango",
+            ),
+            IndexModel([("organizaciones_externas.id_organizacion", ASCENDING)], name="organizaciones_externas"),
+            # Refresco incremental de estadísticas (eventos modificados desde la última corrida)
+            IndexModel([("actualizado_en", ASCENDING)], name="actualizado_en"),
+            # Cola de revisión: la asignación vigente de una secretaria
+            IndexModel([("revisor", ASCENDING)], name="revisor"),
+            # Búsqueda de texto (el nombre pesa más que la descripción)
+            IndexModel(
+                [("nombre", TEXT), ("descripcion", TEXT)],
+                name="texto",
+                weights={"nombre": 10, "descripcion": 1},
+                default_language="spanish",
+            ),
+            # Autocompletado: prefijo anclado (^...) sobre el nombre normalizado
+            IndexModel([("nombre_normalizado", ASCENDING)], name="nombre_normalizado"),
+        ]
\ No newline at end of file
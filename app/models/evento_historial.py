@@ -0,0 +1,39 @@
+# Modelo EventoHistorial: una entrada por cada cambio de un evento (solo se agregan, nunca se editan)
+from enum import Enum
+from beanie import Document, PydanticObjectId
+from pymongo import ASCENDING, IndexModel
+from typing import Optional, List
+from datetime import datetime
+from app.core.config import settings
+
+class AccionHistorialEnum(str, Enum):
+    CREADO = "creado"
+    ACTUALIZADO = "actualizado"
+    EVALUADO = "evaluado"
+    ELIMINADO = "eliminado"
+
+class EventoHistorial(Document):
+    # El _id se genera al registrar el cambio: su orden es el orden en el tiempo
+    id_evento: PydanticObjectId
+    accion: AccionHistorialEnum
+    fecha: datetime
+    estado_anterior: Optional[str] = None
+    estado_nuevo: Optional[str] = None
+    # Secretaria que evaluó (solo en 'evaluado')
+    id_usuario: Optional[PydanticObjectId] = None
+    # Campos enviados en el PATCH (solo en 'actualizado')
+    campos: List[str] = []
+
+
+    class Settings:
+        name = "eventos_historial"
+        indexes = [
+            # TTL: Mongo borra solo las entradas más antiguas que la retención configurada
+            IndexModel(
+                [("fecha", ASCENDING)],
+                name="fecha_ttl",
+                expireAfterSeconds=int(settings.HISTORIAL_RETENCION_DIAS * 86400),
+            ),
+            # Historial de un evento en orden (el rango por tiempo de todos los eventos usa _id)
+            IndexModel([("id_evento", ASCENDING), ("_id", ASCENDING)], name="id_evento_id"),
+        ]
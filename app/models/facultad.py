@@ -1,5 +1,6 @@
 # Modelo de Facultad
 from beanie import Document, PydanticObjectId
+from pymongo import ASCENDING, IndexModel
 from typing import Optional, List
 from datetime import date
 
@@ -10,4 +11,7 @@ class Facultad(Document):
     descripcion: Optional[str] = None
 
     class Settings:
-        name = "facultades"
\ No newline at end of file
+        name = "facultades"
+        indexes = [
+            IndexModel([("nombre", ASCENDING)], name="nombre"),
+        ]
\ No newline at end of file
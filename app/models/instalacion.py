@@ -1,6 +1,9 @@
 # Modelo instalacion
 from enum import Enum
-from beanie import Document, PydanticObjectId
+from beanie import Delete, Document, PydanticObjectId, Replace, Save, SaveChanges, Update, after_event
+from pymongo import ASCENDING, IndexModel
+from app.db.cache import invalidar
+from app.db.propagacion import programar_propagacion
 from typing import Optional, List
 from datetime import date
 
@@ -18,5 +21,19 @@ class Instalacion(Document):
     capacidad: int
     tipo: Optional[tipoEnum] = None
 
+    # Invalida el cache de referencias después de cualquier escritura local
+    @after_event(Save, Replace, SaveChanges, Update, Delete)
+    def _invalidar_cache(self):
+        invalidar(self.get_collection_name(), self.id)
+
+    # Corrige en segundo plano las copias de sus datos guardadas en los eventos
+    @after_event(Save, Replace, SaveChanges, Update)
+    def _propagar_a_eventos(self):
+        programar_propagacion(self.get_collection_name(), self.id)
+
     class Settings:
-        name = "instalaciones"
\ No newline at end of file
+        name = "instalaciones"
+        indexes = [
+            IndexModel([("capacidad", ASCENDING)], name="capacidad"),
+            IndexModel([("tipo", ASCENDING), ("capacidad", ASCENDING)], name="tipo_capacidad"),
+        ]
\ No newline at end of file
@@ -1,5 +1,8 @@
 # Modelo OrganizacionExterna
-from beanie import Document, PydanticObjectId
+from beanie import Delete, Document, PydanticObjectId, Replace, Save, SaveChanges, Update, after_event
+from pymongo import ASCENDING, IndexModel
+from app.db.cache import invalidar
+from app.db.propagacion import programar_propagacion
 from pydantic import BaseModel, Field
 from typing import Optional, List
 
@@ -32,5 +35,18 @@ class OrganizacionExterna(Document):
     representante_legal: RepresentanteLegal
     contacto: Optional[Contacto]
 
+    # Invalida el cache de referencias después de cualquier escritura local
+    @after_event(Save, Replace, SaveChanges, Update, Delete)
+    def _invalidar_cache(self):
+        invalidar(self.get_collection_name(), self.id)
+
+    # Corrige en segundo plano las copias de sus datos guardadas en los eventos
+    @after_event(Save, Replace, SaveChanges, Update)
+    def _propagar_a_eventos(self):
+        programar_propagacion(self.get_collection_name(), self.id)
+
     class Settings:
         name = "organizaciones_externas"
+        indexes = [
+            IndexModel([("nombre", ASCENDING)], name="nombre"),
+        ]
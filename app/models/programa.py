@@ -1,5 +1,6 @@
 # Modelo programa
 from beanie import Document, PydanticObjectId
+from pymongo import ASCENDING, IndexModel
 from typing import Optional, List
 from datetime import date
 from pydantic import BaseModel
@@ -20,4 +21,8 @@ class Programa(Document):
     director: List[Director] = []
 
     class Settings:
-        name = "programas"
\ No newline at end of file
+        name = "programas"
+        indexes = [
+            IndexModel([("codigo", ASCENDING)], name="codigo"),
+            IndexModel([("facultad.id_facultad", ASCENDING)], name="facultad"),
+        ]
\ No newline at end of file
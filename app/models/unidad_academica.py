@@ -1,5 +1,6 @@
 # Modelo Unidad Academica
 from beanie import Document, PydanticObjectId
+from pymongo import ASCENDING, IndexModel
 from typing import Optional, List
 from datetime import date
 from pydantic import BaseModel
@@ -19,4 +20,7 @@ class UnidadAcademica(Document):
     director: List[Director] = []
 
     class Settings:
-        name = "unidades_academicas"
\ No newline at end of file
+        name = "unidades_academicas"
+        indexes = [
+            IndexModel([("codigo", ASCENDING)], name="codigo"),
+        ]
\ No newline at end of file
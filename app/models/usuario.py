@@ -1,6 +1,9 @@
 # Modelo Usuario
 from enum import Enum
-from beanie import Document, PydanticObjectId
+from beanie import Delete, Document, PydanticObjectId, Replace, Save, SaveChanges, Update, after_event
+from pymongo import ASCENDING, IndexModel
+from app.db.cache import invalidar
+from app.db.propagacion import programar_propagacion
 from typing import Optional, List
 from datetime import date
 from app.models.vinculacion import Vinculacion
@@ -22,5 +25,19 @@ class Usuario(Document):
     vinculacion: Optional[List[Vinculacion]] = []
     contrasena: Optional[List[Contrasena]] = []
    
+    # Invalida el cache de referencias después de cualquier escritura local
+    @after_event(Save, Replace, SaveChanges, Update, Delete)
+    def _invalidar_cache(self):
+        invalidar(self.get_collection_name(), self.id)
+
+    # Corrige en segundo plano las copias de sus datos guardadas en los eventos
+    @after_event(Save, Replace, SaveChanges, Update)
+    def _propagar_a_eventos(self):
+        programar_propagacion(self.get_collection_name(), self.id)
+
     class Settings:
-        name = "usuarios"
\ No newline at end of file
+        name = "usuarios"
+        indexes = [
+            IndexModel([("correo", ASCENDING)], name="correo"),
+            IndexModel([("rol", ASCENDING)], name="rol"),
+        ]
\ No newline at end of file
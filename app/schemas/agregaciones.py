@@ -1,8 +1,15 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import Dict, List
 
 
 class organizador(BaseModel):
     _id_org: str
     nombre: str
     rol: str
-    vinculacion: str
\ No newline at end of file
+    vinculacion: str
+
+
+# Responsables de varios eventos, por ID de evento
+class ResponsablesLote(BaseModel):
+    responsables: Dict[str, List[organizador]] = Field(default_factory=dict)
+    no_encontrados: List[str] = Field(default_factory=list)
\ No newline at end of file
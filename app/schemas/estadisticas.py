@@ -0,0 +1,43 @@
+from bson import ObjectId
+from datetime import datetime
+from pydantic import BaseModel, field_validator
+from typing import List, Optional
+
+
+# Conteo de eventos para un valor de una dimensión (estado, tipo, facultad o instalación)
+class ConteoEstadistica(BaseModel):
+    clave: Optional[str] = None
+    nombre: Optional[str] = None
+    eventos: int
+    asistentes: int
+
+    @field_validator('clave', mode='before')
+    def objectid_to_str(cls, v):
+        if isinstance(v, ObjectId):
+            return str(v)
+        return v
+
+
+class EstadisticaMes(BaseModel):
+    mes: str
+    eventos: int
+    asistentes: int
+
+
+# Schema de salida del dashboard
+class EstadisticasEventos(BaseModel):
+    desde: Optional[str] = None
+    hasta: Optional[str] = None
+    eventos: int
+    asistentes: int
+    por_estado: List[ConteoEstadistica]
+    por_tipo: List[ConteoEstadistica]
+    por_facultad: List[ConteoEstadistica]
+    por_instalacion: List[ConteoEstadistica]
+    por_mes: List[EstadisticaMes]
+    calculado_en: Optional[datetime] = None
+
+
+class ResultadoRefresco(BaseModel):
+    meses: List[str]
+    calculado_en: datetime
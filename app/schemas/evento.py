@@ -1,7 +1,7 @@
 from enum import Enum
 from beanie import PydanticObjectId
-from pydantic import BaseModel, ConfigDict, Field, field_validator
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, create_model, field_validator
+from typing import Any, Dict, Iterable, List, Optional
 from datetime import datetime
 from bson import ObjectId
 
@@ -183,7 +183,7 @@ class InstalacionRespuesta(BaseModel):
 
 # Schema de salida: Evento
 class EventoRespuesta(BaseModel):
-    _id: str    
+    id: str = Field(..., validation_alias="_id")
     nombre: str
     descripcion: Optional[str] = None
     fecha_inicio: Optional[datetime] = None
@@ -197,7 +197,7 @@ class EventoRespuesta(BaseModel):
 
     model_config = dict(arbitrary_types_allowed=True)
 
-    @field_validator('_id', mode='before', check_fields=False)
+    @field_validator('id', mode='before')
     def objectid_to_str(cls, v):
         if isinstance(v, ObjectId):
             return str(v)
@@ -208,6 +208,137 @@ class EventoRespuesta(BaseModel):
     }
 
 
+# Schema de salida: vista resumida de un evento (pantallas de listado)
+# `Settings.projection` hace que Beanie pida a Mongo solo estos campos con `.project()`.
+class EventoResumen(BaseModel):
+    id: str = Field(..., validation_alias="_id")
+    nombre: str
+    fecha_inicio: Optional[datetime] = None
+    fecha_fin: Optional[datetime] = None
+    estado: EstadoEventoEnum
+    tipo_evento: TipoEventoEnum
+
+    model_config = {
+        "populate_by_name": True
+    }
+
+    @field_validator('id', mode='before')
+    def objectid_to_str(cls, v):
+        if isinstance(v, ObjectId):
+            return str(v)
+        return v
+
+    class Settings:
+        projection = {"_id": 1, "nombre": 1, "fecha_inicio": 1, "fecha_fin": 1, "estado": 1, "tipo_evento": 1}
+
+
+# Schema de salida: resultado de búsqueda de texto (resumen + relevancia)
+class EventoBusqueda(EventoResumen):
+    score: float = Field(..., description="Relevancia según el índice de texto")
+
+    class Settings:
+        projection = {**EventoResumen.Settings.projection, "score": {"$meta": "textScore"}}
+
+
+# Schema de salida: evento de un usuario (resumen + su papel como responsable)
+class EventoDeUsuario(EventoResumen):
+    principal: bool = False
+    tipo_aval: Optional[TipoAvalEnum] = None
+
+
+class PaginaEventosUsuario(BaseModel):
+    items: List[EventoDeUsuario] = Field(default_factory=list)
+    siguiente: Optional[str] = Field(None, description="Cursor para pedir la siguiente página (parámetro `after`)")
+
+
+class PaginaBusqueda(BaseModel):
+    items: List[EventoBusqueda] = Field(default_factory=list)
+    siguiente: Optional[int] = Field(None, description="`offset` para pedir la siguiente página")
+
+
+# Schema de salida: un día o una semana del calendario, con sus eventos en orden de inicio
+class PeriodoCalendario(BaseModel):
+    inicio: datetime = Field(..., description="Inicio del día, o del lunes de la semana")
+    total: int
+    eventos: List[EventoResumen] = Field(default_factory=list)
+
+
+class CalendarioEventos(BaseModel):
+    desde: datetime
+    hasta: datetime
+    granularidad: str
+    periodos: List[PeriodoCalendario] = Field(default_factory=list)
+
+
+# Schema de salida: sugerencia de autocompletado
+class SugerenciaEvento(BaseModel):
+    id: str = Field(..., validation_alias="_id")
+    nombre: str
+
+    model_config = {
+        "populate_by_name": True
+    }
+
+    @field_validator('id', mode='before')
+    def objectid_to_str(cls, v):
+        if isinstance(v, ObjectId):
+            return str(v)
+        return v
+
+
+# Campos de EventoRespuesta que se pueden pedir con `fields=`
+CAMPOS_EVENTO = tuple(EventoRespuesta.model_fields)
+
+
+def proyeccion_campos(campos: Iterable[str]) -> Dict[str, int]:
+    """
+    Proyección Mongo con solo los `campos` pedidos.
+    `id` (_id) y `fecha_inicio` siempre se incluyen porque forman el cursor de paginación.
+    """
+    return {"_id": 1, "fecha_inicio": 1, **{campo: 1 for campo in campos if campo != "id"}}
+
+
+# Schema de salida: evento proyectado (`vista=resumen` o `fields=`). Los campos no pedidos no vienen.
+EventoParcial = create_model(
+    "EventoParcial",
+    __base__=EventoRespuesta,
+    **{
+        campo: (Optional[info.annotation], None)
+        for campo, info in EventoRespuesta.model_fields.items()
+        if campo != "id"
+    },
+)
+
+
+# Schema de salida: página de eventos (paginación por keyset)
+class EventoPagina(BaseModel):
+    items: List[EventoRespuesta] = Field(default_factory=list)
+    siguiente: Optional[str] = Field(None, description="Cursor para pedir la siguiente página (parámetro `after`)")
+
+
+# Schema de salida: página de eventos proyectados (`vista=resumen` o `fields=`)
+class EventoPaginaParcial(BaseModel):
+    items: List[EventoParcial] = Field(default_factory=list, description="`id`, `fecha_inicio` y los campos pedidos")
+    siguiente: Optional[str] = Field(None, description="Cursor para pedir la siguiente página (parámetro `after`)")
+
+
+# Schema de salida: resultado de un evento dentro de una carga masiva
+class ResultadoCargaItem(BaseModel):
+    indice: int = Field(..., description="Posición del evento en la lista enviada")
+    ok: bool
+    id_evento: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[Any] = None
+
+
+# Schema de salida: reporte de la carga masiva
+class ResultadoCarga(BaseModel):
+    total: int
+    creados: int
+    fallidos: int
+    resultados: List[ResultadoCargaItem] = Field(default_factory=list)
+
+
 # Schema de llegada desde BD
 
 # Schema de llegada: Responsable
@@ -0,0 +1,21 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.models.evento_historial import AccionHistorialEnum
+
+
+# Schema de salida: un cambio de un evento
+class EntradaHistorial(BaseModel):
+    id: str
+    id_evento: str
+    accion: AccionHistorialEnum
+    fecha: datetime
+    estado_anterior: Optional[str] = None
+    estado_nuevo: Optional[str] = None
+    id_usuario: Optional[str] = Field(None, description="Secretaria que evaluó (solo en `evaluado`)")
+    campos: List[str] = Field(default_factory=list, description="Campos enviados (solo en `actualizado`)")
+
+
+class PaginaHistorial(BaseModel):
+    items: List[EntradaHistorial] = Field(default_factory=list)
+    siguiente: Optional[str] = Field(None, description="Cursor para pedir la siguiente página (parámetro `after`)")
@@ -0,0 +1,22 @@
+from bson import ObjectId
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional
+
+
+# Schema de salida: instalación libre en un rango de fechas
+class InstalacionDisponible(BaseModel):
+    id_instalacion: str = Field(..., validation_alias="_id")
+    nombre: str
+    ubicacion: Optional[str] = None
+    capacidad: int
+    tipo: Optional[str] = None
+
+    model_config = {
+        "populate_by_name": True
+    }
+
+    @field_validator('id_instalacion', mode='before')
+    def objectid_to_str(cls, v):
+        if isinstance(v, ObjectId):
+            return str(v)
+        return v
@@ -0,0 +1,23 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.schemas.evento import EventoRespuesta, EventoResumen
+
+
+# Schema de salida: evento asignado a una secretaria para revisarlo
+class AsignacionRevision(BaseModel):
+    id_evento: str
+    evento: EventoRespuesta
+    revisor: str = Field(..., description="ID de la secretaria que tiene asignado el evento")
+    vence: datetime = Field(..., description="Fin de la asignación; después el evento vuelve a la cola")
+
+
+# Schema de salida: evento pendiente en la cola de revisión
+class EventoEnCola(EventoResumen):
+    revisor: Optional[str] = None
+    revision_vence: Optional[datetime] = None
+
+
+class PaginaColaRevision(BaseModel):
+    items: List[EventoEnCola] = Field(default_factory=list)
+    siguiente: Optional[str] = Field(None, description="Cursor para pedir la siguiente página (parámetro `after`)")
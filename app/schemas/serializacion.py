@@ -0,0 +1,215 @@
+import csv
+import io
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional
+import orjson
+from bson import ObjectId
+from starlette.responses import Response
+
+# Serialización directa documento BSON (dict de Motor) -> bytes JSON.
+# Produce la misma forma que EventoRespuesta pero sin construir modelos Pydantic
+# ni validar dos veces: los dicts se recortan a los campos de salida y orjson
+# convierte ObjectId -> str con `_por_defecto`.
+
+# Proyección Mongo con los campos que expone EventoRespuesta
+PROYECCION_RESPUESTA: Dict[str, int] = {
+    "nombre": 1,
+    "descripcion": 1,
+    "fecha_inicio": 1,
+    "fecha_fin": 1,
+    "estado": 1,
+    "tipo_evento": 1,
+    "responsables.id_responsable": 1,
+    "responsables.nombre": 1,
+    "responsables.tipo_aval": 1,
+    "responsables.principal": 1,
+    "evaluaciones.id_evaluacion": 1,
+    "evaluaciones.id_secretario": 1,
+    "evaluaciones.fecha_evaluacion": 1,
+    "evaluaciones.justificacion": 1,
+    "evaluaciones.acta_aprobacion": 1,
+    "evaluaciones.estado": 1,
+    "instalaciones.id_instalacion": 1,
+    "instalaciones.nombre": 1,
+    "instalaciones.capacidad": 1,
+    "organizaciones_externas.id_organizacion": 1,
+    "organizaciones_externas.nombre": 1,
+    "organizaciones_externas.representantes": 1,
+    "organizaciones_externas.certificado": 1,
+}
+
+
+def _por_defecto(valor: Any) -> Any:
+    if isinstance(valor, ObjectId):
+        return str(valor)
+    if isinstance(valor, Enum):
+        return valor.value
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+def a_json(contenido: Any) -> bytes:
+    """
+    Serializa a JSON con orjson; ObjectId se convierte a str.
+    """
+    return orjson.dumps(contenido, default=_por_defecto)
+
+
+def _id_str(valor: Any) -> Optional[str]:
+    return str(valor) if valor is not None else None
+
+
+def preparar_evento(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Recorta un documento de evento (crudo de Motor o `model_dump()` de Beanie)
+    a la forma de EventoRespuesta. `id` va primero, como en las respuestas parciales.
+    """
+    return {
+        # Motor entrega `_id`; el `model_dump()` de Beanie, `id`
+        "id": _id_str(doc.get("_id", doc.get("id"))),
+        "nombre": doc.get("nombre"),
+        "descripcion": doc.get("descripcion"),
+        "fecha_inicio": doc.get("fecha_inicio"),
+        "fecha_fin": doc.get("fecha_fin"),
+        "estado": doc.get("estado"),
+        "tipo_evento": doc.get("tipo_evento"),
+        "responsables": [
+            {
+                "id_responsable": _id_str(r.get("id_responsable")),
+                "nombre": r.get("nombre"),
+                "tipo_aval": r.get("tipo_aval"),
+                "principal": bool(r.get("principal")),
+            }
+            for r in doc.get("responsables") or []
+        ],
+        "evaluaciones": [
+            {
+                "id_evaluacion": _id_str(e.get("id_evaluacion")),
+                "id_secretario": _id_str(e.get("id_secretario")),
+                "fecha_evaluacion": e.get("fecha_evaluacion"),
+                "justificacion": e.get("justificacion"),
+                "acta_aprobacion": e.get("acta_aprobacion"),
+                "estado": e.get("estado"),
+            }
+            for e in doc.get("evaluaciones") or []
+        ],
+        "instalaciones": [
+            {
+                "id_instalacion": _id_str(i.get("id_instalacion")),
+                "nombre": i.get("nombre"),
+                "capacidad": i.get("capacidad"),
+            }
+            for i in doc.get("instalaciones") or []
+        ],
+        "organizaciones_externas": [
+            {
+                "id_organizacion": _id_str(o.get("id_organizacion")),
+                "nombre": o.get("nombre"),
+                "representantes": [
+                    {"nombre": r.get("nombre"), "cargo": r.get("cargo"), "legal": r.get("legal")}
+                    for r in o.get("representantes") or []
+                ],
+                "certificado": o.get("certificado"),
+            }
+            for o in doc.get("organizaciones_externas") or []
+        ],
+    }
+
+
+def preparar_parcial(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Documento proyectado (`vista=resumen` o `fields=`): solo renombra _id -> id.
+    """
+    parcial = {"id": _id_str(doc.pop("_id", None))}
+    parcial.update(doc)
+    return parcial
+
+
+def eventos_ndjson(docs: Iterable[Dict[str, Any]], parcial: bool = False) -> bytes:
+    """
+    Serializa un lote de eventos como JSON Lines (una línea por evento).
+    Con `parcial` los documentos vienen proyectados y solo se renombra _id -> id.
+    """
+    preparar = preparar_parcial if parcial else preparar_evento
+    return b"".join(a_json(preparar(doc)) + b"\n" for doc in docs)
+
+
+# Columnas de la exportación CSV: una fila por evento, listas embebidas unidas con "; "
+COLUMNAS_CSV = [
+    "id", "nombre", "descripcion", "fecha_inicio", "fecha_fin", "estado", "tipo_evento",
+    "responsable_principal", "responsables", "instalaciones", "capacidad_total",
+    "organizaciones_externas", "evaluaciones", "ultima_evaluacion_estado", "ultima_evaluacion_fecha",
+]
+SEPARADOR_LISTAS = "; "
+
+
+def _fecha(valor: Any) -> str:
+    return valor.isoformat() if valor is not None else ""
+
+
+def _texto(valor: Any) -> str:
+    if isinstance(valor, Enum):
+        return valor.value
+    return "" if valor is None else str(valor)
+
+
+def fila_csv(doc: Dict[str, Any]) -> List[Any]:
+    """
+    Aplana un evento (crudo de Motor, con PROYECCION_RESPUESTA) en una fila de COLUMNAS_CSV.
+    """
+    responsables = doc.get("responsables") or []
+    instalaciones = doc.get("instalaciones") or []
+    evaluaciones = doc.get("evaluaciones") or []
+    principal = next((r.get("nombre") for r in responsables if r.get("principal")), None)
+    ultima = evaluaciones[-1] if evaluaciones else {}
+    return [
+        _id_str(doc.get("_id")),
+        doc.get("nombre"),
+        doc.get("descripcion"),
+        _fecha(doc.get("fecha_inicio")),
+        _fecha(doc.get("fecha_fin")),
+        _texto(doc.get("estado")),
+        _texto(doc.get("tipo_evento")),
+        principal or "",
+        SEPARADOR_LISTAS.join(f"{_texto(r.get('nombre'))} ({_texto(r.get('tipo_aval'))})" for r in responsables),
+        SEPARADOR_LISTAS.join(i.get("nombre") or "" for i in instalaciones),
+        sum(i.get("capacidad") or 0 for i in instalaciones),
+        SEPARADOR_LISTAS.join(o.get("nombre") or "" for o in doc.get("organizaciones_externas") or []),
+        len(evaluaciones),
+        _texto(ultima.get("estado")),
+        _fecha(ultima.get("fecha_evaluacion")),
+    ]
+
+
+def eventos_csv(docs: Iterable[Dict[str, Any]], encabezado: bool = False) -> bytes:
+    """
+    Serializa un lote de eventos como filas CSV (UTF-8). Con `encabezado` el lote empieza
+    con el BOM (para que Excel detecte UTF-8) y la fila de nombres de columna.
+    """
+    salida = io.StringIO()
+    escritor = csv.writer(salida, lineterminator="\n")
+    if encabezado:
+        salida.write("\ufeff")
+        escritor.writerow(COLUMNAS_CSV)
+    escritor.writerows(fila_csv(doc) for doc in docs)
+    return salida.getvalue().encode()
+
+
+def eventos_jsonl(docs: Iterable[Dict[str, Any]], encabezado: bool = False) -> bytes:
+    """
+    Como `eventos_ndjson`, con la firma de `eventos_csv` (exportación).
+    JSON Lines no tiene encabezado; el parámetro existe para usarla igual que `eventos_csv`.
+    """
+    return eventos_ndjson(docs)
+
+
+class RespuestaJSON(Response):
+    """
+    Respuesta JSON serializada con orjson (ObjectId -> str).
+    Al devolverla desde una ruta, FastAPI no vuelve a validar contra `response_model`.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return a_json(content)
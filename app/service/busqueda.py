@@ -0,0 +1,91 @@
+import asyncio
+import re
+import unicodedata
+from typing import List, Optional
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from app.models.evento import Evento
+from app.schemas.evento import EventoBusqueda, PaginaBusqueda, SugerenciaEvento
+
+# Límite de `offset` en la búsqueda: más allá el skip deja de ser barato
+MAX_OFFSET_BUSQUEDA = 1000
+
+
+def normalizar_nombre(texto: Optional[str]) -> Optional[str]:
+    """
+    Minúsculas, sin tildes y con espacios simples: "  Feria de Innovación" -> "feria de innovacion".
+    """
+    if texto is None:
+        return None
+    sin_tildes = "".join(
+        c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c)
+    )
+    return " ".join(sin_tildes.lower().split())
+
+
+async def buscar_eventos(q: str, limit: int = 20, offset: int = 0) -> PaginaBusqueda:
+    """
+    Búsqueda de texto sobre nombre y descripción (índice `texto`), ordenada por relevancia.
+    """
+    # 1. Validar parámetros
+    if not q.strip():
+        raise HTTPException(400, "El parámetro `q` no puede estar vacío.")
+    if offset > MAX_OFFSET_BUSQUEDA:
+        raise HTTPException(400, f"`offset` no puede ser mayor que {MAX_OFFSET_BUSQUEDA}; refine la búsqueda.")
+
+    # 2. Consulta con $text; se pide un elemento extra para saber si hay otra página
+    docs = await Evento.get_motor_collection().find(
+        {"$text": {"$search": q}},
+        projection=EventoBusqueda.Settings.projection,
+        sort=[("score", {"$meta": "textScore"}), ("_id", 1)],
+        skip=offset,
+        limit=limit + 1,
+    ).to_list(length=None)
+
+    # 3. Armar la página
+    hay_mas = len(docs) > limit
+    return PaginaBusqueda(
+        items=[EventoBusqueda(**d) for d in docs[:limit]],
+        siguiente=offset + limit if hay_mas else None,
+    )
+
+
+async def autocompletar_eventos(prefijo: str, limit: int = 10) -> List[SugerenciaEvento]:
+    """
+    Eventos cuyo nombre empieza por `prefijo` (sin importar mayúsculas ni tildes).
+    El regex anclado sobre `nombre_normalizado` se resuelve como un rango del índice.
+    """
+    normalizado = normalizar_nombre(prefijo)
+    if not normalizado:
+        return []
+
+    docs = await Evento.get_motor_collection().find(
+        {"nombre_normalizado": {"$regex": "^" + re.escape(normalizado)}},
+        projection={"nombre": 1},
+        sort=[("nombre_normalizado", 1)],
+        limit=limit,
+    ).to_list(length=None)
+    return [SugerenciaEvento(**d) for d in docs]
+
+
+async def rellenar_nombres_normalizados(tamano_lote: int = 500) -> int:
+    """
+    Completa `nombre_normalizado` en los eventos creados antes de que existiera el campo.
+    Retorna cuántos eventos se actualizaron.
+    """
+    coleccion = Evento.get_motor_collection()
+    total = 0
+    while True:
+        docs = await coleccion.find(
+            {"nombre_normalizado": None}, projection={"nombre": 1}, limit=tamano_lote
+        ).to_list(length=None)
+        if not docs:
+            return total
+        await coleccion.bulk_write(
+            [UpdateOne({"_id": d["_id"]}, {"$set": {"nombre_normalizado": normalizar_nombre(d.get("nombre")) or ""}})
+             for d in docs],
+            ordered=False,
+        )
+        total += len(docs)
+        # Cede el event loop entre lotes para no frenar las peticiones
+        await asyncio.sleep(0)
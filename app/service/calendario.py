@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from app.models.evento import Evento
+from app.schemas.evento import EstadoEventoEnum, EventoResumen, TipoEventoEnum
+from app.schemas.serializacion import preparar_parcial
+from app.service.evento import MAX_DURACION_EVENTO, a_utc, filtro_eventos
+
+# Rango máximo por consulta según la granularidad (en días)
+MAX_DIAS_CALENDARIO = {"dia": 62, "semana": 371}
+# $dateTrunc: unidad de cada granularidad
+UNIDADES = {"dia": "day", "semana": "week"}
+
+
+def filtro_calendario(desde: datetime, hasta: datetime) -> Dict[str, Any]:
+    """
+    Eventos que se cruzan con [desde, hasta): empiezan antes de `hasta` y terminan en `desde`
+    o después. Así aparecen también los eventos de varios días que empezaron antes del rango.
+
+    Como ningún evento dura más de MAX_DURACION_EVENTO, los que se cruzan empiezan como muy pronto
+    `desde - MAX_DURACION_EVENTO`: esa cota acota el recorrido del índice `fecha_inicio_fecha_fin`
+    (sin ella se leerían las claves de todo el historial anterior a `hasta`). `fecha_fin` se
+    descarta sobre las mismas claves, sin leer documentos.
+    """
+    return {
+        "fecha_inicio": {"$gte": desde - MAX_DURACION_EVENTO, "$lt": hasta},
+        "fecha_fin": {"$gte": desde},
+    }
+
+
+def pipeline_calendario(filtro: Dict[str, Any], granularidad: str, desde: datetime) -> List[Dict[str, Any]]:
+    """
+    Agrupa por día o semana de `fecha_inicio` los eventos que cumplen `filtro`.
+    Un evento que empezó antes de `desde` se ubica en el primer periodo del rango.
+    El $sort conserva el orden de inicio dentro de cada periodo ($group respeta el orden).
+    """
+    inicio = {"$max": ["$fecha_inicio", desde]}
+    truncar: Dict[str, Any] = {"date": inicio, "unit": UNIDADES[granularidad]}
+    if granularidad == "semana":
+        truncar["startOfWeek"] = "monday"
+
+    return [
+        {"$match": filtro},
+        {"$sort": {"fecha_inicio": 1, "_id": 1}},
+        {"$project": EventoResumen.Settings.projection},
+        {"$group": {
+            "_id": {"$dateTrunc": truncar},
+            "total": {"$sum": 1},
+            "eventos": {"$push": "$$ROOT"},
+        }},
+        {"$sort": {"_id": 1}},
+    ]
+
+
+async def calendario_eventos(
+    desde: datetime,
+    hasta: datetime,
+    granularidad: str = "dia",
+    estado: Optional[EstadoEventoEnum] = None,
+    tipo_evento: Optional[TipoEventoEnum] = None,
+) -> Dict[str, Any]:
+    """
+    Eventos que se cruzan con [desde, hasta), agrupados por día o semana y con solo los
+    campos de EventoResumen. Retorna un dict con la forma de CalendarioEventos.
+    """
+
+    # 1. Validar el rango (en UTC sin zona, como las fechas guardadas)
+    desde, hasta = a_utc(desde), a_utc(hasta)
+    if desde >= hasta:
+        raise HTTPException(400, "`desde` debe ser anterior a `hasta`.")
+    if (hasta - desde).days > MAX_DIAS_CALENDARIO[granularidad]:
+        raise HTTPException(
+            400,
+            f"El rango no puede superar {MAX_DIAS_CALENDARIO[granularidad]} días con granularidad '{granularidad}'.",
+        )
+    filtro = {**filtro_eventos(estado, tipo_evento), **filtro_calendario(desde, hasta)}
+
+    # 2. Agrupar en Mongo
+    periodos = await Evento.get_motor_collection().aggregate(
+        pipeline_calendario(filtro, granularidad, desde)
+    ).to_list(length=None)
+
+    # 3. Forma de salida (ObjectId -> id)
+    return {
+        "desde": desde,
+        "hasta": hasta,
+        "granularidad": granularidad,
+        "periodos": [
+            {"inicio": p["_id"], "total": p["total"], "eventos": [preparar_parcial(e) for e in p["eventos"]]}
+            for p in periodos
+        ],
+    }
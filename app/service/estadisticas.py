@@ -0,0 +1,276 @@
+"""
+Estadísticas de eventos precalculadas por mes.
+
+Cada documento de `estadisticas_mensuales` (con _id "AAAA-MM") guarda, para los eventos
+que empiezan en ese mes, los conteos por estado, tipo, facultad e instalación y el total
+de asistentes. Los documentos se recalculan con una agregación $facet + $merge, solo para
+los meses que tienen eventos modificados (`actualizado_en`) desde la última corrida o que
+fueron marcados como "sucios" (eventos eliminados o movidos de mes).
+El dashboard lee esos documentos en vez de agregar toda la colección de eventos.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+from app.models.evento import Evento
+from app.schemas.estadisticas import ConteoEstadistica, EstadisticasEventos, EstadisticaMes, ResultadoRefresco
+
+COLECCION_ESTADISTICAS = "estadisticas_mensuales"
+COLECCION_CONTROL = "estadisticas_control"
+ID_CONTROL = "eventos"
+# Margen para escrituras de otros procesos con el reloj levemente atrasado
+MARGEN_RELOJ = timedelta(seconds=5)
+
+
+def _mes(fecha: datetime) -> str:
+    return f"{fecha.year:04d}-{fecha.month:02d}"
+
+
+def _rango_mes(mes: str):
+    anio, numero = (int(parte) for parte in mes.split("-"))
+    inicio = datetime(anio, numero, 1)
+    fin = datetime(anio + 1, 1, 1) if numero == 12 else datetime(anio, numero + 1, 1)
+    return inicio, fin
+
+
+def _coleccion(nombre: str):
+    return Evento.get_motor_collection().database[nombre]
+
+
+async def marcar_meses_sucios(*fechas: Optional[datetime]) -> None:
+    """
+    Marca para recálculo los meses de `fechas`. La usan las escrituras que un
+    filtro por `actualizado_en` no puede detectar: eliminar un evento o moverlo de mes.
+    """
+    meses = sorted({_mes(f) for f in fechas if f is not None})
+    if meses:
+        await _coleccion(COLECCION_CONTROL).update_one(
+            {"_id": ID_CONTROL},
+            {"$addToSet": {"meses_sucios": {"$each": meses}}},
+            upsert=True,
+        )
+
+
+# Facultad del responsable principal: directa (secretaria), por programa (estudiante)
+# o por unidad académica (docente)
+_ETAPAS_FACULTAD: List[Dict[str, Any]] = [
+    {"$set": {"_principal": {"$arrayElemAt": [
+        {"$filter": {"input": "$responsables", "cond": {"$eq": ["$$this.principal", True]}}}, 0
+    ]}}},
+    {"$lookup": {
+        "from": "usuarios",
+        "localField": "_principal.id_responsable",
+        "foreignField": "_id",
+        "pipeline": [{"$project": {"vinculacion": 1}}],
+        "as": "_usuario",
+    }},
+    {"$set": {"_vinculacion": {"$arrayElemAt": [{"$arrayElemAt": ["$_usuario.vinculacion", 0]}, 0]}}},
+    {"$lookup": {
+        "from": "programas",
+        "localField": "_vinculacion.programaId",
+        "foreignField": "_id",
+        "pipeline": [{"$project": {"facultad.id_facultad": 1}}],
+        "as": "_programa",
+    }},
+    {"$lookup": {
+        "from": "unidades_academicas",
+        "localField": "_vinculacion.unidadAcademicaId",
+        "foreignField": "_id",
+        "pipeline": [{"$project": {"facultad._id": 1}}],
+        "as": "_unidad",
+    }},
+    {"$set": {"_facultad": {"$ifNull": [
+        "$_vinculacion.facultadId",
+        {"$arrayElemAt": ["$_programa.facultad.id_facultad", 0]},
+        {"$arrayElemAt": [{"$arrayElemAt": ["$_unidad.facultad._id", 0]}, 0]},
+        None,
+    ]}}},
+]
+
+
+def _conteo(campo: str) -> List[Dict[str, Any]]:
+    return [
+        {"$group": {"_id": campo, "eventos": {"$sum": 1}, "asistentes": {"$sum": {"$ifNull": ["$asistentes", 0]}}}},
+        {"$sort": {"eventos": -1, "_id": 1}},
+        {"$project": {"_id": 0, "clave": "$_id", "eventos": 1, "asistentes": 1}},
+    ]
+
+
+def pipeline_mes(mes: str, corrida: datetime) -> List[Dict[str, Any]]:
+    """
+    Agregación que recalcula el documento de un mes y lo guarda con $merge.
+    Usa el índice `fecha_inicio_id` para leer solo los eventos de ese mes.
+    """
+    inicio, fin = _rango_mes(mes)
+    return [
+        {"$match": {"fecha_inicio": {"$gte": inicio, "$lt": fin}}},
+        {"$facet": {
+            "totales": [
+                {"$group": {"_id": None, "eventos": {"$sum": 1}, "asistentes": {"$sum": {"$ifNull": ["$asistentes", 0]}}}},
+            ],
+            "por_estado": _conteo("$estado"),
+            "por_tipo": _conteo("$tipo_evento"),
+            "por_facultad": _ETAPAS_FACULTAD + _conteo("$_facultad") + [
+                {"$lookup": {"from": "facultades", "localField": "clave", "foreignField": "_id",
+                             "pipeline": [{"$project": {"nombre": 1}}], "as": "_nombre"}},
+                {"$set": {"nombre": {"$arrayElemAt": ["$_nombre.nombre", 0]}}},
+                {"$project": {"_nombre": 0}},
+            ],
+            "por_instalacion": [
+                {"$unwind": "$instalaciones"},
+                {"$group": {
+                    "_id": "$instalaciones.id_instalacion",
+                    "nombre": {"$first": "$instalaciones.nombre"},
+                    "eventos": {"$sum": 1},
+                    "asistentes": {"$sum": {"$ifNull": ["$asistentes", 0]}},
+                }},
+                {"$sort": {"eventos": -1, "_id": 1}},
+                {"$project": {"_id": 0, "clave": "$_id", "nombre": 1, "eventos": 1, "asistentes": 1}},
+            ],
+        }},
+        {"$project": {
+            "_id": {"$literal": mes},
+            "eventos": {"$ifNull": [{"$arrayElemAt": ["$totales.eventos", 0]}, 0]},
+            "asistentes": {"$ifNull": [{"$arrayElemAt": ["$totales.asistentes", 0]}, 0]},
+            "por_estado": 1,
+            "por_tipo": 1,
+            "por_facultad": 1,
+            "por_instalacion": 1,
+            "calculado_en": {"$literal": corrida},
+        }},
+        {"$merge": {"into": COLECCION_ESTADISTICAS, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+async def _meses_modificados(desde: Optional[datetime]) -> List[str]:
+    """
+    Meses (AAAA-MM) con eventos escritos desde `desde`; todos si `desde` es None.
+    """
+    filtro = {} if desde is None else {"actualizado_en": {"$gte": desde - MARGEN_RELOJ}}
+    cursor = Evento.get_motor_collection().aggregate([
+        {"$match": filtro},
+        {"$group": {"_id": {"$dateToString": {"format": "%Y-%m", "date": "$fecha_inicio"}}}},
+    ])
+    return [doc["_id"] async for doc in cursor if doc["_id"]]
+
+
+async def refrescar_estadisticas(completo: bool = False) -> ResultadoRefresco:
+    """
+    Recalcula los meses con cambios desde la última corrida (o todos con `completo=True`).
+    Recalcular un mes es idempotente, así que dos corridas simultáneas no dañan los datos.
+    """
+    corrida = datetime.utcnow()
+    control_col = _coleccion(COLECCION_CONTROL)
+
+    # 1. Tomar (y vaciar) atómicamente la lista de meses sucios
+    control = await control_col.find_one_and_update(
+        {"_id": ID_CONTROL},
+        {"$set": {"meses_sucios": []}},
+        upsert=True,
+        return_document=ReturnDocument.BEFORE,
+    ) or {}
+    sucios = control.get("meses_sucios", [])
+    desde = None if completo else control.get("ultima_ejecucion")
+
+    try:
+        # 2. Meses a recalcular: los modificados más los marcados
+        meses = sorted(set(await _meses_modificados(desde)) | set(sucios))
+
+        # 3. Un $facet + $merge por mes
+        coleccion = Evento.get_motor_collection()
+        for mes in meses:
+            await coleccion.aggregate(pipeline_mes(mes, corrida)).to_list(length=None)
+
+        # 4. Meses que quedaron sin eventos (en un recálculo completo, todos los que no aparecieron)
+        estadisticas_col = _coleccion(COLECCION_ESTADISTICAS)
+        if meses:
+            await estadisticas_col.delete_many({"_id": {"$in": meses}, "eventos": 0})
+        if desde is None:
+            await estadisticas_col.delete_many({"_id": {"$nin": meses}})
+    except BaseException:
+        # Los meses sucios no se pierden si la corrida falla
+        if sucios:
+            await control_col.update_one({"_id": ID_CONTROL}, {"$addToSet": {"meses_sucios": {"$each": sucios}}})
+        raise
+
+    await control_col.update_one({"_id": ID_CONTROL}, {"$max": {"ultima_ejecucion": corrida}})
+    return ResultadoRefresco(meses=meses, calculado_en=corrida)
+
+
+async def refrescar_periodicamente(intervalo_segundos: float) -> None:
+    """
+    Tarea de fondo que mantiene al día las estadísticas.
+    """
+    while True:
+        try:
+            await refrescar_estadisticas()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️  Error refrescando estadísticas: {e}")
+        await asyncio.sleep(intervalo_segundos)
+
+
+def _acumular(destino: Dict[Any, Dict[str, Any]], filas: Iterable[Dict[str, Any]]) -> None:
+    for fila in filas:
+        clave = fila.get("clave")
+        actual = destino.setdefault(clave, {"clave": clave, "nombre": fila.get("nombre"), "eventos": 0, "asistentes": 0})
+        actual["eventos"] += fila.get("eventos", 0)
+        actual["asistentes"] += fila.get("asistentes", 0)
+        actual["nombre"] = actual["nombre"] or fila.get("nombre")
+
+
+def _ordenados(conteos: Dict[Any, Dict[str, Any]]) -> List[ConteoEstadistica]:
+    filas = sorted(conteos.values(), key=lambda f: (-f["eventos"], str(f["clave"])))
+    return [ConteoEstadistica(**f) for f in filas]
+
+
+async def obtener_estadisticas(desde: Optional[str] = None, hasta: Optional[str] = None) -> EstadisticasEventos:
+    """
+    Suma los documentos mensuales precalculados entre `desde` y `hasta` (AAAA-MM, inclusivos).
+    """
+    # 1. Validar el rango de meses
+    for valor in (desde, hasta):
+        if valor is not None:
+            try:
+                _rango_mes(valor)
+            except ValueError:
+                raise HTTPException(400, f"Mes inválido: '{valor}' (formato AAAA-MM).")
+    if desde and hasta and desde > hasta:
+        raise HTTPException(400, "`desde` debe ser anterior o igual a `hasta`.")
+
+    filtro: Dict[str, Any] = {}
+    if desde or hasta:
+        filtro["_id"] = {}
+        if desde:
+            filtro["_id"]["$gte"] = desde
+        if hasta:
+            filtro["_id"]["$lte"] = hasta
+
+    # 2. Leer los meses precalculados (un documento por mes) y la fecha de la última corrida
+    documentos, control = await asyncio.gather(
+        _coleccion(COLECCION_ESTADISTICAS).find(filtro, sort=[("_id", 1)]).to_list(length=None),
+        _coleccion(COLECCION_CONTROL).find_one({"_id": ID_CONTROL}, projection={"ultima_ejecucion": 1}),
+    )
+
+    # 3. Combinar los conteos de todos los meses
+    por_dimension: Dict[str, Dict[Any, Dict[str, Any]]] = {
+        "por_estado": {}, "por_tipo": {}, "por_facultad": {}, "por_instalacion": {},
+    }
+    for doc in documentos:
+        for dimension, conteos in por_dimension.items():
+            _acumular(conteos, doc.get(dimension, []))
+
+    return EstadisticasEventos(
+        desde=desde,
+        hasta=hasta,
+        eventos=sum(d.get("eventos", 0) for d in documentos),
+        asistentes=sum(d.get("asistentes", 0) for d in documentos),
+        por_mes=[
+            EstadisticaMes(mes=d["_id"], eventos=d.get("eventos", 0), asistentes=d.get("asistentes", 0))
+            for d in documentos
+        ],
+        calculado_en=(control or {}).get("ultima_ejecucion"),
+        **{dimension: _ordenados(conteos) for dimension, conteos in por_dimension.items()},
+    )
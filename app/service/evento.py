@@ -1,22 +1,44 @@
-from fastapi import HTTPException, status
+import asyncio
+import hashlib
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+from beanie import PydanticObjectId
+from beanie.odm.utils.encoder import Encoder
 from app.models.evaluacion import Evaluacion
 from app.models.evento import Evento
+from app.models.evento_historial import AccionHistorialEnum
 from app.models.usuario import Usuario
-from app.models.instalacion import Instalacion
-from app.models.organizacion_externa import OrganizacionExterna
-from app.schemas import evento
-from app.schemas.evento import EstadoEventoEnum, EventoCrear, EventoRespuesta, EventoBD, EventoBD, EventoRespuesta, OrganizacionParticipante, ResponsableRespuesta, EvaluacionRespuesta, InstalacionRespuesta, OrganizacionExternaRespuesta
-from beanie import PydanticObjectId
-from typing import List, Optional
-from app.schemas.evento import EventoRespuesta, ResponsableRespuesta, EvaluacionRespuesta, InstalacionRespuesta, OrganizacionExternaRespuesta, EventoActualizar, EvaluacionCrear
-from bson import ObjectId
-from datetime import datetime
-from typing import Any, Dict, List
+from app.core.config import settings
+from app.db.cache import cache_respuestas_eventos, invalidar
+from app.db.historial import registrar
+from app.db.cambios import difusor, mensajes
+from app.schemas.evento import EstadoEventoEnum, EventoActualizar, EventoCrear, EvaluacionCrear, TipoEventoEnum
+from app.schemas.evento import CAMPOS_EVENTO, EventoResumen, ResultadoCarga, ResultadoCargaItem, proyeccion_campos
+from app.schemas.serializacion import PROYECCION_RESPUESTA, a_json, eventos_csv, eventos_jsonl, eventos_ndjson, preparar_evento, preparar_parcial
+from app.service.referencias import buscar_por_ids, buscar_referencias, cargar_referencias, referencias_faltantes
+from app.service.paginacion import ORDEN_KEYSET, codificar_cursor, filtro_keyset
+from app.service.reservas import bloquear_instalaciones, filtro_solapamiento, verificar_disponibilidad
+from app.service.estadisticas import marcar_meses_sucios
+from app.service.busqueda import normalizar_nombre
 
-# Crear un evento
-async def crear_evento(payload: EventoCrear) -> Evento:
+# Duración máxima de un evento: acota por abajo las consultas por rango de fechas (calendario)
+MAX_DURACION_EVENTO = timedelta(days=31)
+
+
+def _validar_duracion(fecha_inicio: datetime, fecha_fin: Optional[datetime]) -> None:
+    if fecha_fin and fecha_fin - fecha_inicio > MAX_DURACION_EVENTO:
+        raise HTTPException(400, f"Un evento no puede durar más de {MAX_DURACION_EVENTO.days} días.")
+
+
+def _validar_evento_nuevo(payload: EventoCrear) -> None:
     """
-    Crea un evento usando Beanie, con las reglas de negocio acordadas.
+    Reglas de creación que no dependen de la base de datos.
     """
 
     # -------------------------------------------------------------
@@ -24,6 +46,7 @@ async def crear_evento(payload: EventoCrear) -> Evento:
     # -------------------------------------------------------------
     if payload.fecha_fin and payload.fecha_inicio >= payload.fecha_fin:
         raise HTTPException(400, "La fecha de inicio debe ser anterior a la fecha de fin")
+    _validar_duracion(payload.fecha_inicio, payload.fecha_fin)
 
     # -------------------------------------------------------------
     # 2. Estado inicial SOLO 'pendiente'
@@ -42,14 +65,18 @@ async def crear_evento(payload: EventoCrear) -> Evento:
     if n_principales != 1:
         raise HTTPException(400, "Debe haber exactamente un responsable principal.")
 
-    # Un evento puede tener responsables de docentes o de estudiantes, pero no ambos
-    tipos = set()
-    for r in payload.responsables:
-        usuario = await Usuario.get(PydanticObjectId(r.id_responsable))
-        if not usuario:
-            raise HTTPException(404, f"Usuario responsable no encontrado: {r.id_responsable}")
+    # Debe asignarse al menos una instalación
+    if not payload.instalaciones:
+        raise HTTPException(400, "Debe asignarse mínimo una instalación.")
+
 
-        tipos.add(usuario.rol)
+def _validar_reglas_referencias(payload: EventoCrear, usuarios: Dict, instalaciones: Dict) -> None:
+    """
+    Reglas de creación que dependen de los usuarios e instalaciones ya resueltos.
+    """
+
+    # Un evento puede tener responsables de docentes o de estudiantes, pero no ambos
+    tipos = {usuarios[r.id_responsable].rol for r in payload.responsables}
 
     if "docente" in tipos and "estudiante" in tipos:
         raise HTTPException(
@@ -58,198 +85,603 @@ async def crear_evento(payload: EventoCrear) -> Evento:
         )
 
     # -------------------------------------------------------------
-    # 4. Validar instalaciones
+    # 5. Validar capacidad de las instalaciones
     # -------------------------------------------------------------
-    if not payload.instalaciones:
-        raise HTTPException(400, "Debe asignarse mínimo una instalación.")
-
     for inst in payload.instalaciones:
-        instal = await Instalacion.get(PydanticObjectId(inst.id_instalacion))
-        if not instal:
-            raise HTTPException(404, f"Instalación no encontrada: {inst.id_instalacion}")
-
+        instal = instalaciones[inst.id_instalacion]
         if payload.asistentes and instal.capacidad < payload.asistentes:
             raise HTTPException(
                 400,
                 f"La instalación {inst.nombre} no tiene capacidad suficiente."
             )
 
+
+def _ids_referencias(payload: EventoCrear):
+    return (
+        [r.id_responsable for r in payload.responsables],
+        [i.id_instalacion for i in payload.instalaciones],
+        [o.id_organizacion for o in payload.organizaciones_externas or []],
+    )
+
+
+# Crear un evento
+async def crear_evento(payload: EventoCrear) -> Dict[str, Any]:
+    """
+    Crea un evento usando Beanie, con las reglas de negocio acordadas.
+    """
+
+    # 1-3. Fechas, estado inicial, responsables e instalaciones
+    _validar_evento_nuevo(payload)
+
     # -------------------------------------------------------------
-    # 5. Validar organizaciones participantes
+    # 4. Resolver responsables, instalaciones y organizaciones
+    #    (una consulta $in por colección, las tres en paralelo)
     # -------------------------------------------------------------
-    if payload.organizaciones_externas:
-        for org in payload.organizaciones_externas:
-            organizacion = await OrganizacionExterna.get(PydanticObjectId(org.id_organizacion))
-            if not organizacion:
-                raise HTTPException(404, f"Organización no encontrada: {org.id_organizacion}")
+    usuarios, instalaciones, _ = await cargar_referencias(*_ids_referencias(payload))
+
+    # 4-5. Mezcla docentes/estudiantes y capacidad
+    _validar_reglas_referencias(payload, usuarios, instalaciones)
 
     # -------------------------------------------------------------
-    # 6. Crear el documento Beanie y guardarlo
+    # 6. Verificar que las instalaciones estén libres y guardar el documento.
+    #    El bloqueo evita que otra solicitud reserve el mismo salón entre
+    #    la verificación y la inserción.
     # -------------------------------------------------------------
-    evento_doc = Evento(**payload.model_dump())
-    await evento_doc.insert()
+    ids_instalaciones = [i.id_instalacion for i in payload.instalaciones]
+    async with bloquear_instalaciones(ids_instalaciones):
+        await verificar_disponibilidad(ids_instalaciones, payload.fecha_inicio, payload.fecha_fin)
+
+        evento_doc = Evento(
+            **payload.model_dump(),
+            nombre_normalizado=normalizar_nombre(payload.nombre),
+            actualizado_en=datetime.utcnow(),
+        )
+        await evento_doc.insert()
+
+    registrar(evento_doc.id, AccionHistorialEnum.CREADO, estado_nuevo=evento_doc.estado)
+    return preparar_evento(evento_doc.model_dump())
 
-    return evento_doc
 
+def _error_item(indice: int, status_code: int, detalle: Any) -> ResultadoCargaItem:
+    return ResultadoCargaItem(indice=indice, ok=False, status_code=status_code, error=detalle)
 
-# Service para listar eventos
 
-async def listar_eventos() -> List[EventoRespuesta]:
+# Crear muchos eventos en una sola solicitud
+async def crear_eventos_bulk(items: List[Dict[str, Any]]) -> ResultadoCarga:
     """
-    Obtiene todos los eventos desde la BD (Evento) y los convierte
-    a EventoRespuesta para devolverlos por la API.
+    Aplica a cada elemento las mismas reglas que `crear_evento`, pero resolviendo
+    las referencias de toda la carga con pocas consultas y guardando los válidos
+    con un solo insert_many(ordered=False). Un elemento inválido no detiene al resto.
     """
-    # 1. Traer todos los eventos desde la base de datos
-    eventos_bd: List[Evento] = await Evento.find_all().to_list()
-
-    eventos_respuesta: List[EventoRespuesta] = []
-
-    for evento in eventos_bd:
-        # Convertir responsables
-        responsables_resp = [
-            ResponsableRespuesta(
-                id_responsable=r.id_responsable,
-                nombre=r.nombre,
-                tipo_aval=r.tipo_aval,
-                principal=r.principal
+    resultados: Dict[int, ResultadoCargaItem] = {}
+    candidatos: Dict[int, EventoCrear] = {}
+    documentos_nuevos: Dict[int, Evento] = {}
+
+    # 1. Validar forma y reglas que no dependen de la base de datos.
+    #    El documento se construye aquí: Evento exige campos que EventoCrear permite omitir
+    #    (descripcion, fecha_fin) y ese error debe quedar en el elemento, no en toda la carga
+    for indice, item in enumerate(items):
+        try:
+            payload = EventoCrear.model_validate(item)
+            _validar_evento_nuevo(payload)
+            documentos_nuevos[indice] = Evento(
+                **payload.model_dump(),
+                nombre_normalizado=normalizar_nombre(payload.nombre),
             )
-            for r in getattr(evento, "responsables", [])
-        ]
-
-        # Convertir evaluaciones
-        evaluaciones_resp = [
-            EvaluacionRespuesta(
-                id_evaluacion=e.id_evaluacion,
-                id_secretario=e.id_secretario,
-                fecha_evaluacion=e.fecha_evaluacion,
-                justificacion=e.justificacion,
-                acta_aprobacion=e.acta_aprobacion,
-                estado=e.estado
-            )
-            for e in getattr(evento, "evaluaciones", [])
-        ]
-
-        # Convertir instalaciones
-        instalaciones_resp = [
-            InstalacionRespuesta(
-                id_instalacion=i.id_instalacion,
-                nombre=i.nombre,
-                capacidad=i.capacidad
-            )
-            for i in getattr(evento, "instalaciones", [])
-        ]
-
-        # Convertir organizaciones externas
-        organizaciones_resp = [
-            OrganizacionExternaRespuesta(
-                id_organizacion=o.id_organizacion,
-                nombre=o.nombre,
-                representantes=getattr(o, "representantes", []),
-                certificado=getattr(o, "certificado", None)
+            candidatos[indice] = payload
+        except ValidationError as e:
+            resultados[indice] = _error_item(indice, 422, jsonable_encoder(e.errors(include_url=False)))
+        except HTTPException as e:
+            resultados[indice] = _error_item(indice, e.status_code, e.detail)
+
+    # 2. Resolver las referencias de toda la carga (una consulta $in por colección, en paralelo)
+    ids_usuarios, ids_instalaciones, ids_organizaciones = [], [], []
+    for payload in candidatos.values():
+        u, i, o = _ids_referencias(payload)
+        ids_usuarios += u
+        ids_instalaciones += i
+        ids_organizaciones += o
+    usuarios, instalaciones, organizaciones = await buscar_referencias(
+        ids_usuarios, ids_instalaciones, ids_organizaciones
+    )
+
+    # 3. Reglas que dependen de las referencias
+    for indice, payload in list(candidatos.items()):
+        faltantes = referencias_faltantes(*_ids_referencias(payload), usuarios, instalaciones, organizaciones)
+        try:
+            if faltantes:
+                raise HTTPException(404, {"message": "Referencias no encontradas.", "faltantes": faltantes})
+            _validar_reglas_referencias(payload, usuarios, instalaciones)
+        except HTTPException as e:
+            resultados[indice] = _error_item(indice, e.status_code, e.detail)
+            del candidatos[indice]
+
+    # 4. Conflictos de instalaciones (contra la base y dentro de la misma carga) y escritura
+    if candidatos:
+        ids_salones = {i.id_instalacion for p in candidatos.values() for i in p.instalaciones}
+        async with bloquear_instalaciones(ids_salones):
+            # Reservas existentes de esas instalaciones en la ventana completa de la carga
+            inicio = min(p.fecha_inicio for p in candidatos.values())
+            fin = max(p.fecha_fin or p.fecha_inicio for p in candidatos.values())
+            reservas: Dict[Any, List[tuple]] = {}
+            cursor = Evento.get_motor_collection().find(
+                filtro_solapamiento(ids_salones, inicio, fin),
+                projection={"instalaciones.id_instalacion": 1, "fecha_inicio": 1, "fecha_fin": 1},
             )
-            for o in getattr(evento, "organizaciones_externas", [])
-        ]
-        # Crear objeto EventoRespuesta
-        evento_resp = EventoRespuesta(
-            _id=evento._id,
-            nombre=evento.nombre,
-            tipo_evento=getattr(evento, "tipo_evento", None),
-            descripcion=getattr(evento, "descripcion", None),
-            fecha_inicio=getattr(evento, "fecha_inicio", None),
-            fecha_fin=getattr(evento, "fecha_fin", None),
-            estado=getattr(evento, "estado", None),
-            responsables=responsables_resp,
-            evaluaciones=evaluaciones_resp,
-            instalaciones=instalaciones_resp,
-            organizaciones_externas=organizaciones_resp
-        )
+            async for doc in cursor:
+                for inst in doc.get("instalaciones", []):
+                    reservas.setdefault(inst.get("id_instalacion"), []).append(
+                        (doc["fecha_inicio"], doc["fecha_fin"], str(doc["_id"]))
+                    )
+
+            documentos: List[Evento] = []
+            indices: List[int] = []
+            ahora = datetime.utcnow()
+            for indice, payload in candidatos.items():
+                p_inicio, p_fin = payload.fecha_inicio, payload.fecha_fin or payload.fecha_inicio
+                conflicto = next(
+                    (
+                        r for i in payload.instalaciones
+                        for r in reservas.get(i.id_instalacion, [])
+                        if r[0] < p_fin and r[1] > p_inicio
+                    ),
+                    None,
+                )
+                if conflicto:
+                    resultados[indice] = _error_item(indice, 409, {
+                        "message": "La instalación ya está reservada en ese horario.",
+                        "evento": conflicto[2],
+                    })
+                    continue
+
+                evento_doc = documentos_nuevos[indice]
+                evento_doc.actualizado_en = ahora
+                evento_doc.id = PydanticObjectId()
+                documentos.append(evento_doc)
+                indices.append(indice)
+                # Las siguientes filas de la carga también deben respetar esta reserva
+                for i in payload.instalaciones:
+                    reservas.setdefault(i.id_instalacion, []).append((p_inicio, p_fin, str(evento_doc.id)))
+
+            fallos_insercion: Dict[int, str] = {}
+            if documentos:
+                try:
+                    await Evento.insert_many(documentos, ordered=False)
+                except BulkWriteError as e:
+                    fallos_insercion = {err["index"]: err.get("errmsg") for err in e.details.get("writeErrors", [])}
+
+            for posicion, (indice, evento_doc) in enumerate(zip(indices, documentos)):
+                if posicion in fallos_insercion:
+                    resultados[indice] = _error_item(indice, 500, fallos_insercion[posicion])
+                else:
+                    resultados[indice] = ResultadoCargaItem(indice=indice, ok=True, id_evento=str(evento_doc.id))
+                    registrar(evento_doc.id, AccionHistorialEnum.CREADO, estado_nuevo=evento_doc.estado)
+
+    # 5. Reporte en el mismo orden de la carga
+    ordenados = [resultados[i] for i in range(len(items))]
+    creados = sum(1 for r in ordenados if r.ok)
+    return ResultadoCarga(
+        total=len(items),
+        creados=creados,
+        fallidos=len(items) - creados,
+        resultados=ordenados,
+    )
+
+
+def proyeccion_eventos(vista: Optional[str] = None, fields: Optional[str] = None) -> Optional[Dict[str, int]]:
+    """
+    Traduce los parámetros `vista` / `fields` a la proyección Mongo: la de EventoResumen
+    o solo los campos pedidos (`proyeccion_campos`).
+    Retorna None cuando se pide el evento completo.
+    """
+    if fields:
+        campos = {c.strip() for c in fields.split(",") if c.strip()}
+        invalidos = sorted(campos - set(CAMPOS_EVENTO))
+        if invalidos:
+            raise HTTPException(400, f"Campos no válidos en `fields`: {', '.join(invalidos)}")
+        return proyeccion_campos(sorted(campos))
 
-        eventos_respuesta.append(evento_resp)
+    if vista == "resumen":
+        return EventoResumen.Settings.projection
 
-    return eventos_respuesta
+    return None
 
 
-# Actualizar un evento existente
-async def actualizar_evento(id_evento: str, datos_actualizados: EventoActualizar) -> EventoRespuesta:
+def a_utc(fecha: Optional[datetime]) -> Optional[datetime]:
     """
-    Actualiza un evento existente parcialmente en MongoDB.
-    Solo se aplican los campos enviados en `datos_actualizados`.
+    Fecha de una consulta como UTC sin zona horaria, igual que las devuelve Mongo.
+    Permite comparar `desde`/`hasta` cuando uno trae zona (`...Z`, `-05:00`) y el otro no.
     """
+    if fecha is None or fecha.tzinfo is None:
+        return fecha
+    return fecha.astimezone(timezone.utc).replace(tzinfo=None)
 
-    # 1) Validar que el ID sea un ObjectId válido
-    if not PydanticObjectId.is_valid(id_evento):
-        raise HTTPException(400, "El ID del evento no es válido.")
 
-    # 2) Buscar el evento en la base de datos
-    evento = await Evento.get(PydanticObjectId(id_evento))
-    if not evento:
-        raise HTTPException(404, "Evento no encontrado.")
+def filtro_eventos(
+    estado: Optional[EstadoEventoEnum] = None,
+    tipo_evento: Optional[TipoEventoEnum] = None,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Filtro Mongo común al listado y a la exportación. `desde`/`hasta` acotan `fecha_inicio`
+    (hasta es exclusivo). Con estado o tipo lo resuelven los índices `estado_fecha_inicio` /
+    `tipo_evento_fecha_inicio`, que ya vienen en el orden del keyset.
+    """
+    desde, hasta = a_utc(desde), a_utc(hasta)
+    if desde and hasta and desde >= hasta:
+        raise HTTPException(400, "`desde` debe ser anterior a `hasta`.")
+
+    filtro: Dict[str, Any] = {}
+    if estado:
+        filtro["estado"] = estado.value
+    if tipo_evento:
+        filtro["tipo_evento"] = tipo_evento.value
+    if desde or hasta:
+        filtro["fecha_inicio"] = {
+            **({"$gte": desde} if desde else {}),
+            **({"$lt": hasta} if hasta else {}),
+        }
+    return filtro
+
+
+def _combinar(*filtros: Dict[str, Any]) -> Dict[str, Any]:
+    no_vacios = [f for f in filtros if f]
+    if len(no_vacios) <= 1:
+        return no_vacios[0] if no_vacios else {}
+    return {"$and": no_vacios}
+
+
+async def listar_eventos(
+    limit: int = 50,
+    after: Optional[str] = None,
+    proyeccion: Optional[Dict[str, int]] = None,
+    filtro: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Obtiene una página de eventos ordenada por (fecha_inicio, _id) usando paginación
+    por keyset: `after` es el cursor devuelto en la página anterior.
+    Si se indica `proyeccion`, Mongo solo devuelve esos campos; `filtro` sale de `filtro_eventos`.
+
+    Retorna un dict con la forma de EventoPagina / EventoPaginaParcial listo para
+    serializar con RespuestaJSON (sin pasar por modelos Pydantic).
+    """
+    # 1. Traer solo la página pedida (+1 para saber si hay más), como dicts crudos
+    cursor = Evento.get_motor_collection().find(
+        _combinar(filtro or {}, filtro_keyset(after)),
+        projection=proyeccion or PROYECCION_RESPUESTA,
+        sort=ORDEN_KEYSET,
+        limit=limit + 1,
+    )
+    docs = await cursor.to_list(length=limit + 1)
+
+    hay_mas = len(docs) > limit
+    docs = docs[:limit]
+
+    # 2. Cursor hacia la siguiente página (apunta al último evento devuelto)
+    siguiente = None
+    if hay_mas:
+        ultimo = docs[-1]
+        siguiente = codificar_cursor(ultimo["fecha_inicio"], ultimo["_id"])
 
-    # 3) Validar reglas de negocio
-    #    Ejemplo: estado no permite ciertos cambios (aquí adaptamos según tu enum)
-    if evento.estado != "pendiente":  # Solo se permite actualizar si el estado es 'pendiente'
-        raise HTTPException(400, "No se puede actualizar un evento que no esté pendiente.")
+    preparar = preparar_parcial if proyeccion is not None else preparar_evento
+    return {"items": [preparar(doc) for doc in docs], "siguiente": siguiente}
+
+
+def consulta_eventos_de_usuario(
+    id_usuario: PydanticObjectId,
+    filtro: Optional[Dict[str, Any]] = None,
+    solo_principal: bool = False,
+    after: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Argumentos de `find` para los eventos donde el usuario es responsable.
+    El $elemMatch sobre `responsables` se resuelve con el índice multikey
+    `responsables_fecha_inicio` (id_responsable, fecha_inicio, _id), que además entrega
+    el orden del keyset; `principal` se evalúa sobre el mismo elemento del arreglo.
+    `benchmarks.planes` verifica con explain() que el plan sea un IXSCAN.
+    """
+    condicion: Dict[str, Any] = {"id_responsable": id_usuario}
+    if solo_principal:
+        condicion["principal"] = True
+    return {
+        "filter": _combinar({"responsables": {"$elemMatch": condicion}}, filtro or {}, filtro_keyset(after)),
+        # Del arreglo solo se devuelve el elemento del usuario
+        "projection": {**EventoResumen.Settings.projection, "responsables": {"$elemMatch": {"id_responsable": id_usuario}}},
+        "sort": ORDEN_KEYSET,
+    }
+
+
+async def listar_eventos_de_usuario(
+    id_usuario: str,
+    limit: int = 50,
+    after: Optional[str] = None,
+    filtro: Optional[Dict[str, Any]] = None,
+    solo_principal: bool = False,
+) -> Dict[str, Any]:
+    """
+    Página de eventos donde el usuario figura en `responsables`, ordenada por (fecha_inicio, _id).
+    Retorna un dict con la forma de PaginaEventosUsuario.
+    """
+
+    # 1. Validar el usuario
+    if not PydanticObjectId.is_valid(id_usuario):
+        raise HTTPException(status_code=400, detail="El ID del usuario no es válido.")
+    oid = PydanticObjectId(id_usuario)
+    if not await buscar_por_ids(Usuario, [oid]):
+        raise HTTPException(status_code=404, detail="Usuario no encontrado.")
+
+    # 2. Traer la página (+1 para saber si hay más)
+    docs = await Evento.get_motor_collection().find(
+        **consulta_eventos_de_usuario(oid, filtro, solo_principal, after),
+        limit=limit + 1,
+    ).to_list(length=limit + 1)
+    hay_mas = len(docs) > limit
+    docs = docs[:limit]
+    siguiente = codificar_cursor(docs[-1]["fecha_inicio"], docs[-1]["_id"]) if hay_mas else None
+
+    # 3. Resumen del evento + papel del usuario en él
+    items = []
+    for doc in docs:
+        responsable = (doc.pop("responsables", None) or [{}])[0]
+        item = preparar_parcial(doc)
+        item["principal"] = bool(responsable.get("principal"))
+        item["tipo_aval"] = responsable.get("tipo_aval")
+        items.append(item)
+
+    return {"items": items, "siguiente": siguiente}
+
+
+def stream_eventos_ndjson(
+    filtro: Optional[Dict[str, Any]] = None,
+    after: Optional[str] = None,
+    proyeccion: Optional[Dict[str, int]] = None,
+    batch_size: int = 500,
+) -> AsyncIterator[bytes]:
+    """
+    Recorre los eventos posteriores al cursor `after` con un cursor de Motor (por lotes
+    de `batch_size`) y emite cada lote como JSON Lines apenas se serializa.
+    Con `proyeccion` cada línea trae solo esos campos, como en el listado paginado.
+    La memoria usada no depende del tamaño de la colección.
 
-    # 4) Validar fechas si se envían
+    El cursor `after` se valida aquí (400) antes de empezar a transmitir.
+    """
+    cursor = Evento.get_motor_collection().find(
+        _combinar(filtro or {}, filtro_keyset(after)),
+        projection=proyeccion or PROYECCION_RESPUESTA,
+        sort=ORDEN_KEYSET,
+        batch_size=batch_size,
+    )
+    return _lotes_ndjson(cursor, proyeccion is not None, batch_size)
+
+
+async def _lotes_ndjson(cursor, parcial: bool, batch_size: int) -> AsyncIterator[bytes]:
+    lote: List[Dict[str, Any]] = []
+    async for doc in cursor:
+        lote.append(doc)
+        if len(lote) >= batch_size:
+            yield eventos_ndjson(lote, parcial)
+            lote = []
+    if lote:
+        yield eventos_ndjson(lote, parcial)
+
+
+def suscribir_cambios(
+    estado: Optional[EstadoEventoEnum] = None,
+    id_responsable: Optional[str] = None,
+    ultimo_id: Optional[str] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Valida una suscripción a los cambios en vivo y retorna el cuerpo SSE.
+    Los mensajes salen del change stream compartido del proceso (ver app.db.cambios).
+    """
+    if not difusor.disponible:
+        raise HTTPException(status_code=503, detail="Los cambios en vivo requieren que MongoDB sea un replica set.")
+    if id_responsable is not None and not PydanticObjectId.is_valid(id_responsable):
+        raise HTTPException(status_code=400, detail="El ID del responsable no es válido.")
+    if difusor.lleno:
+        raise HTTPException(status_code=503, detail="Se alcanzó el máximo de clientes conectados; intente más tarde.")
+    return mensajes(estado.value if estado else None, id_responsable, ultimo_id)
+
+
+async def exportar_eventos(
+    formato: str,
+    filtro: Optional[Dict[str, Any]] = None,
+    comprimir: bool = False,
+    batch_size: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Exportación completa en CSV (`eventos_csv`) o JSON Lines (`eventos_jsonl`), opcionalmente gzip.
+
+    - El cursor trae `batch_size` eventos por ida a Mongo y cada lote se emite apenas está listo:
+      la memoria no depende del tamaño de la exportación y StreamingResponse aplica contrapresión.
+    - Serializar y comprimir un lote se hace en un hilo (`asyncio.to_thread`) para no
+      bloquear el event loop con exportaciones grandes.
+    """
+    batch_size = batch_size or settings.EXPORTACION_TAMANO_LOTE
+    serializar = eventos_csv if formato == "csv" else eventos_jsonl
+    # wbits=31: formato gzip (cabecera + CRC), no zlib crudo
+    compresor = zlib.compressobj(6, zlib.DEFLATED, 31) if comprimir else None
+
+    def procesar(lote: List[Dict[str, Any]], encabezado: bool) -> bytes:
+        datos = serializar(lote, encabezado)
+        return compresor.compress(datos) if compresor else datos
+
+    cursor = Evento.get_motor_collection().find(
+        filtro or {},
+        projection=PROYECCION_RESPUESTA,
+        sort=ORDEN_KEYSET,
+        batch_size=batch_size,
+    )
+    primero = True
+    lote: List[Dict[str, Any]] = []
+    async for doc in cursor:
+        lote.append(doc)
+        if len(lote) >= batch_size:
+            datos = await asyncio.to_thread(procesar, lote, primero)
+            primero, lote = False, []
+            if datos:
+                yield datos
+    # Último lote (o solo el encabezado si no hubo eventos)
+    if lote or primero:
+        datos = await asyncio.to_thread(procesar, lote, primero)
+        if datos:
+            yield datos
+    if compresor:
+        yield compresor.flush()
+
+
+async def _validar_actualizacion(datos_actualizados: EventoActualizar) -> None:
+    """
+    Reglas de actualización que no dependen del evento guardado.
+    """
+
+    # 1) Validar fechas si se envían
     fi: Optional[datetime] = datos_actualizados.fecha_inicio
     ff: Optional[datetime] = datos_actualizados.fecha_fin
     if fi and ff and fi > ff:
         raise HTTPException(400, "La fecha de inicio debe ser anterior o igual a la fecha de fin.")
+    if fi and ff:
+        _validar_duracion(fi, ff)
 
-    # 5) Validar responsables si se envían
+    # 2) Validar responsables si se envían
     if datos_actualizados.responsables:
         n_principales = sum(1 for r in datos_actualizados.responsables if r.principal)
         if n_principales != 1:
             raise HTTPException(400, "Debe haber exactamente un responsable principal.")
-        tipos = set()
-        for r in datos_actualizados.responsables:
-            from app.models.usuario import Usuario
-            usuario = await Usuario.get(PydanticObjectId(r.id_responsable))
-            if not usuario:
-                raise HTTPException(404, f"Responsable no encontrado: {r.id_responsable}")
-            tipos.add(usuario.rol)
+
+    # 3) Resolver en paralelo las referencias enviadas (una consulta $in por colección)
+    usuarios, instalaciones, _ = await cargar_referencias(
+        [r.id_responsable for r in datos_actualizados.responsables or []],
+        [i.id_instalacion for i in datos_actualizados.instalaciones or []],
+        [o.id_organizacion for o in datos_actualizados.organizaciones_externas or []],
+    )
+
+    if datos_actualizados.responsables:
+        tipos = {usuarios[r.id_responsable].rol for r in datos_actualizados.responsables}
         if "docente" in tipos and "estudiante" in tipos:
             raise HTTPException(
                 400,
                 "Un evento no puede tener responsables docentes y estudiantes al mismo tiempo."
             )
 
-    # 6) Validar instalaciones si se envían
+    # 4) Validar capacidad de las instalaciones si se envían
     if datos_actualizados.instalaciones:
-        from app.models.instalacion import Instalacion
         for inst in datos_actualizados.instalaciones:
-            instalacion = await Instalacion.get(PydanticObjectId(inst.id_instalacion))
-            if not instalacion:
-                raise HTTPException(404, f"Instalación no encontrada: {inst.id_instalacion}")
+            instalacion = instalaciones[inst.id_instalacion]
             if datos_actualizados.asistentes and instalacion.capacidad < datos_actualizados.asistentes:
                 raise HTTPException(
                     400,
                     f"La instalación {instalacion.nombre} no tiene capacidad suficiente."
                 )
 
-    # 7) Validar organizaciones externas si se envían
-    if datos_actualizados.organizaciones_externas:
-        from app.models.organizacion_externa import OrganizacionExterna
-        for org in datos_actualizados.organizaciones_externas:
-            organizacion = await OrganizacionExterna.get(PydanticObjectId(org.id_organizacion))
-            if not organizacion:
-                raise HTTPException(404, f"Organización no encontrada: {org.id_organizacion}")
 
-    # 8) Aplicar cambios (solo los campos enviados)
-    update_data = datos_actualizados.model_dump(exclude_unset=True)
-    for campo, valor in update_data.items():
-        setattr(evento, campo, valor)
+# Actualizar un evento existente
+async def actualizar_evento(id_evento: str, datos_actualizados: EventoActualizar) -> Dict[str, Any]:
+    """
+    Actualiza un evento existente parcialmente en MongoDB.
+    Solo se aplican los campos enviados en `datos_actualizados`, con un $set
+    dirigido cuyo filtro exige que el evento siga 'pendiente'; la respuesta es
+    el documento ya actualizado que devuelve el mismo find_one_and_update.
+    """
 
-    # 9) Guardar cambios
-    await evento.save()  # Beanie actualiza solo los campos modificados
+    # 1) Validar que el ID sea un ObjectId válido
+    if not PydanticObjectId.is_valid(id_evento):
+        raise HTTPException(400, "El ID del evento no es válido.")
 
-    # 10) Retornar el evento actualizado usando el schema de salida
-    return EventoRespuesta(**evento.model_dump())
+    # 2) Regla de negocio en el propio filtro: solo se actualizan eventos 'pendiente'
+    coleccion = Evento.get_motor_collection()
+    filtro = {"_id": PydanticObjectId(id_evento), "estado": "pendiente"}
 
+    # 3) Validar los datos enviados (fechas, responsables, referencias y capacidad).
+    #    Si algo falla, antes se informa si el evento no existe (404) o ya no está
+    #    pendiente (400); esa consulta extra solo se hace cuando hay un error.
+    try:
+        await _validar_actualizacion(datos_actualizados)
+    except HTTPException:
+        if await coleccion.find_one(filtro, projection={"_id": 1}) is None:
+            await _motivo_no_actualizable(coleccion, filtro["_id"])
+        raise
 
-async def obtener_evento_por_id(id_evento: str) -> EventoRespuesta:
+    fi: Optional[datetime] = datos_actualizados.fecha_inicio
+    ff: Optional[datetime] = datos_actualizados.fecha_fin
+
+    # 4) Campos a modificar ($set solo con lo enviado, codificado como lo guarda Beanie)
+    update_data = datos_actualizados.model_dump(exclude_unset=True)
+    if not update_data:
+        doc = await coleccion.find_one(filtro, projection=PROYECCION_RESPUESTA)
+        if doc is None:
+            await _motivo_no_actualizable(coleccion, filtro["_id"])
+        return preparar_evento(doc)
+
+    cambios = {"$set": {**Encoder().encode(update_data), "actualizado_en": datetime.utcnow()}}
+    if "nombre" in update_data:
+        cambios["$set"]["nombre_normalizado"] = normalizar_nombre(update_data["nombre"])
+
+    async def aplicar():
+        return await coleccion.find_one_and_update(
+            filtro,
+            cambios,
+            projection=PROYECCION_RESPUESTA,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    # 5) Guardar cambios; si cambian fechas o instalaciones, verificar antes
+    #    (bajo bloqueo) que las instalaciones sigan libres en el nuevo horario.
+    #    Solo en ese caso se leen del evento los campos de la reserva que no se enviaron
+    #    (y la fecha de inicio anterior, para recalcular las estadísticas de su mes).
+    fecha_anterior: Optional[datetime] = None
+    if {"fecha_inicio", "fecha_fin", "instalaciones"} & update_data.keys():
+        ids_instalaciones = [i.id_instalacion for i in datos_actualizados.instalaciones or []]
+        inicio, fin = fi, ff
+        if not (ids_instalaciones and inicio and fin) or "fecha_inicio" in update_data:
+            actual = await coleccion.find_one(
+                filtro,
+                projection={"fecha_inicio": 1, "fecha_fin": 1, "instalaciones.id_instalacion": 1},
+            )
+            if actual is None:
+                await _motivo_no_actualizable(coleccion, filtro["_id"])
+            ids_instalaciones = ids_instalaciones or [i.get("id_instalacion") for i in actual.get("instalaciones", [])]
+            inicio, fin = inicio or actual["fecha_inicio"], fin or actual["fecha_fin"]
+            fecha_anterior = actual["fecha_inicio"]
+            # Con una sola de las fechas enviada, la duración se valida contra la guardada
+            _validar_duracion(inicio, fin)
+
+        async with bloquear_instalaciones(ids_instalaciones):
+            await verificar_disponibilidad(ids_instalaciones, inicio, fin, excluir_id=filtro["_id"])
+            doc = await aplicar()
+    else:
+        doc = await aplicar()
+
+    # 6) Si el filtro no encontró el evento, averiguar por qué
+    if doc is None:
+        await _motivo_no_actualizable(coleccion, filtro["_id"])
+    invalidar("eventos", filtro["_id"])
+    # El filtro exige 'pendiente': ese es siempre el estado anterior
+    registrar(filtro["_id"], AccionHistorialEnum.ACTUALIZADO, "pendiente", doc["estado"], campos=update_data.keys())
+
+    # El mes nuevo se detecta por `actualizado_en`; el anterior hay que marcarlo
+    if fecha_anterior and (fecha_anterior.year, fecha_anterior.month) != (doc["fecha_inicio"].year, doc["fecha_inicio"].month):
+        await marcar_meses_sucios(fecha_anterior)
+
+    # 7) Retornar el evento actualizado con la forma del schema de salida
+    return preparar_evento(doc)
+
+
+async def _motivo_no_actualizable(coleccion, id_evento: PydanticObjectId) -> None:
+    """
+    Se llama cuando el filtro {_id, estado: 'pendiente'} no encontró nada:
+    distingue un evento inexistente (404) de uno que ya no está pendiente (400).
+    """
+    if await coleccion.find_one({"_id": id_evento}, projection={"_id": 1}) is None:
+        raise HTTPException(404, "Evento no encontrado.")
+    raise HTTPException(400, "No se puede actualizar un evento que no esté pendiente.")
+
+
+async def obtener_evento_por_id(id_evento: str, proyeccion: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
     """
     Obtiene un evento por su ID.
+    Si se indica `proyeccion`, solo se leen de Mongo esos campos.
     """
 
     # 1. Validar que el ID sea un ObjectId válido
@@ -259,17 +691,86 @@ async def obtener_evento_por_id(id_evento: str) -> EventoRespuesta:
             detail="El ID del evento no es válido."
         )
 
-    # 2. Buscar el evento
-    evento = await Evento.get(PydanticObjectId(id_evento))
+    # 2. Buscar el evento (dict crudo, solo con los campos de salida)
+    doc = await Evento.get_motor_collection().find_one(
+        {"_id": PydanticObjectId(id_evento)},
+        projection=proyeccion or PROYECCION_RESPUESTA,
+    )
 
-    if not evento:
+    if not doc:
         raise HTTPException(
             status_code=404,
             detail="Evento no encontrado."
         )
 
-    # 3. Retornar usando el schema de salida
-    return EventoRespuesta(**evento.model_dump())
+    # 3. Retornar con la forma del schema de salida
+    if proyeccion is not None:
+        return preparar_parcial(doc)
+    return preparar_evento(doc)
+
+
+def _etag(datos: bytes) -> str:
+    return '"' + hashlib.blake2b(datos, digest_size=16).hexdigest() + '"'
+
+
+def _coincide(etag: Optional[str], etags_cliente: Set[str]) -> bool:
+    # `If-None-Match: *` coincide con cualquier versión existente
+    return etag is not None and (etag in etags_cliente or "*" in etags_cliente)
+
+
+async def obtener_evento_condicional(
+    id_evento: str,
+    proyeccion: Optional[Dict[str, int]],
+    etags_cliente: Set[str],
+) -> Tuple[str, Optional[bytes]]:
+    """
+    Lectura de un evento con ETag fuerte para GET /eventos/{id}.
+    Retorna (etag, cuerpo JSON); el cuerpo es None si el cliente ya tiene esa versión
+    (If-None-Match), y en ese caso no se serializa nada.
+
+    El ETag sale de `actualizado_en` (todas las escrituras de eventos lo cambian) y de la
+    variante pedida; los eventos anteriores a ese campo usan un hash del cuerpo.
+    """
+
+    # 1. Validar que el ID sea un ObjectId válido
+    if not PydanticObjectId.is_valid(id_evento):
+        raise HTTPException(status_code=400, detail="El ID del evento no es válido.")
+    # Clave ObjectId: el change stream invalida con el _id tal como viene de Mongo
+    clave = PydanticObjectId(id_evento)
+    variante = "completo" if proyeccion is None else ",".join(sorted(proyeccion))
+
+    # 2. Respuesta ya serializada en el cache (si está habilitado)
+    cache = cache_respuestas_eventos()
+    generacion = None
+    if cache is not None:
+        guardada = (cache.obtener(clave) or {}).get(variante)
+        if guardada is not None:
+            cache.aciertos += 1
+            etag, cuerpo = guardada
+            return etag, None if _coincide(etag, etags_cliente) else cuerpo
+        cache.fallos += 1
+        generacion = cache.generacion
+
+    # 3. Leer el evento junto con su marca de actualización
+    doc = await Evento.get_motor_collection().find_one(
+        {"_id": clave},
+        projection={**(proyeccion or PROYECCION_RESPUESTA), "actualizado_en": 1},
+    )
+    if not doc:
+        raise HTTPException(status_code=404, detail="Evento no encontrado.")
+
+    actualizado_en = doc.pop("actualizado_en", None)
+    etag = _etag(f"{id_evento}|{actualizado_en.isoformat()}|{variante}".encode()) if actualizado_en else None
+    if _coincide(etag, etags_cliente):
+        return etag, None
+
+    # 4. Serializar una sola vez por versión
+    cuerpo = a_json(preparar_parcial(doc) if proyeccion is not None else preparar_evento(doc))
+    etag = etag or _etag(cuerpo)
+    if cache is not None:
+        variantes = {**(cache.obtener(clave) or {}), variante: (etag, cuerpo)}
+        cache.guardar(clave, variantes, generacion)
+    return etag, None if _coincide(etag, etags_cliente) else cuerpo
 
 
 # Eliminar un evento
@@ -294,16 +795,24 @@ async def eliminar_evento(id_evento: str) -> dict:
             detail="Evento no encontrado."
         )
 
-    # 3. Eliminar el evento
+    # 3. Eliminar el evento (y marcar su mes para recalcular las estadísticas)
     await evento.delete()
+    invalidar("eventos", evento.id)
+    registrar(evento.id, AccionHistorialEnum.ELIMINADO, estado_anterior=evento.estado)
+    await marcar_meses_sucios(evento.fecha_inicio)
 
     # 4. Retornar mensaje de éxito
     return {"message": f"Evento con ID {id_evento} eliminado correctamente."}
 
 
-async def agregar_evaluacion_a_evento(id_evento: str, payload: EvaluacionCrear) -> Evento:
+async def agregar_evaluacion_a_evento(id_evento: str, payload: EvaluacionCrear) -> Dict[str, Any]:
     """
     Añade una evaluación a un evento y actualiza su estado según la evaluación.
+
+    Se hace con un único find_one_and_update ($push de la evaluación + $set del estado)
+    que devuelve el documento ya actualizado: dos evaluaciones simultáneas no se pisan.
+    Una evaluación que aprueba o rechaza solo se aplica si el evento sigue 'pendiente'
+    y libera la asignación de la cola de revisión.
     """
 
     # 1. Validar ObjectId
@@ -312,11 +821,9 @@ async def agregar_evaluacion_a_evento(id_evento: str, payload: EvaluacionCrear)
     if not PydanticObjectId.is_valid(payload.id_secretario):
         raise HTTPException(status_code=400, detail="El ID del secretario no es válido.")
 
-    # 2. Buscar evento y secretario
-    evento = await Evento.get(PydanticObjectId(id_evento))
-    if not evento:
-        raise HTTPException(status_code=404, detail="Evento no encontrado.")
-    secretario = await Usuario.get(PydanticObjectId(payload.id_secretario))
+    # 2. Buscar secretario
+    usuarios = await buscar_por_ids(Usuario, [payload.id_secretario])
+    secretario = usuarios.get(PydanticObjectId(payload.id_secretario))
     if not secretario:
         raise HTTPException(status_code=404, detail="Secretario no encontrado.")
 
@@ -328,19 +835,47 @@ async def agregar_evaluacion_a_evento(id_evento: str, payload: EvaluacionCrear)
         justificacion=payload.justificacion,
         acta_aprobacion=payload.acta_aprobacion,
         estado=payload.estado
+    ).model_dump()
+    nueva_eval["estado"] = payload.estado.value
+
+    # 4. Agregar la evaluación y, si decide el evento, cambiar su estado
+    #    (regla de negocio) solo cuando aún está pendiente
+    filtro: Dict[str, Any] = {"_id": PydanticObjectId(id_evento)}
+    cambios: Dict[str, Any] = {
+        "$push": {"evaluaciones": nueva_eval},
+        "$set": {"actualizado_en": datetime.utcnow()},
+    }
+    if payload.estado.value in ("aprobado", "rechazado"):
+        filtro["estado"] = "pendiente"
+        cambios["$set"]["estado"] = payload.estado.value
+        cambios["$unset"] = {"revisor": "", "revision_vence": ""}
+
+    # 5. Una sola ida a Mongo: escribe y retorna el documento actualizado
+    coleccion = Evento.get_motor_collection()
+    doc = await coleccion.find_one_and_update(
+        filtro,
+        cambios,
+        projection=PROYECCION_RESPUESTA,
+        return_document=ReturnDocument.AFTER,
     )
 
-    # 4. Agregar evaluación a la lista
-    evento.evaluaciones.append(nueva_eval)
-
-    # 5. Actualizar el estado del evento (regla de negocio)
-    if payload.estado == "aprobado":
-        evento.estado = "aprobado"
-    elif payload.estado == "rechazado":
-        evento.estado = "rechazado"
-
-    # 6. Guardar cambios
-    await evento.save()
+    if doc is None:
+        # Solo en el caso de error se averigua el motivo
+        actual = await coleccion.find_one({"_id": filtro["_id"]}, projection={"estado": 1})
+        if not actual:
+            raise HTTPException(status_code=404, detail="Evento no encontrado.")
+        raise HTTPException(
+            status_code=409,
+            detail=f"El evento ya fue evaluado (estado '{actual.get('estado')}')."
+        )
 
-    return EventoRespuesta(**evento.model_dump())
+    invalidar("eventos", filtro["_id"])
+    registrar(
+        filtro["_id"],
+        AccionHistorialEnum.EVALUADO,
+        estado_anterior=filtro.get("estado", doc["estado"]),
+        estado_nuevo=doc["estado"],
+        id_usuario=payload.id_secretario,
+    )
+    return preparar_evento(doc)
     
\ No newline at end of file
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from fastapi import HTTPException
+from bson import ObjectId
+from beanie import PydanticObjectId
+from app.models.evento_historial import AccionHistorialEnum, EventoHistorial
+from app.schemas.serializacion import preparar_parcial
+from app.service.evento import a_utc
+
+# El _id y `fecha` se generan casi a la vez al registrar el cambio: el rango por _id
+# se abre un segundo hacia cada lado y `fecha` da el límite exacto
+HOLGURA_ID = timedelta(seconds=1)
+
+
+def filtro_historial(
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    accion: Optional[AccionHistorialEnum] = None,
+    id_evento: Optional[PydanticObjectId] = None,
+    after: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Filtro de `eventos_historial`, del cambio más reciente al más antiguo.
+
+    El _id se genera al registrar el cambio, así que su orden es el orden en el tiempo:
+    el rango de fechas se traduce en un rango sobre el índice de _id (o sobre `id_evento_id`
+    si se pide un evento) y el cursor `after` es simplemente el último _id de la página.
+    """
+    desde, hasta = a_utc(desde), a_utc(hasta)
+    if desde and hasta and desde >= hasta:
+        raise HTTPException(status_code=400, detail="`desde` debe ser anterior a `hasta`.")
+
+    filtro: Dict[str, Any] = {}
+    rango_id: Dict[str, Any] = {}
+    if id_evento is not None:
+        filtro["id_evento"] = id_evento
+    if accion is not None:
+        filtro["accion"] = accion.value
+    if desde or hasta:
+        filtro["fecha"] = {}
+    if desde:
+        filtro["fecha"]["$gte"] = desde
+        rango_id["$gte"] = ObjectId.from_datetime(desde - HOLGURA_ID)
+    if hasta:
+        filtro["fecha"]["$lt"] = hasta
+        rango_id["$lt"] = ObjectId.from_datetime(hasta + HOLGURA_ID)
+    if after:
+        if not ObjectId.is_valid(after):
+            raise HTTPException(status_code=400, detail="El cursor de paginación no es válido.")
+        # Orden descendente: la página siguiente son los _id menores que el último
+        rango_id["$lt"] = min(ObjectId(after), rango_id.get("$lt", ObjectId(after)))
+    if rango_id:
+        filtro["_id"] = rango_id
+    return filtro
+
+
+async def listar_historial(
+    limit: int = 50,
+    after: Optional[str] = None,
+    desde: Optional[datetime] = None,
+    hasta: Optional[datetime] = None,
+    accion: Optional[AccionHistorialEnum] = None,
+    id_evento: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Página de cambios (de todos los eventos o de uno) del más reciente al más antiguo.
+    Retorna un dict con la forma de PaginaHistorial.
+    """
+
+    # 1. Validar el evento (puede estar eliminado: su historial se conserva)
+    oid = None
+    if id_evento is not None:
+        if not PydanticObjectId.is_valid(id_evento):
+            raise HTTPException(status_code=400, detail="El ID del evento no es válido.")
+        oid = PydanticObjectId(id_evento)
+
+    # 2. Traer la página (+1 para saber si hay más)
+    docs = await EventoHistorial.get_motor_collection().find(
+        filtro_historial(desde, hasta, accion, oid, after),
+        sort=[("_id", -1)],
+        limit=limit + 1,
+    ).to_list(length=limit + 1)
+    hay_mas = len(docs) > limit
+    docs = docs[:limit]
+    siguiente = str(docs[-1]["_id"]) if hay_mas else None
+
+    return {"items": [preparar_parcial(doc) for doc in docs], "siguiente": siguiente}
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException
+from app.models.evento import Evento
+from app.models.instalacion import Instalacion
+from app.schemas.instalacion import InstalacionDisponible
+from app.service.evento import a_utc
+from app.service.reservas import filtro_solapamiento
+
+
+async def listar_instalaciones_disponibles(
+    desde: datetime,
+    hasta: datetime,
+    capacidad: Optional[int] = None,
+) -> List[InstalacionDisponible]:
+    """
+    Instalaciones sin eventos (no rechazados) que se crucen con [desde, hasta)
+    y con capacidad suficiente. Todo se resuelve con consultas indexadas:
+    las candidatas por `capacidad` y las ocupadas con un `distinct` sobre
+    el índice `instalaciones_rango` de eventos.
+    """
+    # 1. Validar el rango (en UTC sin zona, como las fechas guardadas)
+    desde, hasta = a_utc(desde), a_utc(hasta)
+    if desde >= hasta:
+        raise HTTPException(400, "`desde` debe ser anterior a `hasta`.")
+
+    # 2. Instalaciones candidatas por capacidad
+    filtro: Dict[str, Any] = {}
+    if capacidad:
+        filtro["capacidad"] = {"$gte": capacidad}
+    candidatas = await Instalacion.get_motor_collection().find(
+        filtro,
+        projection={"nombre": 1, "ubicacion": 1, "capacidad": 1, "tipo": 1},
+        sort=[("capacidad", 1)],
+    ).to_list(length=None)
+    if not candidatas:
+        return []
+
+    # 3. Cuáles de ellas tienen un evento que se cruza con el rango
+    ocupadas = set(await Evento.get_motor_collection().distinct(
+        "instalaciones.id_instalacion",
+        filtro_solapamiento([c["_id"] for c in candidatas], desde, hasta),
+    ))
+
+    # 4. Quedarse con las libres
+    return [InstalacionDisponible(**c) for c in candidatas if c["_id"] not in ocupadas]
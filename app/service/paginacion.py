@@ -0,0 +1,47 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from fastapi import HTTPException
+from beanie import PydanticObjectId
+
+# Orden estable para paginar por keyset: primero por fecha de inicio y,
+# para eventos con la misma fecha, por _id.
+ORDEN_KEYSET = [("fecha_inicio", 1), ("_id", 1)]
+
+
+def codificar_cursor(fecha_inicio: datetime, id_documento: PydanticObjectId) -> str:
+    """
+    Genera el token opaco que apunta al último documento de una página.
+    """
+    crudo = json.dumps({"f": fecha_inicio.isoformat(), "id": str(id_documento)})
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(token: str) -> Tuple[datetime, PydanticObjectId]:
+    """
+    Recupera (fecha_inicio, _id) a partir de un token generado por `codificar_cursor`.
+    """
+    try:
+        relleno = "=" * (-len(token) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(token + relleno))
+        return datetime.fromisoformat(datos["f"]), PydanticObjectId(datos["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="El cursor de paginación no es válido.")
+
+
+def filtro_keyset(after: Optional[str]) -> Dict[str, Any]:
+    """
+    Construye el filtro Mongo que devuelve los documentos posteriores al cursor `after`
+    según ORDEN_KEYSET. Sin cursor no se filtra nada.
+    """
+    if not after:
+        return {}
+
+    fecha, id_documento = decodificar_cursor(after)
+    return {
+        "$or": [
+            {"fecha_inicio": {"$gt": fecha}},
+            {"fecha_inicio": fecha, "_id": {"$gt": id_documento}},
+        ]
+    }
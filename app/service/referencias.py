@@ -0,0 +1,105 @@
+import asyncio
+from fastapi import HTTPException
+from beanie import PydanticObjectId
+from beanie.operators import In
+from typing import Dict, Iterable, List, Tuple
+from app.models.usuario import Usuario
+from app.models.instalacion import Instalacion
+from app.models.organizacion_externa import OrganizacionExterna
+from app.db.cache import cache_de
+
+
+async def _consultar_por_ids(modelo, ids: List[PydanticObjectId]) -> Dict[PydanticObjectId, object]:
+    documentos = await modelo.find(In(modelo.id, ids)).to_list()
+    return {doc.id: doc for doc in documentos}
+
+
+async def buscar_por_ids(modelo, ids: Iterable[PydanticObjectId]) -> Dict[PydanticObjectId, object]:
+    """
+    Trae todos los documentos de `modelo` cuyos _id estén en `ids` con una sola consulta $in.
+    Para usuarios, instalaciones y organizaciones externas primero se usa el cache en memoria
+    y solo se consultan los IDs que no estén en él.
+    Retorna un diccionario {_id: documento}; los IDs inexistentes no aparecen.
+    """
+    ids_unicos = list(dict.fromkeys(PydanticObjectId(i) for i in ids))
+    if not ids_unicos:
+        return {}
+
+    cache = cache_de(modelo.get_collection_name())
+    if cache is None:
+        return await _consultar_por_ids(modelo, ids_unicos)
+
+    return await cache.obtener_muchos(ids_unicos, lambda faltantes: _consultar_por_ids(modelo, faltantes))
+
+
+def referencias_faltantes(
+    ids_usuarios: Iterable[PydanticObjectId],
+    ids_instalaciones: Iterable[PydanticObjectId],
+    ids_organizaciones: Iterable[PydanticObjectId],
+    usuarios: Dict,
+    instalaciones: Dict,
+    organizaciones: Dict,
+) -> Dict[str, List[str]]:
+    """
+    IDs pedidos que no aparecen en los documentos encontrados, agrupados por tipo.
+    """
+    faltantes: Dict[str, List[str]] = {}
+    for etiqueta, ids, encontrados in (
+        ("responsables", ids_usuarios, usuarios),
+        ("instalaciones", ids_instalaciones, instalaciones),
+        ("organizaciones_externas", ids_organizaciones, organizaciones),
+    ):
+        no_encontrados = list(dict.fromkeys(str(i) for i in ids if PydanticObjectId(i) not in encontrados))
+        if no_encontrados:
+            faltantes[etiqueta] = no_encontrados
+    return faltantes
+
+
+async def buscar_referencias(
+    ids_usuarios: Iterable[PydanticObjectId] = (),
+    ids_instalaciones: Iterable[PydanticObjectId] = (),
+    ids_organizaciones: Iterable[PydanticObjectId] = (),
+) -> Tuple[Dict[PydanticObjectId, Usuario], Dict[PydanticObjectId, Instalacion], Dict[PydanticObjectId, OrganizacionExterna]]:
+    """
+    Resuelve usuarios, instalaciones y organizaciones externas en paralelo
+    (una consulta $in por colección), sin validar que existan.
+    """
+    return await asyncio.gather(
+        buscar_por_ids(Usuario, ids_usuarios),
+        buscar_por_ids(Instalacion, ids_instalaciones),
+        buscar_por_ids(OrganizacionExterna, ids_organizaciones),
+    )
+
+
+async def cargar_referencias(
+    ids_usuarios: Iterable[PydanticObjectId] = (),
+    ids_instalaciones: Iterable[PydanticObjectId] = (),
+    ids_organizaciones: Iterable[PydanticObjectId] = (),
+) -> Tuple[Dict[PydanticObjectId, Usuario], Dict[PydanticObjectId, Instalacion], Dict[PydanticObjectId, OrganizacionExterna]]:
+    """
+    Resuelve usuarios, instalaciones y organizaciones externas en paralelo
+    (una consulta $in por colección) y valida que todos existan.
+
+    Si falta alguna referencia se lanza un único 404 que lista todos los IDs no encontrados.
+    """
+    ids_usuarios = list(ids_usuarios)
+    ids_instalaciones = list(ids_instalaciones)
+    ids_organizaciones = list(ids_organizaciones)
+
+    # 1. Las tres búsquedas viajan a Mongo al mismo tiempo
+    usuarios, instalaciones, organizaciones = await buscar_referencias(
+        ids_usuarios, ids_instalaciones, ids_organizaciones
+    )
+
+    # 2. Reunir todos los faltantes para reportarlos en una sola respuesta
+    faltantes = referencias_faltantes(
+        ids_usuarios, ids_instalaciones, ids_organizaciones, usuarios, instalaciones, organizaciones
+    )
+
+    if faltantes:
+        raise HTTPException(
+            status_code=404,
+            detail={"message": "Referencias no encontradas.", "faltantes": faltantes}
+        )
+
+    return usuarios, instalaciones, organizaciones
@@ -0,0 +1,105 @@
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+from fastapi import HTTPException
+from beanie import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
+from app.models.evento import Evento
+
+# Colección auxiliar con un documento por instalación bloqueada mientras se valida
+# y guarda un evento. Evita que dos escrituras concurrentes reserven el mismo salón
+# en horarios que se cruzan (Mongo no tiene restricciones de exclusión por rango).
+COLECCION_BLOQUEOS = "bloqueos_instalaciones"
+DURACION_BLOQUEO = timedelta(seconds=10)
+ESPERA_MAXIMA_SEGUNDOS = 5.0
+
+
+def filtro_solapamiento(
+    ids_instalaciones: Iterable[PydanticObjectId],
+    inicio: datetime,
+    fin: datetime,
+    excluir_id: Optional[PydanticObjectId] = None,
+) -> Dict[str, Any]:
+    """
+    Eventos no rechazados que usan alguna de las instalaciones y cuyo horario
+    se cruza con [inicio, fin). Usa el índice `instalaciones_rango`.
+    """
+    filtro: Dict[str, Any] = {
+        "instalaciones.id_instalacion": {"$in": list(ids_instalaciones)},
+        "fecha_fin": {"$gt": inicio},
+        "fecha_inicio": {"$lt": fin},
+        "estado": {"$ne": "rechazado"},
+    }
+    if excluir_id is not None:
+        filtro["_id"] = {"$ne": excluir_id}
+    return filtro
+
+
+async def verificar_disponibilidad(
+    ids_instalaciones: Iterable[PydanticObjectId],
+    inicio: datetime,
+    fin: Optional[datetime],
+    excluir_id: Optional[PydanticObjectId] = None,
+) -> None:
+    """
+    Lanza 409 si alguna instalación ya está reservada en ese horario.
+    """
+    conflicto = await Evento.get_motor_collection().find_one(
+        filtro_solapamiento(ids_instalaciones, inicio, fin or inicio, excluir_id),
+        projection={"nombre": 1, "fecha_inicio": 1, "fecha_fin": 1},
+    )
+    if conflicto:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "La instalación ya está reservada en ese horario.",
+                "evento": str(conflicto["_id"]),
+                "nombre": conflicto.get("nombre"),
+                "fecha_inicio": conflicto["fecha_inicio"].isoformat(),
+                "fecha_fin": conflicto["fecha_fin"].isoformat(),
+            }
+        )
+
+
+@asynccontextmanager
+async def bloquear_instalaciones(ids_instalaciones: Iterable[PydanticObjectId]) -> AsyncIterator[None]:
+    """
+    Toma un bloqueo exclusivo (con expiración) sobre cada instalación mientras
+    dura el bloque `async with`. Los bloqueos se toman en orden de _id para que
+    dos escrituras con las mismas instalaciones no se bloqueen mutuamente.
+    """
+    coleccion = Evento.get_motor_collection().database[COLECCION_BLOQUEOS]
+    token = uuid.uuid4().hex
+    tomados = []
+    limite = time.monotonic() + ESPERA_MAXIMA_SEGUNDOS
+
+    try:
+        for id_instalacion in sorted(set(ids_instalaciones)):
+            espera = 0.01
+            while True:
+                ahora = datetime.utcnow()
+                try:
+                    # Si el bloqueo no existe o expiró se toma; si otro lo tiene,
+                    # el upsert choca con su _id y se reintenta.
+                    await coleccion.update_one(
+                        {"_id": id_instalacion, "expira": {"$lt": ahora}},
+                        {"$set": {"expira": ahora + DURACION_BLOQUEO, "token": token}},
+                        upsert=True,
+                    )
+                    tomados.append(id_instalacion)
+                    break
+                except DuplicateKeyError:
+                    if time.monotonic() >= limite:
+                        raise HTTPException(
+                            status_code=409,
+                            detail="La instalación está siendo reservada por otra solicitud; intente de nuevo."
+                        )
+                    await asyncio.sleep(espera)
+                    espera = min(espera * 2, 0.2)
+        yield
+    finally:
+        if tomados:
+            await coleccion.delete_many({"_id": {"$in": tomados}, "token": token})
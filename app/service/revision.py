@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+from beanie import PydanticObjectId
+from app.core.config import settings
+from app.models.evento import Evento
+from app.models.usuario import Usuario, rolEnum
+from app.schemas.evento import EventoResumen
+from app.schemas.serializacion import PROYECCION_RESPUESTA, preparar_evento, preparar_parcial
+from app.service.paginacion import ORDEN_KEYSET, codificar_cursor, filtro_keyset
+from app.service.referencias import buscar_por_ids
+
+# Campos de la asignación que se muestran en la cola
+PROYECCION_COLA = {**EventoResumen.Settings.projection, "revisor": 1, "revision_vence": 1}
+
+
+async def _validar_secretario(id_secretario: str) -> None:
+    if not PydanticObjectId.is_valid(id_secretario):
+        raise HTTPException(status_code=400, detail="El ID del secretario no es válido.")
+    usuarios = await buscar_por_ids(Usuario, [id_secretario])
+    secretario = usuarios.get(PydanticObjectId(id_secretario))
+    if not secretario:
+        raise HTTPException(status_code=404, detail="Secretario no encontrado.")
+    if secretario.rol != rolEnum.SECRETARIA:
+        raise HTTPException(status_code=403, detail="Solo una secretaria puede tomar eventos de la cola.")
+
+
+def filtro_disponibles(ahora: datetime) -> Dict[str, Any]:
+    """
+    Eventos pendientes sin asignación vigente (nunca asignados o con la asignación vencida).
+
+    La igualdad sobre `estado` y el orden (fecha_inicio, _id) se resuelven con el índice
+    `estado_fecha_inicio`; como `asignar_siguiente` renueva la asignación que la secretaria
+    ya tiene antes de darle otra, las vigentes son pocas (normalmente una por secretaria)
+    y el recorrido descarta a lo sumo esas antes de encontrar un evento libre.
+    """
+    return {"estado": "pendiente", "$or": [{"revision_vence": None}, {"revision_vence": {"$lte": ahora}}]}
+
+
+def filtro_asignado(ahora: datetime, id_secretario: str) -> Dict[str, Any]:
+    """
+    Evento pendiente que la secretaria tiene asignado y aún no vence (índice `revisor`).
+    """
+    return {"revisor": id_secretario, "estado": "pendiente", "revision_vence": {"$gt": ahora}}
+
+
+async def asignar_siguiente(id_secretario: str) -> Optional[Dict[str, Any]]:
+    """
+    Asigna a la secretaria el evento pendiente más antiguo que nadie está revisando.
+
+    Un único find_one_and_update elige y marca el evento: si dos secretarias piden a la vez,
+    Mongo aplica las actualizaciones en serie y la segunda, al no cumplir ya el filtro,
+    recibe el siguiente evento. No hay bloqueos: una asignación abandonada simplemente vence
+    (REVISION_ASIGNACION_SEGUNDOS) y el evento vuelve a la cola.
+    Pedir de nuevo antes de evaluar devuelve el evento que ya tenía asignado (aunque ahora
+    haya uno libre más antiguo) y renueva el plazo.
+    Retorna None si la cola está vacía.
+    """
+
+    # 1. Validar la secretaria
+    await _validar_secretario(id_secretario)
+
+    # 2. Si ya tiene un evento asignado y vigente, renovar esa asignación
+    ahora = datetime.utcnow()
+    vence = ahora + timedelta(seconds=settings.REVISION_ASIGNACION_SEGUNDOS)
+    coleccion = Evento.get_motor_collection()
+    doc = await coleccion.find_one_and_update(
+        filtro_asignado(ahora, id_secretario),
+        {"$set": {"revision_vence": vence}},
+        sort=ORDEN_KEYSET,
+        projection=PROYECCION_RESPUESTA,
+        return_document=ReturnDocument.AFTER,
+    )
+
+    # 3. Si no, tomar el siguiente libre y marcar la asignación en la misma operación
+    if doc is None:
+        doc = await coleccion.find_one_and_update(
+            filtro_disponibles(ahora),
+            {"$set": {"revisor": id_secretario, "revision_vence": vence}},
+            sort=ORDEN_KEYSET,
+            projection=PROYECCION_RESPUESTA,
+            return_document=ReturnDocument.AFTER,
+        )
+    if doc is None:
+        return None
+
+    return {"id_evento": str(doc["_id"]), "evento": preparar_evento(doc), "revisor": id_secretario, "vence": vence}
+
+
+async def liberar_asignacion(id_evento: str, id_secretario: str) -> Dict[str, str]:
+    """
+    Devuelve a la cola un evento asignado a la secretaria sin evaluarlo.
+    """
+
+    # 1. Validar IDs
+    if not PydanticObjectId.is_valid(id_evento):
+        raise HTTPException(status_code=400, detail="El ID del evento no es válido.")
+    if not PydanticObjectId.is_valid(id_secretario):
+        raise HTTPException(status_code=400, detail="El ID del secretario no es válido.")
+
+    # 2. Quitar la asignación solo si es de esta secretaria
+    coleccion = Evento.get_motor_collection()
+    resultado = await coleccion.update_one(
+        {"_id": PydanticObjectId(id_evento), "revisor": id_secretario},
+        {"$unset": {"revisor": "", "revision_vence": ""}},
+    )
+    if resultado.matched_count == 0:
+        # Solo en el caso de error se averigua el motivo
+        if not await coleccion.find_one({"_id": PydanticObjectId(id_evento)}, projection={"_id": 1}):
+            raise HTTPException(status_code=404, detail="Evento no encontrado.")
+        raise HTTPException(status_code=409, detail="El evento no está asignado a este secretario.")
+
+    return {"mensaje": "El evento volvió a la cola de revisión."}
+
+
+async def listar_cola_revision(
+    limit: int = 50,
+    after: Optional[str] = None,
+    incluir_asignados: bool = False,
+) -> Dict[str, Any]:
+    """
+    Página de eventos pendientes ordenada por (fecha_inicio, _id), con su asignación.
+    Por defecto solo lista los que nadie está revisando.
+    Retorna un dict con la forma de PaginaColaRevision.
+    """
+
+    # 1. Filtro: pendientes (índice estado_fecha_inicio) + cursor
+    filtro: Dict[str, Any] = {"estado": "pendiente"} if incluir_asignados else filtro_disponibles(datetime.utcnow())
+    cursor = filtro_keyset(after)
+    if cursor:
+        filtro = {"$and": [filtro, cursor]}
+
+    # 2. Traer la página (+1 para saber si hay más)
+    docs = await Evento.get_motor_collection().find(
+        filtro,
+        projection=PROYECCION_COLA,
+        sort=ORDEN_KEYSET,
+        limit=limit + 1,
+    ).to_list(length=limit + 1)
+    hay_mas = len(docs) > limit
+    docs = docs[:limit]
+    siguiente = codificar_cursor(docs[-1]["fecha_inicio"], docs[-1]["_id"]) if hay_mas else None
+
+    return {"items": [preparar_parcial(doc) for doc in docs], "siguiente": siguiente}
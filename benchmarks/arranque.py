@@ -0,0 +1,91 @@
+"""
+Tiempo de arranque en frío: lanza `uvicorn app.main:app` en un proceso nuevo y mide cuánto
+tarda en responder la primera solicitud (`/health/live`) y en estar listo (`/health/ready`,
+MongoDB conectado). Repite la medición y falla (código 1) si la mediana supera el presupuesto:
+
+    python -m benchmarks.arranque
+    python -m benchmarks.arranque --repeticiones 5 --presupuesto 2000
+    python -m benchmarks.arranque --sin-arranque-rapido   # comparar con la revisión de índices
+
+Usa la misma configuración (`.env`) que la API.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+import httpx
+from app.core.config import settings
+
+TIMEOUT_SEGUNDOS = 60.0
+INTERVALO_SONDEO = 0.01
+
+
+def _esperar(cliente: httpx.Client, url: str, inicio: float, proceso: subprocess.Popen) -> float:
+    """
+    Sondea `url` hasta obtener 200 y retorna los milisegundos desde `inicio`.
+    """
+    while time.perf_counter() - inicio < TIMEOUT_SEGUNDOS:
+        if proceso.poll() is not None:
+            raise RuntimeError(f"uvicorn terminó con código {proceso.returncode}")
+        try:
+            if cliente.get(url).status_code == 200:
+                return (time.perf_counter() - inicio) * 1000
+        except httpx.TransportError:
+            pass
+        time.sleep(INTERVALO_SONDEO)
+    raise TimeoutError(f"{url} no respondió en {TIMEOUT_SEGUNDOS:.0f} s")
+
+
+def medir(puerto: int, arranque_rapido: bool) -> Dict[str, float]:
+    entorno = {**os.environ, "ARRANQUE_RAPIDO": str(arranque_rapido).lower(), "WEB_CONCURRENCY": "1"}
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(puerto), "--log-level", "warning"],
+        env=entorno, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{puerto}", timeout=1.0) as cliente:
+            primera = _esperar(cliente, "/health/live", inicio, proceso)
+            lista = _esperar(cliente, "/health/ready", inicio, proceso)
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=10)
+    return {"primera_solicitud_ms": primera, "listo_ms": lista}
+
+
+def main(repeticiones: int, puerto: int, presupuesto: int, arranque_rapido: bool) -> int:
+    mediciones: List[Dict[str, float]] = []
+    for i in range(repeticiones):
+        medicion = medir(puerto, arranque_rapido)
+        mediciones.append(medicion)
+        print(f"  #{i + 1}: primera solicitud {medicion['primera_solicitud_ms']:.0f} ms, "
+              f"listo {medicion['listo_ms']:.0f} ms")
+
+    resumen: Dict[str, float] = {}
+    for clave in ("primera_solicitud_ms", "listo_ms"):
+        valores = [m[clave] for m in mediciones]
+        resumen[clave] = statistics.median(valores)
+        print(f"⏱️  {clave}: mediana {statistics.median(valores):.0f} ms "
+              f"(mín {min(valores):.0f}, máx {max(valores):.0f})")
+
+    if resumen["listo_ms"] > presupuesto:
+        print(f"❌ El arranque supera el presupuesto de {presupuesto} ms")
+        return 1
+    print(f"✅ Dentro del presupuesto de {presupuesto} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide el tiempo de arranque en frío de la API.")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Arranques a medir")
+    parser.add_argument("--puerto", type=int, default=8765, help="Puerto del uvicorn de prueba")
+    parser.add_argument("--presupuesto", type=int, default=settings.ARRANQUE_PRESUPUESTO_MS,
+                        help="Máximo de milisegundos hasta estar listo (mediana)")
+    parser.add_argument("--sin-arranque-rapido", action="store_true",
+                        help="Forzar la revisión de índices en cada arranque")
+    argumentos = parser.parse_args()
+    sys.exit(main(argumentos.repeticiones, argumentos.puerto, argumentos.presupuesto,
+                  not argumentos.sin_arranque_rapido))
@@ -0,0 +1,313 @@
+"""
+Prueba de carga de las rutas de eventos a través de la app ASGI (sin servidor HTTP).
+
+Cada escenario ejecuta `--peticiones` solicitudes con `--concurrencia` fijas y reporta
+rendimiento (solicitudes/s) y latencias p50/p95/p99. El resultado se guarda en JSON
+para comparar entre commits:
+
+    python -m benchmarks.semilla --eventos 10000 --limpiar
+    python -m benchmarks.carga --concurrencia 32 --peticiones 2000
+    python -m benchmarks.carga --escenarios obtener,listar --comparar benchmarks/resultados/anterior.json
+
+Crea y elimina sus propios eventos (fechas en 2100+), pero modifica eventos existentes
+en los escenarios de PATCH: úselo solo contra una base de pruebas.
+
+Cubre todas las rutas de app/api/v1/routes/evento.py salvo GET /eventos/stream, que es una
+conexión SSE abierta y no una petición: su entrega y latencia se miden con `benchmarks.stream`.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import subprocess
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import httpx
+
+PREFIJO = "/api/v1/eventos/eventos"
+PREFIJO_REVISION = "/api/v1/revision"
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """
+    Percentil por rango más cercano sobre valores ya ordenados.
+    """
+    if not valores:
+        return 0.0
+    indice = max(0, math.ceil(p / 100 * len(valores)) - 1)
+    return valores[indice]
+
+
+class Contexto:
+    """
+    Datos de muestra tomados de la base y contadores compartidos entre escenarios.
+    """
+
+    def __init__(self, rnd: random.Random, eventos: List[Dict[str, Any]], usuarios: List[Dict[str, Any]],
+                 instalaciones: List[Dict[str, Any]]):
+        self.rnd = rnd
+        self.eventos = eventos
+        self.pendientes = [e for e in eventos if e.get("estado") == "pendiente"] or eventos
+        self.docentes = [u for u in usuarios if u.get("rol") == "docente"]
+        self.secretarias = [u for u in usuarios if u.get("rol") == "secretaria"]
+        self.instalaciones = instalaciones
+        self.creados: List[str] = []
+        self._franja = itertools.count()
+
+    def payload_evento(self) -> Dict[str, Any]:
+        # Cada evento nuevo usa una franja propia en el futuro: nunca hay conflicto de reserva
+        inicio = datetime(2100, 1, 1) + timedelta(hours=3 * next(self._franja))
+        salon = self.rnd.choice(self.instalaciones)
+        responsable = self.rnd.choice(self.docentes)
+        return {
+            "nombre": f"Evento de carga {inicio:%Y%m%d%H}",
+            "descripcion": "Generado por benchmarks.carga",
+            "fecha_inicio": inicio.isoformat(),
+            "fecha_fin": (inicio + timedelta(hours=2)).isoformat(),
+            "tipo_evento": "academico",
+            "asistentes": 1,
+            "responsables": [{"id_responsable": str(responsable["_id"]), "nombre": responsable["nombre"],
+                              "tipo_aval": "director_docencia", "principal": True}],
+            "instalaciones": [{"id_instalacion": str(salon["_id"]), "nombre": salon["nombre"],
+                               "capacidad": salon["capacidad"]}],
+        }
+
+    def id_evento(self) -> str:
+        return str(self.rnd.choice(self.eventos)["_id"])
+
+    def id_pendiente(self) -> str:
+        return str(self.rnd.choice(self.pendientes)["_id"])
+
+    def palabra(self) -> str:
+        return self.rnd.choice(self.rnd.choice(self.eventos)["nombre"].split()[:3])
+
+    def mes(self) -> Dict[str, str]:
+        # Vista mensual del calendario alrededor de un evento existente
+        inicio = self.rnd.choice(self.eventos)["fecha_inicio"].replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        fin = (inicio + timedelta(days=32)).replace(day=1)
+        return {"desde": inicio.isoformat(), "hasta": fin.isoformat()}
+
+
+Escenario = Callable[[httpx.AsyncClient, Contexto], Awaitable[httpx.Response]]
+
+
+async def _crear_bulk(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    respuesta = await cliente.post(f"{PREFIJO}/bulk", json=[ctx.payload_evento() for _ in range(50)])
+    ctx.creados.extend(r["id_evento"] for r in respuesta.json().get("resultados", []) if r.get("ok"))
+    return respuesta
+
+
+async def _eliminar(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    # Elimina solo eventos creados por el propio benchmark
+    if not ctx.creados:
+        await _crear_bulk(cliente, ctx)
+    return await cliente.delete(f"{PREFIJO}/{ctx.creados.pop()}")
+
+
+async def _evaluar(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    # Una evaluación 'pendiente' no cambia el estado: el escenario se puede repetir
+    return await cliente.post(
+        f"{PREFIJO}/{ctx.id_pendiente()}/evaluaciones",
+        json={"id_secretario": str(ctx.rnd.choice(ctx.secretarias)["_id"]), "estado": "pendiente",
+              "justificacion": "Revisión de carga"},
+    )
+
+
+async def _reprogramar(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    # Cambia fechas e instalación (pasa por bloquear_instalaciones y verificar_disponibilidad)
+    # de eventos creados por el propio benchmark, hacia una franja propia sin conflictos
+    if not ctx.creados:
+        await _crear_bulk(cliente, ctx)
+    nuevo = ctx.payload_evento()
+    return await cliente.patch(
+        f"{PREFIJO}/{ctx.rnd.choice(ctx.creados)}",
+        json={campo: nuevo[campo] for campo in ("fecha_inicio", "fecha_fin", "instalaciones")},
+    )
+
+
+async def _revisar(cliente: httpx.AsyncClient, ctx: Contexto) -> httpx.Response:
+    # Toma el siguiente evento de la cola y lo devuelve: la cola no se vacía entre peticiones.
+    # Con --concurrencia N simula N secretarias pidiendo eventos a la vez
+    id_secretario = str(ctx.rnd.choice(ctx.secretarias)["_id"])
+    respuesta = await cliente.get(f"{PREFIJO_REVISION}/siguiente", params={"id_secretario": id_secretario})
+    if respuesta.status_code == 200:
+        await cliente.delete(
+            f"{PREFIJO_REVISION}/{respuesta.json()['id_evento']}/asignacion", params={"id_secretario": id_secretario}
+        )
+    return respuesta
+
+
+ESCENARIOS: Dict[str, Escenario] = {
+    "crear": lambda c, ctx: c.post(f"{PREFIJO}/", json=ctx.payload_evento()),
+    "crear_bulk": _crear_bulk,
+    "listar": lambda c, ctx: c.get(f"{PREFIJO}/", params={"limit": 50}),
+    "listar_resumen": lambda c, ctx: c.get(f"{PREFIJO}/", params={"limit": 50, "vista": "resumen"}),
+    "listar_ndjson": lambda c, ctx: c.get(f"{PREFIJO}/", params={"formato": "ndjson"}),
+    "exportar_csv": lambda c, ctx: c.get(f"{PREFIJO}/export", params={"format": "csv"}),
+    "exportar_jsonl_gzip": lambda c, ctx: c.get(f"{PREFIJO}/export", params={"format": "jsonl", "gzip": "true"}),
+    "obtener": lambda c, ctx: c.get(f"{PREFIJO}/{ctx.id_evento()}"),
+    "obtener_campos": lambda c, ctx: c.get(f"{PREFIJO}/{ctx.id_evento()}", params={"fields": "nombre,estado"}),
+    "buscar": lambda c, ctx: c.get(f"{PREFIJO}/buscar", params={"q": ctx.palabra()}),
+    "calendario_mes": lambda c, ctx: c.get(f"{PREFIJO}/calendario", params=ctx.mes()),
+    "autocompletar": lambda c, ctx: c.get(f"{PREFIJO}/autocompletar", params={"prefijo": ctx.palabra()[:3]}),
+    "actualizar": lambda c, ctx: c.patch(f"{PREFIJO}/{ctx.id_pendiente()}", json={"descripcion": "Actualizado en carga"}),
+    "reprogramar": _reprogramar,
+    "evaluar": _evaluar,
+    "revision_siguiente": _revisar,
+    "cola_revision": lambda c, ctx: c.get(f"{PREFIJO_REVISION}/pendientes", params={"limit": 50}),
+    "historial": lambda c, ctx: c.get(f"{PREFIJO}/historial", params={"limit": 50}),
+    "historial_evento": lambda c, ctx: c.get(f"{PREFIJO}/{ctx.id_evento()}/historial"),
+    "responsables": lambda c, ctx: c.get(f"{PREFIJO}/{ctx.id_evento()}/responsables"),
+    "responsables_lote": lambda c, ctx: c.post(f"{PREFIJO}/responsables", json=[ctx.id_evento() for _ in range(50)]),
+    "eliminar": _eliminar,
+}
+
+# Escenarios que recorren toda la colección: se ejecutan con menos peticiones
+ESCENARIOS_PESADOS = {"listar_ndjson": 5, "exportar_csv": 5, "exportar_jsonl_gzip": 5}
+
+
+async def ejecutar_escenario(cliente: httpx.AsyncClient, ctx: Contexto, nombre: str,
+                             peticiones: int, concurrencia: int) -> Dict[str, Any]:
+    """
+    `concurrencia` tareas toman peticiones de un contador compartido hasta completar `peticiones`.
+    """
+    escenario = ESCENARIOS[nombre]
+    latencias: List[float] = []
+    estados: Dict[str, int] = {}
+    pendientes = itertools.count()
+
+    async def trabajador():
+        while next(pendientes) < peticiones:
+            inicio = time.perf_counter()
+            try:
+                respuesta = await escenario(cliente, ctx)
+                clave = str(respuesta.status_code)
+            except Exception as e:
+                clave = type(e).__name__
+            latencias.append(time.perf_counter() - inicio)
+            estados[clave] = estados.get(clave, 0) + 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+    segundos = time.perf_counter() - inicio
+
+    latencias.sort()
+    errores = sum(n for clave, n in estados.items() if not clave.startswith(("2", "3")))
+    return {
+        "peticiones": len(latencias),
+        "errores": errores,
+        "estados": estados,
+        "segundos": round(segundos, 3),
+        "rps": round(len(latencias) / segundos, 1) if segundos else 0.0,
+        "p50_ms": round(percentil(latencias, 50) * 1000, 2),
+        "p95_ms": round(percentil(latencias, 95) * 1000, 2),
+        "p99_ms": round(percentil(latencias, 99) * 1000, 2),
+        "max_ms": round(latencias[-1] * 1000, 2) if latencias else 0.0,
+    }
+
+
+def _commit_actual() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def comparar(actual: Dict[str, Any], anterior: Dict[str, Any]) -> None:
+    """
+    Imprime la variación de rps y p95 por escenario respecto de un resultado anterior.
+    """
+    print(f"\nComparación con {anterior.get('commit')} ({anterior.get('fecha')}):")
+    for nombre, datos in actual["escenarios"].items():
+        previo = anterior.get("escenarios", {}).get(nombre)
+        if not previo or not previo.get("rps") or not previo.get("p95_ms"):
+            continue
+        delta_rps = (datos["rps"] - previo["rps"]) / previo["rps"] * 100
+        delta_p95 = (datos["p95_ms"] - previo["p95_ms"]) / previo["p95_ms"] * 100
+        alerta = "  ⚠️" if delta_p95 > 10 or delta_rps < -10 else ""
+        print(f"  {nombre:18} rps {delta_rps:+6.1f}%   p95 {delta_p95:+6.1f}%{alerta}")
+
+
+async def _muestra(database, semilla: int) -> Contexto:
+    eventos = await database["eventos"].aggregate([
+        {"$sample": {"size": 2000}},
+        {"$project": {"nombre": 1, "estado": 1, "fecha_inicio": 1}},
+    ]).to_list(length=None)
+    usuarios = await database["usuarios"].find({}, projection={"nombre": 1, "rol": 1}, limit=2000).to_list(length=None)
+    instalaciones = await database["instalaciones"].find(
+        {}, projection={"nombre": 1, "capacidad": 1}, limit=500
+    ).to_list(length=None)
+    if not (eventos and usuarios and instalaciones):
+        raise SystemExit("La base no tiene datos: ejecute primero `python -m benchmarks.semilla`.")
+    return Contexto(random.Random(semilla), eventos, usuarios, instalaciones)
+
+
+async def main(escenarios: List[str], peticiones: int, concurrencia: int, semilla: int,
+               salida: Optional[str], anterior: Optional[str]) -> Dict[str, Any]:
+    from app.core.config import settings
+    from app.db.mongodb import close_mongo_connection, connect_to_mongo, db
+    from app.main import app
+
+    await connect_to_mongo()
+    try:
+        ctx = await _muestra(db.client[settings.MONGO_DB_NAME], semilla)
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://benchmark", timeout=None) as cliente:
+            resultados: Dict[str, Any] = {}
+            for nombre in escenarios:
+                n = min(peticiones, ESCENARIOS_PESADOS.get(nombre, peticiones))
+                resultados[nombre] = datos = await ejecutar_escenario(cliente, ctx, nombre, n, concurrencia)
+                print(f"{nombre:18} {datos['rps']:9.1f} req/s  p50 {datos['p50_ms']:8.2f} ms  "
+                      f"p95 {datos['p95_ms']:8.2f} ms  p99 {datos['p99_ms']:8.2f} ms  errores {datos['errores']}")
+
+            # Limpiar lo que quedó de los escenarios de creación
+            await db.client[settings.MONGO_DB_NAME]["eventos"].delete_many(
+                {"fecha_inicio": {"$gte": datetime(2100, 1, 1)}}
+            )
+    finally:
+        await close_mongo_connection()
+
+    reporte = {
+        "commit": _commit_actual(),
+        "fecha": datetime.utcnow().isoformat(timespec="seconds"),
+        "parametros": {"peticiones": peticiones, "concurrencia": concurrencia, "semilla": semilla},
+        "escenarios": resultados,
+    }
+
+    if salida is None:
+        os.makedirs(DIRECTORIO_RESULTADOS, exist_ok=True)
+        salida = os.path.join(DIRECTORIO_RESULTADOS, f"{reporte['commit'] or 'sin-commit'}-{datetime.utcnow():%Y%m%dT%H%M%S}.json")
+    with open(salida, "w", encoding="utf-8") as archivo:
+        json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultado guardado en {salida}")
+
+    if anterior:
+        with open(anterior, encoding="utf-8") as archivo:
+            comparar(reporte, json.load(archivo))
+    return reporte
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga de las rutas de eventos")
+    parser.add_argument("--escenarios", default=",".join(ESCENARIOS),
+                        help=f"Escenarios separados por coma (por defecto todos: {','.join(ESCENARIOS)})")
+    parser.add_argument("--peticiones", type=int, default=1000, help="Peticiones por escenario")
+    parser.add_argument("--concurrencia", type=int, default=16, help="Peticiones simultáneas")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto benchmarks/resultados/)")
+    parser.add_argument("--comparar", help="Resultado JSON anterior para comparar")
+    argumentos = parser.parse_args()
+
+    nombres = [n.strip() for n in argumentos.escenarios.split(",") if n.strip()]
+    desconocidos = [n for n in nombres if n not in ESCENARIOS]
+    if desconocidos:
+        parser.error(f"Escenarios desconocidos: {', '.join(desconocidos)}")
+    asyncio.run(main(nombres, argumentos.peticiones, argumentos.concurrencia, argumentos.semilla,
+                     argumentos.salida, argumentos.comparar))
@@ -0,0 +1,139 @@
+"""
+Verifica con explain() que las consultas principales de eventos se resuelven con el índice
+esperado: un IXSCAN, sin COLLSCAN y sin SORT en memoria. En el calendario revisa además que
+las claves leídas no dependan de cuántos eventos hay antes del mes. Usa datos reales de la base
+(un responsable y un mes tomados de un evento existente):
+
+    python -m benchmarks.semilla --eventos 10000 --limpiar
+    python -m benchmarks.planes
+
+Termina con código 1 si algún plan no es el esperado.
+"""
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+from app.core.config import settings
+from app.schemas.evento import EstadoEventoEnum
+from app.service.evento import MAX_DURACION_EVENTO, consulta_eventos_de_usuario, filtro_eventos
+from app.service.paginacion import ORDEN_KEYSET
+from app.service.calendario import filtro_calendario
+from app.service.historial import filtro_historial
+from app.service.revision import filtro_asignado, filtro_disponibles
+
+COLECCION_EVENTOS = "eventos"
+COLECCION_HISTORIAL = "eventos_historial"
+
+
+def etapas(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre el árbol del plan ganador (motor clásico y SBE, que lo anida en `queryPlan`).
+    """
+    yield plan
+    for clave in ("inputStage", "queryPlan", "thenStage", "elseStage"):
+        if isinstance(plan.get(clave), dict):
+            yield from etapas(plan[clave])
+    for hijo in plan.get("inputStages", []):
+        yield from etapas(hijo)
+
+
+def problemas(explicacion: Dict[str, Any], indice: Optional[str], max_claves: Optional[int] = None) -> List[str]:
+    """
+    Diferencias entre el plan ganador y lo esperado; lista vacía si el plan es correcto.
+    Con `max_claves` se exige además no leer más claves del índice que esas.
+    """
+    plan = list(etapas(explicacion["queryPlanner"]["winningPlan"]))
+    nombres = [e.get("stage") for e in plan]
+    indices = [e.get("indexName") for e in plan if e.get("stage") == "IXSCAN"]
+    errores = []
+    if "COLLSCAN" in nombres:
+        errores.append("recorre toda la colección (COLLSCAN)")
+    if "SORT" in nombres:
+        errores.append("ordena en memoria (SORT)")
+    if not indices:
+        errores.append("no usa ningún índice")
+    elif indice and indice not in indices:
+        errores.append(f"usa {', '.join(indices)} en lugar de {indice}")
+    claves = explicacion.get("executionStats", {}).get("totalKeysExamined")
+    if max_claves is not None and claves is not None and claves > max_claves:
+        errores.append(f"lee {claves} claves del índice (máximo {max_claves})")
+    return errores
+
+
+def max_claves_calendario(eventos, desde: datetime, hasta: datetime):
+    """
+    Claves que puede leer el calendario de [desde, hasta): a lo sumo las de los eventos que
+    empiezan en la ventana acotada por MAX_DURACION_EVENTO, no las de todo el historial.
+    """
+    return eventos.count_documents({"fecha_inicio": {"$gte": desde - MAX_DURACION_EVENTO, "$lt": hasta}})
+
+
+async def verificar(database) -> int:
+    eventos = database[COLECCION_EVENTOS]
+    muestra = await eventos.find_one({"responsables.0": {"$exists": True}}, projection={"responsables": 1, "fecha_inicio": 1})
+    if muestra is None:
+        print("❌ No hay eventos con responsables: ejecute primero benchmarks.semilla")
+        return 1
+    id_usuario = muestra["responsables"][0]["id_responsable"]
+    mes = muestra["fecha_inicio"].replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    fin_mes = (mes + timedelta(days=32)).replace(day=1)
+
+    # nombre -> (argumentos de find, índice esperado o None si cualquiera sirve)
+    consultas: Dict[str, Any] = {
+        "eventos_de_usuario": (consulta_eventos_de_usuario(id_usuario), "responsables_fecha_inicio"),
+        "eventos_de_usuario_principal": (
+            consulta_eventos_de_usuario(id_usuario, solo_principal=True), "responsables_fecha_inicio",
+        ),
+        "eventos_de_usuario_filtrados": (
+            consulta_eventos_de_usuario(id_usuario, filtro_eventos(EstadoEventoEnum.PENDIENTE, None, mes, None)), None,
+        ),
+        "listado_por_estado": (
+            {"filter": filtro_eventos(EstadoEventoEnum.PENDIENTE), "sort": ORDEN_KEYSET}, "estado_fecha_inicio",
+        ),
+        "cola_revision": ({"filter": filtro_disponibles(datetime.utcnow()), "sort": ORDEN_KEYSET}, "estado_fecha_inicio"),
+        "asignacion_vigente": (
+            {"filter": filtro_asignado(datetime.utcnow(), str(id_usuario)), "sort": ORDEN_KEYSET}, "revisor",
+        ),
+        "exportacion": ({"filter": {}, "sort": ORDEN_KEYSET}, "fecha_inicio_id"),
+        # Sin límite, como la agregación del calendario
+        "calendario_mes": ({"filter": filtro_calendario(mes, fin_mes), "limit": 0}, "fecha_inicio_fecha_fin"),
+    }
+    limites_claves = {"calendario_mes": await max_claves_calendario(eventos, mes, fin_mes)}
+
+    # Historial: el orden por _id es el orden en el tiempo
+    recientes = {"sort": [("_id", -1)]}
+    consultas_historial: Dict[str, Any] = {
+        "historial_ultima_hora": (
+            {"filter": filtro_historial(desde=datetime.utcnow() - timedelta(hours=1)), **recientes}, "_id_",
+        ),
+        "historial_evento": ({"filter": filtro_historial(id_evento=muestra["_id"]), **recientes}, "id_evento_id"),
+    }
+
+    fallidas = 0
+    todas = [(eventos, nombre, *consulta) for nombre, consulta in consultas.items()]
+    todas += [(database[COLECCION_HISTORIAL], nombre, *consulta) for nombre, consulta in consultas_historial.items()]
+    for coleccion, nombre, argumentos, indice in todas:
+        explicacion = await coleccion.find(**{"limit": 50, **argumentos}).explain()
+        errores = problemas(explicacion, indice, limites_claves.get(nombre))
+        if errores:
+            fallidas += 1
+            print(f"❌ {nombre}: {'; '.join(errores)}")
+        else:
+            print(f"✅ {nombre}: IXSCAN")
+    return 1 if fallidas else 0
+
+
+async def _main() -> int:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
+    try:
+        return await verificar(client[settings.MONGO_DB_NAME])
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="Verifica los planes de consulta de eventos con explain().").parse_args()
+    sys.exit(asyncio.run(_main()))
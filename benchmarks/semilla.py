@@ -0,0 +1,269 @@
+"""
+Generador de datos sintéticos para pruebas de carga.
+
+Crea facultades, programas, unidades académicas, usuarios (con vinculación), instalaciones,
+organizaciones externas y eventos con la forma que escribe la API, a la escala pedida.
+Las reservas de instalaciones no se cruzan, así que los datos cumplen las reglas de negocio.
+
+    python -m benchmarks.semilla --eventos 10000 --limpiar
+    python -m benchmarks.semilla --eventos 1000000 --lote 5000 --semilla 7
+
+Usa MONGO_CONNECTION_STRING / MONGO_DB_NAME del `.env`: apúntelo a un mongod local de pruebas.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from bson import ObjectId
+from app.service.busqueda import normalizar_nombre
+
+PALABRAS_EVENTO = [
+    "Feria", "Congreso", "Seminario", "Taller", "Encuentro", "Simposio", "Festival", "Jornada",
+    "Foro", "Conversatorio", "Torneo", "Hackatón", "Muestra", "Coloquio", "Semana",
+]
+TEMAS = [
+    "Innovación", "Ingeniería de Software", "Bioética", "Cine", "Emprendimiento", "Matemáticas",
+    "Robótica", "Literatura", "Salud Pública", "Energías Renovables", "Derecho Digital", "Música",
+    "Inteligencia Artificial", "Arquitectura", "Fútbol", "Economía Circular", "Química Verde",
+]
+NOMBRES = ["Ana", "Luis", "María", "Carlos", "Sofía", "Andrés", "Valentina", "Jorge", "Camila", "Felipe", "Laura", "Diego"]
+APELLIDOS = ["Gómez", "Rodríguez", "Martínez", "López", "García", "Pérez", "Sánchez", "Ramírez", "Torres", "Díaz"]
+SECTORES = ["tecnología", "salud", "educación", "manufactura", "servicios", "gobierno"]
+TIPOS_INSTALACION = ["salon", "auditorio", "laboratorio", "cancha"]
+INICIO_CALENDARIO = datetime(2024, 1, 8, 7, 0)
+
+
+def _persona(rnd: random.Random) -> str:
+    return f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}"
+
+
+def _escalas(n_eventos: int) -> Dict[str, int]:
+    """
+    Tamaño de cada colección de referencia según la cantidad de eventos.
+    """
+    return {
+        "facultades": 8,
+        "programas": 40,
+        "unidades": 16,
+        "usuarios": max(300, n_eventos // 20),
+        "instalaciones": max(50, n_eventos // 500),
+        "organizaciones": max(50, n_eventos // 200),
+    }
+
+
+def generar_referencias(rnd: random.Random, escalas: Dict[str, int]) -> Dict[str, List[Dict[str, Any]]]:
+    facultades = [
+        {"_id": ObjectId(), "nombre": f"Facultad de {tema}", "descripcion": None}
+        for tema in rnd.sample(TEMAS, escalas["facultades"])
+    ]
+    programas = [
+        {
+            "_id": ObjectId(),
+            "nombre": f"Programa de {rnd.choice(TEMAS)} {i}",
+            "codigo": f"P{i:04d}",
+            "facultad": {"id_facultad": (f := rnd.choice(facultades))["_id"], "nombre": f["nombre"]},
+            "director": [],
+        }
+        for i in range(escalas["programas"])
+    ]
+    unidades = [
+        {
+            "_id": ObjectId(),
+            "nombre": f"Departamento de {rnd.choice(TEMAS)} {i}",
+            "codigo": f"U{i:03d}",
+            "facultad": [rnd.choice(facultades)],
+            "director": [],
+        }
+        for i in range(escalas["unidades"])
+    ]
+
+    usuarios = []
+    for i in range(escalas["usuarios"]):
+        rol = rnd.choices(["docente", "estudiante", "secretaria"], weights=[45, 50, 5])[0]
+        vinculacion = {"fechaInicio": "2023-01-15", "fechaFin": None, "estado": "activa"}
+        if rol == "docente":
+            unidad = rnd.choice(unidades)
+            vinculacion.update(unidadAcademicaId=unidad["_id"], nombre=unidad["nombre"])
+        elif rol == "estudiante":
+            programa = rnd.choice(programas)
+            vinculacion.update(programaId=programa["_id"], nombre=programa["nombre"])
+        else:
+            facultad = rnd.choice(facultades)
+            vinculacion.update(facultadId=facultad["_id"], nombre=facultad["nombre"])
+        usuarios.append({
+            "_id": ObjectId(),
+            "nombre": _persona(rnd),
+            "correo": f"usuario{i}@universidad.edu.co",
+            "rol": rol,
+            "vinculacion": [vinculacion],
+            "contrasena": [],
+        })
+
+    instalaciones = [
+        {
+            "_id": ObjectId(),
+            "nombre": f"{(tipo := rnd.choice(TIPOS_INSTALACION)).capitalize()} {i}",
+            "ubicacion": f"Bloque {rnd.choice('ABCDEFG')}",
+            "capacidad": rnd.choice([20, 30, 40, 60, 100, 250, 500]) if tipo != "cancha" else 200,
+            "tipo": tipo,
+        }
+        for i in range(escalas["instalaciones"])
+    ]
+    organizaciones = [
+        {
+            "_id": ObjectId(),
+            "nombre": f"{rnd.choice(['Grupo', 'Fundación', 'Corporación', 'Empresa'])} {rnd.choice(APELLIDOS)} {i}",
+            "sector_economico": rnd.choice(SECTORES),
+            "actividad_principal": rnd.choice(SECTORES),
+            "representante_legal": {"nombre": _persona(rnd), "cargo": "Gerente", "correo": f"gerencia{i}@empresa.com"},
+            "contacto": {"telefonos": [3000000000 + i], "direccion": {"departamento": "Valle", "ciudad": "Cali"}},
+        }
+        for i in range(escalas["organizaciones"])
+    ]
+    return {
+        "facultades": facultades,
+        "programas": programas,
+        "unidades_academicas": unidades,
+        "usuarios": usuarios,
+        "instalaciones": instalaciones,
+        "organizaciones_externas": organizaciones,
+    }
+
+
+class GeneradorEventos:
+    """
+    Genera eventos válidos: responsables del mismo rol con un principal, capacidad suficiente
+    y reservas sin cruces (cada instalación avanza su propio calendario).
+    """
+
+    def __init__(self, rnd: random.Random, referencias: Dict[str, List[Dict[str, Any]]]):
+        self.rnd = rnd
+        self.docentes = [u for u in referencias["usuarios"] if u["rol"] == "docente"]
+        self.estudiantes = [u for u in referencias["usuarios"] if u["rol"] == "estudiante"]
+        self.secretarias = [u for u in referencias["usuarios"] if u["rol"] == "secretaria"]
+        self.instalaciones = referencias["instalaciones"]
+        self.organizaciones = referencias["organizaciones_externas"]
+        self.libre_desde = {i["_id"]: INICIO_CALENDARIO for i in self.instalaciones}
+
+    def evento(self, i: int) -> Dict[str, Any]:
+        rnd = self.rnd
+        nombre = f"{rnd.choice(PALABRAS_EVENTO)} de {rnd.choice(TEMAS)} {i}"
+
+        # Instalaciones: 1 o 2, y el evento empieza cuando todas están libres
+        salones = rnd.sample(self.instalaciones, rnd.choice([1, 1, 1, 2]))
+        inicio = max(self.libre_desde[s["_id"]] for s in salones) + timedelta(hours=rnd.choice([0, 1, 2, 24]))
+        fin = inicio + timedelta(hours=rnd.choice([1, 2, 3, 4]))
+        for s in salones:
+            self.libre_desde[s["_id"]] = fin
+        asistentes = rnd.randint(5, min(s["capacidad"] for s in salones))
+
+        # Responsables: todos docentes o todos estudiantes, exactamente un principal
+        grupo = self.docentes if rnd.random() < 0.6 else self.estudiantes
+        responsables = [
+            {"id_responsable": u["_id"], "nombre": u["nombre"], "principal": j == 0,
+             "tipo_aval": rnd.choice(["director_docencia", "director_programa"])}
+            for j, u in enumerate(rnd.sample(grupo, rnd.choice([1, 1, 2, 3])))
+        ]
+
+        estado = rnd.choices(["pendiente", "aprobado", "rechazado"], weights=[40, 50, 10])[0]
+        evaluaciones = []
+        if estado != "pendiente" and self.secretarias:
+            evaluaciones.append({
+                "id_evaluacion": str(ObjectId()),
+                "id_secretario": str(rnd.choice(self.secretarias)["_id"]),
+                "fecha_evaluacion": inicio - timedelta(days=rnd.randint(1, 30)),
+                "justificacion": "Cumple los requisitos" if estado == "aprobado" else "Falta documentación",
+                "acta_aprobacion": f"acta-{i}.pdf" if estado == "aprobado" else None,
+                "estado": estado,
+            })
+
+        organizaciones = [
+            {"id_organizacion": o["_id"], "nombre": o["nombre"], "certificado": f"certificado-{i}.pdf",
+             "representante": [{"nombre": o["representante_legal"]["nombre"], "cargo": "Gerente", "legal": True}]}
+            for o in rnd.sample(self.organizaciones, rnd.choice([0, 0, 0, 1, 2]))
+        ]
+
+        return {
+            "_id": ObjectId(),
+            "nombre": nombre,
+            "nombre_normalizado": normalizar_nombre(nombre),
+            "descripcion": f"{nombre}: evento {rnd.choice(['académico', 'cultural', 'deportivo'])} abierto a la comunidad",
+            "fecha_inicio": inicio,
+            "fecha_fin": fin,
+            "estado": estado,
+            "tipo_evento": rnd.choice(["ludico", "academico"]),
+            "asistentes": asistentes,
+            "responsables": responsables,
+            "instalaciones": [
+                {"id_instalacion": s["_id"], "nombre": s["nombre"], "ubicacion": s["ubicacion"],
+                 "capacidad": s["capacidad"], "tipo": s["tipo"]}
+                for s in salones
+            ],
+            "organizaciones_externas": organizaciones,
+            "evaluaciones": evaluaciones,
+            "actualizado_en": datetime.utcnow(),
+        }
+
+
+async def sembrar(database, n_eventos: int, tamano_lote: int, semilla: int, limpiar: bool) -> Dict[str, Any]:
+    """
+    Inserta los datos sintéticos con insert_many por lotes. Retorna cantidades y tiempos.
+    """
+    rnd = random.Random(semilla)
+    referencias = generar_referencias(rnd, _escalas(n_eventos))
+
+    if limpiar:
+        for nombre in [*referencias, "eventos"]:
+            await database[nombre].delete_many({})
+
+    inicio = time.perf_counter()
+    for nombre, documentos in referencias.items():
+        for desde in range(0, len(documentos), tamano_lote):
+            await database[nombre].insert_many(documentos[desde:desde + tamano_lote], ordered=False)
+
+    generador = GeneradorEventos(rnd, referencias)
+    eventos = database["eventos"]
+    for desde in range(0, n_eventos, tamano_lote):
+        lote = [generador.evento(i) for i in range(desde, min(desde + tamano_lote, n_eventos))]
+        await eventos.insert_many(lote, ordered=False)
+        print(f"\r📥 eventos: {desde + len(lote)}/{n_eventos}", end="", flush=True)
+    print()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "cantidades": {**{nombre: len(docs) for nombre, docs in referencias.items()}, "eventos": n_eventos},
+        "segundos": round(segundos, 2),
+        "eventos_por_segundo": round(n_eventos / segundos, 1) if segundos else 0.0,
+    }
+
+
+async def _main(n_eventos: int, tamano_lote: int, semilla: int, limpiar: bool) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from beanie import init_beanie
+    from app.core.config import settings
+    from app.db.indices import imprimir_reporte, sincronizar_indices
+    from app.db.modelsregistry import document_models
+
+    client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
+    try:
+        database = client[settings.MONGO_DB_NAME]
+        resultado = await sembrar(database, n_eventos, tamano_lote, semilla, limpiar)
+        print(f"✅ {resultado['cantidades']} en {resultado['segundos']} s ({resultado['eventos_por_segundo']} eventos/s)")
+
+        # Los índices se crean al final: insertar sin ellos es más rápido
+        await init_beanie(database=database, document_models=document_models, skip_indexes=True)
+        imprimir_reporte(await sincronizar_indices())
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos para pruebas de carga")
+    parser.add_argument("--eventos", type=int, default=10_000, help="Cantidad de eventos (10k a 1M)")
+    parser.add_argument("--lote", type=int, default=2000, help="Documentos por insert_many")
+    parser.add_argument("--semilla", type=int, default=42, help="Semilla aleatoria (datos reproducibles)")
+    parser.add_argument("--limpiar", action="store_true", help="Vaciar las colecciones antes de sembrar")
+    argumentos = parser.parse_args()
+    asyncio.run(_main(argumentos.eventos, argumentos.lote, argumentos.semilla, argumentos.limpiar))
@@ -0,0 +1,122 @@
+"""
+Micro-benchmark de serialización de eventos: costo por evento antes y después
+del camino rápido (dict BSON -> orjson) de app/schemas/serializacion.py.
+
+    python -m benchmarks.serializacion --eventos 2000 --repeticiones 5
+
+No lee ni escribe datos, pero necesita conexión a MongoDB porque Beanie
+solo permite construir documentos después de `init_beanie`.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+from bson import ObjectId
+from pydantic import TypeAdapter
+from app.models.evento import Evento
+from app.schemas.evento import EventoRespuesta
+from app.schemas.serializacion import a_json, preparar_evento
+
+
+def documento_sintetico(i: int) -> Dict[str, Any]:
+    """
+    Documento con la forma que devuelve Motor para la colección `eventos`.
+    """
+    inicio = datetime(2025, 1, 1) + timedelta(hours=i)
+    return {
+        "_id": ObjectId(),
+        "nombre": f"Evento {i}",
+        "descripcion": "Evento académico con participación de empresas externas",
+        "fecha_inicio": inicio,
+        "fecha_fin": inicio + timedelta(hours=2),
+        "estado": random.choice(["pendiente", "aprobado", "rechazado"]),
+        "tipo_evento": random.choice(["ludico", "academico"]),
+        "asistentes": random.randint(10, 300),
+        "responsables": [
+            {"id_responsable": ObjectId(), "nombre": f"Responsable {j}", "principal": j == 0, "tipo_aval": "director_docencia"}
+            for j in range(3)
+        ],
+        "instalaciones": [
+            {"id_instalacion": ObjectId(), "nombre": f"Salón {j}", "ubicacion": "Bloque A", "capacidad": 300, "tipo": "salon"}
+            for j in range(2)
+        ],
+        "organizaciones_externas": [
+            {"id_organizacion": ObjectId(), "nombre": "Empresa ABC", "certificado": "certificado.pdf", "representante": []}
+        ],
+        "evaluaciones": [
+            {
+                "id_evaluacion": ObjectId(),
+                "id_secretario": ObjectId(),
+                "fecha_evaluacion": inicio,
+                "justificacion": "Cumple requisitos",
+                "acta_aprobacion": None,
+                "estado": "aprobado",
+            }
+        ],
+    }
+
+
+def camino_anterior(docs: List[Dict[str, Any]], adaptador: TypeAdapter) -> bytes:
+    """
+    Lo que hacía la API antes: documento Beanie -> EventoRespuesta -> validación
+    contra response_model -> jsonable -> json.dumps.
+    """
+    respuestas = [EventoRespuesta(**Evento.model_validate(doc).model_dump()) for doc in docs]
+    contenido = [r.model_dump() for r in respuestas]
+    validado = adaptador.validate_python(contenido)
+    return json.dumps(adaptador.dump_python(validado, mode="json")).encode()
+
+
+def camino_rapido(docs: List[Dict[str, Any]]) -> bytes:
+    return a_json([preparar_evento(doc) for doc in docs])
+
+
+def medir(funcion: Callable[[], bytes], repeticiones: int) -> float:
+    mejores = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejores.append(time.perf_counter() - inicio)
+    return min(mejores)
+
+
+async def _init_beanie() -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from beanie import init_beanie
+    from app.core.config import settings
+    from app.db.modelsregistry import document_models
+
+    client = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING)
+    await init_beanie(database=client[settings.MONGO_DB_NAME], document_models=document_models, skip_indexes=True)
+
+
+def main(n_eventos: int, repeticiones: int) -> Dict[str, float]:
+    asyncio.run(_init_beanie())
+    docs = [documento_sintetico(i) for i in range(n_eventos)]
+    adaptador = TypeAdapter(List[EventoRespuesta])
+
+    antes = medir(lambda: camino_anterior(docs, adaptador), repeticiones)
+    despues = medir(lambda: camino_rapido(docs), repeticiones)
+
+    resultado = {
+        "eventos": n_eventos,
+        "antes_us_por_evento": antes / n_eventos * 1e6,
+        "despues_us_por_evento": despues / n_eventos * 1e6,
+        "aceleracion": antes / despues,
+    }
+    print(f"Eventos: {n_eventos} (mejor de {repeticiones})")
+    print(f"  antes   : {resultado['antes_us_por_evento']:8.1f} µs/evento")
+    print(f"  después : {resultado['despues_us_por_evento']:8.1f} µs/evento")
+    print(f"  {resultado['aceleracion']:.1f}x más rápido")
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de eventos")
+    parser.add_argument("--eventos", type=int, default=2000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    argumentos = parser.parse_args()
+    main(argumentos.eventos, argumentos.repeticiones)
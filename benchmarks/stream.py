@@ -0,0 +1,109 @@
+"""
+Prueba de los cambios en vivo (GET /eventos/stream) contra un MongoDB replica set real.
+
+Conecta `--clientes` suscriptores al difusor del proceso, escribe `--cambios` eventos de prueba
+(fechas en 2100+) y mide cuánto tarda cada cambio en llegar a todos. Verifica además que tomar
+un evento de la cola de revisión no genere mensajes. Un replica set de un solo nodo basta:
+
+    mongod --replSet rs0 --dbpath /tmp/rs0 --port 27017
+    mongosh --eval 'rs.initiate()'
+    MONGO_CONNECTION_STRING=mongodb://localhost:27017/?directConnection=true python -m benchmarks.stream
+
+Termina con código 1 si algún cliente no recibió todos los cambios o si recibió la asignación.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+import orjson
+from bson import ObjectId
+from benchmarks.carga import percentil
+
+
+class Cliente:
+    def __init__(self):
+        self.creados: Dict[str, float] = {}   # id_evento -> momento en que llegó
+        self.actualizados = 0
+
+
+async def _leer(generador, cliente: Cliente) -> None:
+    async for datos in generador:
+        for linea in datos.split(b"\n"):
+            if not linea.startswith(b"data: "):
+                continue
+            cuerpo = orjson.loads(linea[len(b"data: "):])
+            if cuerpo.get("tipo") == "creado":
+                cliente.creados.setdefault(cuerpo["id_evento"], time.perf_counter())
+            elif cuerpo.get("tipo") == "actualizado":
+                cliente.actualizados += 1
+
+
+async def main(clientes: int, cambios: int) -> int:
+    from app.core.config import settings
+    from app.db.cambios import difusor, mensajes
+    from app.db.mongodb import close_mongo_connection, connect_to_mongo, db
+
+    await connect_to_mongo()
+    try:
+        # El change stream se abre en segundo plano
+        for _ in range(50):
+            if difusor.disponible:
+                break
+            await asyncio.sleep(0.1)
+        else:
+            print("❌ MongoDB no es un replica set: inicie uno con `rs.initiate()` (ver el encabezado)")
+            return 1
+        await asyncio.sleep(1)
+
+        suscriptores: List[Cliente] = [Cliente() for _ in range(clientes)]
+        lectores = [asyncio.create_task(_leer(mensajes(), c)) for c in suscriptores]
+        await asyncio.sleep(0.1)
+
+        eventos = db.client[settings.MONGO_DB_NAME]["eventos"]
+        enviados: Dict[ObjectId, float] = {}
+        inicio = datetime(2100, 1, 1)
+        for i in range(cambios):
+            enviados_en = time.perf_counter()
+            resultado = await eventos.insert_one({
+                "nombre": f"Evento de stream {i}", "descripcion": "Generado por benchmarks.stream",
+                "fecha_inicio": inicio + timedelta(hours=i), "fecha_fin": inicio + timedelta(hours=i, minutes=30),
+                "estado": "pendiente", "tipo_evento": "academico", "asistentes": 1, "responsables": [],
+            })
+            enviados[resultado.inserted_id] = enviados_en
+
+        # Tomar un evento de la cola (solo cambia revisor/revision_vence) no debe llegar a los clientes
+        await eventos.update_one({"_id": next(iter(enviados))},
+                                 {"$set": {"revisor": "benchmark", "revision_vence": datetime.utcnow()}})
+        await asyncio.sleep(2)
+
+        for lector in lectores:
+            lector.cancel()
+        await eventos.delete_many({"_id": {"$in": list(enviados)}})
+    finally:
+        await close_mongo_connection()
+
+    latencias = [(c.creados[str(i)] - t) * 1000 for c in suscriptores for i, t in enviados.items() if str(i) in c.creados]
+    incompletos = sum(1 for c in suscriptores if not all(str(i) in c.creados for i in enviados))
+    asignaciones = sum(c.actualizados for c in suscriptores)
+    print(f"clientes {clientes}  cambios {cambios}  mensajes {len(latencias)}/{clientes * cambios}")
+    if latencias:
+        print(f"latencia p50 {percentil(latencias, 50):.1f} ms  p95 {percentil(latencias, 95):.1f} ms  "
+              f"p99 {percentil(latencias, 99):.1f} ms")
+    if asignaciones:
+        print(f"❌ Tomar un evento de la cola generó {asignaciones} mensajes")
+    if incompletos:
+        print(f"❌ {incompletos} clientes no recibieron todos los cambios")
+    if asignaciones or incompletos:
+        return 1
+    print("✅ Todos los clientes recibieron todos los cambios")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de GET /eventos/stream contra un replica set")
+    parser.add_argument("--clientes", type=int, default=200, help="Suscriptores simultáneos")
+    parser.add_argument("--cambios", type=int, default=50, help="Eventos a escribir")
+    argumentos = parser.parse_args()
+    sys.exit(asyncio.run(main(argumentos.clientes, argumentos.cambios)))
@@ -0,0 +1,59 @@
+"""
+Configuración común de las pruebas.
+
+Las pruebas unitarias no necesitan MongoDB. Las de integración usan `MONGO_CONNECTION_STRING`
+(por defecto un mongod local) sobre una base desechable y se omiten si no hay servidor, o si
+necesitan un replica set y el servidor no lo es. Un replica set de un solo nodo basta:
+
+    mongod --replSet rs0 --dbpath /tmp/rs0 --port 27017
+    mongosh --eval 'rs.initiate()'
+    python -m pytest
+"""
+import os
+import uuid
+import pytest
+
+os.environ.setdefault("MONGO_CONNECTION_STRING", "mongodb://localhost:27017/?directConnection=true")
+os.environ.setdefault("MONGO_DB_NAME", "pruebas")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+async def _base_desechable(requiere_replica_set: bool):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(os.environ["MONGO_CONNECTION_STRING"], serverSelectionTimeoutMS=1000)
+    try:
+        hello = await client.admin.command("hello")
+    except Exception:
+        client.close()
+        pytest.skip("No hay un MongoDB disponible en MONGO_CONNECTION_STRING")
+    if requiere_replica_set and "setName" not in hello:
+        client.close()
+        pytest.skip("MongoDB no es un replica set (ver tests/conftest.py)")
+    return client, client[f"pruebas_{uuid.uuid4().hex[:8]}"]
+
+
+@pytest.fixture
+async def mongo(anyio_backend):
+    """
+    Base desechable en un mongod cualquiera; se elimina al terminar.
+    """
+    client, database = await _base_desechable(requiere_replica_set=False)
+    yield database
+    await client.drop_database(database.name)
+    client.close()
+
+
+@pytest.fixture
+async def mongo_replica_set(anyio_backend):
+    """
+    Base desechable en un replica set (change streams); se elimina al terminar.
+    """
+    client, database = await _base_desechable(requiere_replica_set=True)
+    yield database
+    await client.drop_database(database.name)
+    client.close()
@@ -0,0 +1,209 @@
+import asyncio
+import itertools
+import orjson
+import pytest
+from bson import ObjectId
+from app.core.config import settings
+from app.db import cambios
+from app.db.cambios import MENSAJE_INICIAL, MENSAJE_LATIDO, MENSAJE_REINICIO, Difusor, mensaje_de_cambio
+
+_tokens = itertools.count()
+
+
+def cambio(operacion: str, estado: str = "pendiente", id_responsable: ObjectId = None) -> dict:
+    """
+    Documento con la forma de un cambio del change stream (tras `pipeline_cambios`).
+    """
+    documento = {"_id": {"_data": f"8200{next(_tokens):06d}"}, "operationType": operacion,
+                 "documentKey": {"_id": ObjectId()}}
+    if operacion != "delete":
+        documento["fullDocument"] = {
+            "nombre": "Feria", "estado": estado,
+            "responsables": [{"id_responsable": id_responsable or ObjectId()}],
+        }
+    return documento
+
+
+def pendientes(suscriptor) -> list:
+    mensajes = []
+    while not suscriptor.cola.empty():
+        mensajes.append(suscriptor.cola.get_nowait())
+    return mensajes
+
+
+def cuerpo(datos: bytes) -> dict:
+    return orjson.loads(datos.split(b"data: ")[1])
+
+
+def test_cada_suscriptor_recibe_solo_lo_que_acepta_su_filtro():
+    difusor = Difusor()
+    responsable = ObjectId()
+    todos = difusor.suscribir()
+    aprobados = difusor.suscribir(estado="aprobado")
+    del_responsable = difusor.suscribir(id_responsable=str(responsable))
+
+    creado = mensaje_de_cambio(cambio("insert", "pendiente", responsable))
+    aprobado = mensaje_de_cambio(cambio("update", "aprobado"))
+    eliminado = mensaje_de_cambio(cambio("delete"))
+    for mensaje in (creado, aprobado, eliminado):
+        difusor.publicar(mensaje)
+
+    assert pendientes(todos) == [creado.datos, aprobado.datos, eliminado.datos]
+    # Las eliminaciones ya no traen el documento: llegan a todos
+    assert pendientes(aprobados) == [aprobado.datos, eliminado.datos]
+    assert pendientes(del_responsable) == [creado.datos, eliminado.datos]
+
+
+def test_mensaje_lleva_el_resume_token_como_id():
+    original = cambio("update", "rechazado")
+    mensaje = mensaje_de_cambio(original)
+
+    assert mensaje.datos.startswith(f"id: {original['_id']['_data']}\nevent: actualizado\n".encode())
+    assert cuerpo(mensaje.datos) == {
+        "tipo": "actualizado", "id_evento": str(original["documentKey"]["_id"]),
+        "nombre": "Feria", "estado": "rechazado",
+    }
+
+
+def test_cliente_lento_se_desconecta_al_llenarse_su_cola(monkeypatch):
+    difusor = Difusor()
+    rapido = difusor.suscribir()
+    monkeypatch.setattr(settings, "SSE_COLA_MAX", 2)
+    lento = difusor.suscribir()
+
+    for _ in range(3):
+        difusor.publicar(mensaje_de_cambio(cambio("insert")))
+
+    assert lento.motivo == "lento"
+    assert lento not in difusor.suscriptores
+    # La cola se libera; solo queda el aviso para quien la está leyendo
+    assert pendientes(lento) == [None]
+    assert len(pendientes(rapido)) == 3
+    assert rapido in difusor.suscriptores
+
+
+def test_reconexion_reenvia_los_cambios_posteriores_al_last_event_id():
+    difusor = Difusor()
+    responsable = ObjectId()
+    publicados = [mensaje_de_cambio(cambio("insert", id_responsable=responsable)),
+                  mensaje_de_cambio(cambio("update", "aprobado")),
+                  mensaje_de_cambio(cambio("update", "aprobado", responsable))]
+    for mensaje in publicados:
+        difusor.publicar(mensaje)
+
+    reconectado = difusor.suscribir(ultimo_id=publicados[0].id)
+    assert pendientes(reconectado) == [publicados[1].datos, publicados[2].datos]
+
+    # El reenvío respeta el filtro del cliente
+    filtrado = difusor.suscribir(id_responsable=str(responsable), ultimo_id=publicados[0].id)
+    assert pendientes(filtrado) == [publicados[2].datos]
+
+    al_dia = difusor.suscribir(ultimo_id=publicados[-1].id)
+    assert pendientes(al_dia) == []
+
+
+def test_reinicio_si_el_last_event_id_salio_del_buffer(monkeypatch):
+    monkeypatch.setattr(settings, "SSE_BUFFER_REANUDACION", 2)
+    difusor = Difusor()
+    publicados = [mensaje_de_cambio(cambio("insert")) for _ in range(3)]
+    for mensaje in publicados:
+        difusor.publicar(mensaje)
+
+    assert pendientes(difusor.suscribir(ultimo_id=publicados[0].id)) == [MENSAJE_REINICIO]
+    assert pendientes(difusor.suscribir(ultimo_id="desconocido")) == [MENSAJE_REINICIO]
+    assert pendientes(difusor.suscribir(ultimo_id=publicados[1].id)) == [publicados[2].datos]
+
+
+def test_reinicio_si_lo_perdido_no_cabe_en_la_cola(monkeypatch):
+    difusor = Difusor()
+    publicados = [mensaje_de_cambio(cambio("insert")) for _ in range(4)]
+    for mensaje in publicados:
+        difusor.publicar(mensaje)
+
+    monkeypatch.setattr(settings, "SSE_COLA_MAX", 2)
+    assert pendientes(difusor.suscribir(ultimo_id=publicados[0].id)) == [MENSAJE_REINICIO]
+
+
+@pytest.mark.anyio
+async def test_flujo_sse_latido_y_desconexion(monkeypatch):
+    difusor = Difusor()
+    monkeypatch.setattr(cambios, "difusor", difusor)
+    monkeypatch.setattr(settings, "SSE_LATIDO_SEGUNDOS", 0.05)
+
+    flujo = cambios.mensajes()
+    assert await flujo.__anext__() == MENSAJE_INICIAL
+    assert len(difusor.suscriptores) == 1
+
+    mensaje = mensaje_de_cambio(cambio("insert"))
+    difusor.publicar(mensaje)
+    assert await flujo.__anext__() == mensaje.datos
+    assert await flujo.__anext__() == MENSAJE_LATIDO
+
+    difusor.cerrar()
+    final = await flujo.__anext__()
+    assert final.startswith(b"event: desconectado\n") and cuerpo(final) == {"motivo": "cierre"}
+    with pytest.raises(StopAsyncIteration):
+        await flujo.__anext__()
+    assert not difusor.suscriptores
+
+
+@pytest.mark.anyio
+async def test_cliente_que_se_va_cancela_su_suscripcion(monkeypatch):
+    difusor = Difusor()
+    monkeypatch.setattr(cambios, "difusor", difusor)
+
+    flujo = cambios.mensajes()
+    await flujo.__anext__()
+    await flujo.aclose()
+    assert not difusor.suscriptores
+
+
+async def _siguiente(suscriptor, segundos: float = 10) -> dict:
+    datos = await asyncio.wait_for(suscriptor.cola.get(), timeout=segundos)
+    return {"evento": datos.split(b"event: ")[1].split(b"\n")[0].decode(), **cuerpo(datos)}
+
+
+@pytest.mark.anyio
+async def test_change_stream_compartido_en_replica_set(mongo_replica_set, monkeypatch):
+    difusor = Difusor()
+    monkeypatch.setattr(cambios, "difusor", difusor)
+    eventos = mongo_replica_set["eventos"]
+    # La colección debe existir antes de abrir el change stream
+    await mongo_replica_set.create_collection("eventos")
+
+    tarea = asyncio.create_task(cambios.difundir_cambios(mongo_replica_set))
+    try:
+        for _ in range(50):
+            if difusor.disponible:
+                break
+            await asyncio.sleep(0.1)
+        assert difusor.disponible
+        # Dar tiempo a que el change stream quede abierto
+        await asyncio.sleep(1)
+
+        todos = difusor.suscribir()
+        aprobados = difusor.suscribir(estado="aprobado")
+
+        insertado = await eventos.insert_one({"nombre": "Feria", "estado": "pendiente", "responsables": []})
+        id_evento = insertado.inserted_id
+        # Tomar el evento de la cola de revisión no debe generar mensajes
+        await eventos.update_one({"_id": id_evento}, {"$set": {"revisor": "x", "revision_vence": 1}})
+        await eventos.update_one({"_id": id_evento}, {"$set": {"estado": "aprobado"},
+                                                      "$unset": {"revisor": "", "revision_vence": ""}})
+        await eventos.delete_one({"_id": id_evento})
+
+        recibidos = [await _siguiente(todos) for _ in range(3)]
+        assert [(m["evento"], m["id_evento"]) for m in recibidos] == [
+            ("creado", str(id_evento)), ("actualizado", str(id_evento)), ("eliminado", str(id_evento)),
+        ]
+        assert recibidos[1]["estado"] == "aprobado"
+        assert [(await _siguiente(aprobados))["evento"] for _ in range(2)] == ["actualizado", "eliminado"]
+        assert todos.cola.empty()
+
+        # Un cliente que se reconecta con el id del primer mensaje recibe el resto
+        reconectado = difusor.suscribir(ultimo_id=difusor.recientes[0].id)
+        assert [(await _siguiente(reconectado))["evento"] for _ in range(2)] == ["actualizado", "eliminado"]
+    finally:
+        tarea.cancel()
+        await asyncio.gather(tarea, return_exceptions=True)
+    assert not difusor.disponible
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from app.models.evento import Evento
+from app.schemas.evento import EstadoEventoEnum
+from app.service.calendario import filtro_calendario
+from app.service.evento import consulta_eventos_de_usuario, filtro_eventos
+from app.service.paginacion import codificar_cursor
+from benchmarks.planes import max_claves_calendario, problemas
+
+USUARIOS = [ObjectId() for _ in range(20)]
+
+
+@pytest.fixture
+async def eventos(mongo):
+    """
+    Colección `eventos` con los índices declarados en el modelo y eventos de varios responsables.
+    """
+    coleccion = mongo["eventos"]
+    await coleccion.create_indexes(Evento.Settings.indexes)
+    inicio = datetime(2025, 1, 1)
+    await coleccion.insert_many([
+        {
+            "nombre": f"Evento {i}",
+            "fecha_inicio": inicio + timedelta(hours=i),
+            "fecha_fin": inicio + timedelta(hours=i, minutes=90),
+            "estado": "pendiente" if i % 3 else "aprobado",
+            "tipo_evento": "academico",
+            "responsables": [
+                {"id_responsable": USUARIOS[i % len(USUARIOS)], "principal": True},
+                {"id_responsable": USUARIOS[(i + 7) % len(USUARIOS)], "principal": False},
+            ],
+        }
+        for i in range(2000)
+    ])
+    return coleccion
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("argumentos, indice", [
+    ({}, "responsables_fecha_inicio"),
+    ({"solo_principal": True}, "responsables_fecha_inicio"),
+    # Con estado el planificador puede preferir estado_fecha_inicio: basta que no recorra ni ordene
+    ({"filtro": filtro_eventos(EstadoEventoEnum.PENDIENTE, desde=datetime(2025, 2, 1))}, None),
+], ids=["todos", "principal", "filtrados"])
+async def test_eventos_de_usuario_usan_el_indice_multikey(eventos, argumentos, indice):
+    consulta = consulta_eventos_de_usuario(USUARIOS[0], **argumentos)
+
+    explicacion = await eventos.find(**consulta, limit=51).explain()
+
+    # IXSCAN sobre el índice esperado, sin COLLSCAN ni SORT en memoria
+    assert problemas(explicacion, indice) == []
+
+
+@pytest.mark.anyio
+async def test_pagina_siguiente_de_eventos_de_usuario_usa_el_indice_multikey(eventos):
+    primera = await eventos.find(**consulta_eventos_de_usuario(USUARIOS[0]), limit=50).to_list(length=50)
+    after = codificar_cursor(primera[-1]["fecha_inicio"], primera[-1]["_id"])
+
+    explicacion = await eventos.find(**consulta_eventos_de_usuario(USUARIOS[0], after=after), limit=51).explain()
+
+    assert problemas(explicacion, "responsables_fecha_inicio") == []
+
+
+@pytest.mark.anyio
+async def test_calendario_no_lee_las_claves_de_los_meses_anteriores(eventos):
+    # Marzo: enero y febrero quedan antes del rango
+    desde, hasta = datetime(2025, 3, 1), datetime(2025, 4, 1)
+
+    explicacion = await eventos.find(filtro_calendario(desde, hasta)).explain()
+
+    maximo = await max_claves_calendario(eventos, desde, hasta)
+    assert maximo < await eventos.count_documents({"fecha_inicio": {"$lt": hasta}})
+    assert problemas(explicacion, "fecha_inicio_fecha_fin", maximo) == []